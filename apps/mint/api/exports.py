@@ -0,0 +1,235 @@
+"""
+Bulk exports of MintyDB game data.
+
+Each export is every active row of one entity in a single file, rendered
+with the entity's API serializer (foreign keys as UUIDs, no expansions).
+Files are built per game data version, by `build_exports` after an import
+or else on first request, and served from disk until the next version
+bump.
+"""
+
+import csv
+import fcntl
+import io
+import os
+import shutil
+import tempfile
+import uuid
+
+from django.conf import settings
+from rest_framework import serializers
+
+from common.models import BaseModel
+from minty_db.versioning import get_data_version
+from api.renderers import dumps
+from api.serializers.game_v1 import (
+    ContinentSerializer,
+    CraftingIngredientSerializer,
+    CraftingRecipeSerializer,
+    ItemDropSerializer,
+    ItemSerializer,
+    JobSerializer,
+    MapleClassSerializer,
+    MapSerializer,
+    MobSerializer,
+    MobSpawnSerializer,
+    NPCLocationSerializer,
+    NPCSerializer,
+    NPCShopItemSerializer,
+    QuestRewardSerializer,
+    QuestSerializer,
+    RegionSerializer,
+    SkillSerializer,
+)
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+EXPORT_SERIALIZERS = {
+    "classes": MapleClassSerializer,
+    "jobs": JobSerializer,
+    "skills": SkillSerializer,
+    "items": ItemSerializer,
+    "mobs": MobSerializer,
+    "continents": ContinentSerializer,
+    "regions": RegionSerializer,
+    "maps": MapSerializer,
+    "npcs": NPCSerializer,
+    "quests": QuestSerializer,
+    "recipes": CraftingRecipeSerializer,
+    "item-drops": ItemDropSerializer,
+    "mob-spawns": MobSpawnSerializer,
+    "npc-locations": NPCLocationSerializer,
+    "npc-shop-items": NPCShopItemSerializer,
+    "quest-rewards": QuestRewardSerializer,
+    "crafting-ingredients": CraftingIngredientSerializer,
+}
+
+EXPORT_CONTENT_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+EXPORT_CHUNK_SIZE = 5000
+
+
+def get_export_formats():
+    if pyarrow is None:
+        return ["ndjson", "csv"]
+    return ["ndjson", "csv", "parquet"]
+
+
+def get_export_rows(entity):
+    """
+    Yield the rendered rows of an entity in primary key order, read through
+    a server-side cursor on PostgreSQL.
+
+    Rows whose required references (e.g. both ends of a through table) are
+    soft-deleted are left out. Optional references are kept as they are, as
+    the API serves them.
+    """
+    serializer = EXPORT_SERIALIZERS[entity]()
+    model = serializer.Meta.model
+    queryset = model.objects.filter(
+        **{
+            f"{field.name}__deleted_at__isnull": True
+            for field in model._meta.concrete_fields
+            if field.many_to_one
+            and not field.null
+            and issubclass(field.related_model, BaseModel)
+        }
+    )
+    row_plan = serializer.row_plan
+    rows = queryset.order_by("pk").values(*row_plan.columns)
+    for row in rows.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield row_plan.render(row)
+
+
+def write_ndjson(entity, file):
+    for row in get_export_rows(entity):
+        file.write(dumps(row))
+        file.write(b"\n")
+
+
+def _flat(value):
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        return dumps(value).decode()
+    return str(value) if isinstance(value, uuid.UUID) else value
+
+
+def write_csv(entity, file):
+    text = io.TextIOWrapper(file, encoding="utf-8", newline="")
+    writer = csv.writer(text)
+    writer.writerow(EXPORT_SERIALIZERS[entity]().row_plan.names)
+    for row in get_export_rows(entity):
+        writer.writerow([_flat(value) for value in row.values()])
+    text.flush()
+    text.detach()
+
+
+def _parquet_type(field):
+    if isinstance(field, serializers.BooleanField):
+        return pyarrow.bool_()
+    if isinstance(field, serializers.IntegerField):
+        return pyarrow.int64()
+    if isinstance(field, serializers.FloatField):
+        return pyarrow.float64()
+    # Strings, UUIDs (related ones included) and JSON, encoded as text.
+    return pyarrow.string()
+
+
+def write_parquet(entity, file):
+    serializer = EXPORT_SERIALIZERS[entity]()
+    schema = pyarrow.schema(
+        [
+            (name, _parquet_type(serializer.fields[name]))
+            for name in serializer.row_plan.names
+        ]
+    )
+    text_columns = {field.name for field in schema if field.type == pyarrow.string()}
+
+    def flush(batch):
+        columns = {name: [] for name in schema.names}
+        for row in batch:
+            for name, value in row.items():
+                if value is not None and name in text_columns:
+                    value = _flat(value)
+                columns[name].append(value)
+        writer.write_table(pyarrow.table(columns, schema=schema))
+
+    with pyarrow.parquet.ParquetWriter(file, schema) as writer:
+        batch = []
+        for row in get_export_rows(entity):
+            batch.append(row)
+            if len(batch) >= EXPORT_CHUNK_SIZE:
+                flush(batch)
+                batch = []
+        if batch:
+            flush(batch)
+
+
+EXPORT_WRITERS = {
+    "ndjson": write_ndjson,
+    "csv": write_csv,
+    "parquet": write_parquet,
+}
+
+
+class ExportInProgress(Exception):
+    """
+    Another process is building the requested export.
+    """
+
+
+def get_export_path(entity, export_format, wait=False):
+    """
+    Path of the export file for the current game data version, building it
+    first if needed.
+
+    Each build holds an exclusive lock on a file next to the export, so an
+    export is only ever built once per version. When another process holds
+    it, this waits for that build with `wait`, and otherwise raises
+    ExportInProgress. Builds are written to a temporary file and moved into
+    place, so readers never see a partial file; exports of older versions
+    are removed once a newer one has been built.
+    """
+    version = get_data_version()
+    root = settings.EXPORT_ROOT
+    directory = os.path.join(root, str(version))
+    path = os.path.join(directory, f"{entity}.{export_format}")
+    if os.path.exists(path):
+        return path
+
+    os.makedirs(directory, exist_ok=True)
+    lock_path = os.path.join(directory, f".{entity}.{export_format}.lock")
+    with open(lock_path, "a") as lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX if wait else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            raise ExportInProgress(entity, export_format)
+        if not os.path.exists(path):
+            _build_export(entity, export_format, directory, path)
+
+    for name in os.listdir(root):
+        if name.isdigit() and int(name) < version:
+            shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+    return path
+
+
+def _build_export(entity, export_format, directory, path):
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".export-")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            EXPORT_WRITERS[export_format](entity, file)
+        # mkstemp() creates the file private to this process' user.
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
@@ -0,0 +1,83 @@
+"""API filter backends."""
+
+from django.db.models import F
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend, SearchFilter
+from rest_framework.settings import api_settings
+
+from minty_hq.models import GuildStanding, GuildTag
+
+
+class GameDataSearchFilter(SearchFilter):
+    """
+    `?search=` for MintyDB game data, backed by `GameDataQuerySet.search()`.
+
+    Matches by name substring, trigram similarity and full text over name
+    and description using the indexes in `SEARCH_INDEXES`, ordered by
+    relevance unless `?ordering=` is given. The view's `search_fields` are
+    not used.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+        return queryset.search(" ".join(terms))
+
+
+class GuildTagFilter(BaseFilterBackend):
+    """
+    `?tag=` limits guilds to those given a tag at least `?tag_count_min=`
+    times (default: once), and makes `?ordering=tag_count` order them by how
+    often they were given it. Ordering by `tag_count` without a `tag` is
+    rejected.
+
+    Reads the tag's leaderboard, so both are scans of its (board, score)
+    index rather than counts over GuildTag.
+    """
+
+    tag_param = "tag"
+    min_count_param = "tag_count_min"
+    ordering_field = "tag_count"
+
+    def filter_queryset(self, request, queryset, view):
+        tag = request.query_params.get(self.tag_param)
+        if not tag:
+            # Nothing to count, so nothing to order by.
+            ordering_param = api_settings.ORDERING_PARAM
+            ordering = request.query_params.get(ordering_param, "")
+            fields = {field.strip().lstrip("-") for field in ordering.split(",")}
+            if self.ordering_field in fields:
+                message = (
+                    f"Ordering by `{self.ordering_field}` requires `{self.tag_param}`."
+                )
+                raise ValidationError({ordering_param: message})
+            return queryset
+        if tag not in GuildTag.TagValue.values:
+            raise ValidationError({self.tag_param: f"Unknown tag '{tag}'."})
+        try:
+            min_count = max(1, int(request.query_params.get(self.min_count_param, 1)))
+        except ValueError:
+            raise ValidationError({self.min_count_param: "Must be an integer."})
+        return queryset.filter(
+            standings__board=GuildStanding.tag_board(tag),
+            standings__score__gte=min_count,
+        ).annotate(tag_count=F("standings__score"))
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.tag_param,
+                "required": False,
+                "in": "query",
+                "description": "Only guilds given this tag.",
+                "schema": {"type": "string", "enum": GuildTag.TagValue.values},
+            },
+            {
+                "name": self.min_count_param,
+                "required": False,
+                "in": "query",
+                "description": "Only guilds given `tag` at least this many times.",
+                "schema": {"type": "integer"},
+            },
+        ]
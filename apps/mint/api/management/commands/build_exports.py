@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from api.exports import EXPORT_SERIALIZERS, get_export_formats, get_export_path
+
+
+class Command(BaseCommand):
+    help = (
+        "Build every MintyDB bulk export (see api.exports) for the current "
+        "game data version under EXPORT_ROOT, so that requests never build "
+        "them. Run after import_gamedata."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--format",
+            action="append",
+            choices=get_export_formats(),
+            dest="formats",
+            help="Only build this format (repeatable; default: all).",
+        )
+
+    def handle(self, *args, **options):
+        formats = options["formats"] or get_export_formats()
+        for entity in EXPORT_SERIALIZERS:
+            for export_format in formats:
+                path = get_export_path(entity, export_format, wait=True)
+                self.stdout.write(f"{entity}.{export_format}: {path}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Built {len(EXPORT_SERIALIZERS) * len(formats)} exports."
+            )
+        )
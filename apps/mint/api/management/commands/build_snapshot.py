@@ -0,0 +1,51 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from api.snapshot import SnapshotBuilder
+from api.urls import router
+from api.views.game import GameDataViewSet
+
+
+class Command(BaseCommand):
+    help = (
+        "Render every MintyDB game data endpoint (list pages, details and "
+        "nested relations) into a static snapshot under SNAPSHOT_ROOT: "
+        "content-addressed gzip (and brotli, when installed) bodies plus a "
+        "manifest. Served with SNAPSHOT_SERVE until the next import."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--base-url",
+            default="http://localhost:8000",
+            help="Scheme and host the API is served from, used in pagination "
+            "links (default: http://localhost:8000).",
+        )
+        parser.add_argument(
+            "--prune",
+            action="store_true",
+            help="Remove bodies from earlier builds no longer referenced.",
+        )
+
+    def handle(self, *args, **options):
+        builder = SnapshotBuilder(
+            settings.SNAPSHOT_ROOT, options["base_url"], stdout=self.stdout
+        )
+        viewsets = [
+            (basename, viewset)
+            for _, viewset, basename in router.registry
+            if issubclass(viewset, GameDataViewSet)
+        ]
+        try:
+            manifest = builder.build(viewsets)
+        except RuntimeError as exc:
+            raise CommandError(str(exc)) from exc
+
+        if options["prune"]:
+            self.stdout.write(f"Pruned {builder.prune()} unreferenced files")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Snapshot of {manifest['entries']} responses written to "
+                f"{settings.SNAPSHOT_ROOT}."
+            )
+        )
@@ -0,0 +1,329 @@
+"""API pagination classes."""
+
+import base64
+import binascii
+import json
+from collections import namedtuple
+from collections.abc import Mapping
+
+from django.core.exceptions import FieldDoesNotExist, FieldError, ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+Cursor = namedtuple("Cursor", ["values", "reverse"])
+OrderingKey = namedtuple(
+    "OrderingKey", ["field", "descending", "nullable", "output_field"]
+)
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (seek) pagination keyed on the queryset's ordering.
+
+    The effective ordering (`?ordering=` or the model's `Meta.ordering`) is
+    extended with the primary key as a tiebreak, and the cursor carries the
+    ordering values of the last row seen. Each page is fetched with a
+    `WHERE (ordering) > (cursor)` predicate and `LIMIT page_size + 1`, so no
+    OFFSET or COUNT(*) is ever issued and deep pages cost the same as page one.
+
+    Unlike DRF's `CursorPagination`, any number of ordering fields is
+    supported and ties are broken by the primary key rather than an offset.
+    """
+
+    page_size = 100
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.keys = self.get_ordering_keys(queryset)
+        self.cursor = self.decode_cursor(request)
+
+        reverse = self.cursor is not None and self.cursor.reverse
+        queryset = queryset.order_by(*self.get_order_by(reverse))
+        if self.cursor is not None:
+            queryset = queryset.filter(self.get_seek_filter(self.cursor))
+
+        results = list(queryset[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[: self.page_size]
+        if reverse:
+            results.reverse()
+
+        if reverse:
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.cursor is not None
+
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {
+                    "type": "string",
+                    "nullable": True,
+                    "format": "uri",
+                },
+                "previous": {
+                    "type": "string",
+                    "nullable": True,
+                    "format": "uri",
+                },
+                "results": schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        if self.page_size_query_param:
+            try:
+                page_size = int(request.query_params[self.page_size_query_param])
+            except (KeyError, ValueError):
+                pass
+            else:
+                if page_size > 0:
+                    return min(page_size, self.max_page_size)
+        return self.page_size
+
+    def get_ordering_keys(self, queryset):
+        """
+        Resolve the queryset's effective ordering into seek keys, appending
+        the primary key so that every row has a unique position.
+        """
+        query = queryset.query
+        ordering = list(query.order_by)
+        if not ordering and query.default_ordering:
+            ordering = list(query.get_meta().ordering)
+
+        keys = []
+        for field in ordering:
+            assert isinstance(field, str) and field != "?", (
+                "KeysetPagination requires ordering by field names, got %r." % field
+            )
+            descending = field.startswith("-")
+            field = field.lstrip("-")
+            if field in ("pk", queryset.model._meta.pk.name):
+                field = "pk"
+            keys.append(OrderingKey(field, descending, *self._resolve(queryset, field)))
+            if field == "pk":
+                break
+        else:
+            keys.append(OrderingKey("pk", False, *self._resolve(queryset, "pk")))
+        return keys
+
+    def get_order_by(self, reverse):
+        # NULLs of nullable keys sort last in the forward direction so that
+        # the seek predicate is well defined regardless of the backend's
+        # default. Other keys keep plain ordering so their indexes apply.
+        order_by = []
+        for key in self.keys:
+            nulls = {}
+            if key.nullable:
+                nulls = {"nulls_first": True} if reverse else {"nulls_last": True}
+            if key.descending != reverse:
+                order_by.append(F(key.field).desc(**nulls))
+            else:
+                order_by.append(F(key.field).asc(**nulls))
+        return order_by
+
+    def get_seek_filter(self, cursor):
+        """
+        Build `(k1 > v1) OR (k1 = v1 AND k2 > v2) OR ...` for the cursor's
+        position, honouring each key's direction and NULL placement.
+        """
+        condition = Q(pk__in=[])
+        equal = Q()
+        for key, value in zip(self.keys, cursor.values):
+            after = self._after(key, value, cursor.reverse)
+            if after is not None:
+                condition |= equal & after
+            equal &= (
+                Q(**{f"{key.field}__isnull": True})
+                if value is None
+                else Q(**{key.field: value})
+            )
+
+        # A redundant range bound on the leading key lets the planner walk
+        # its index from the cursor instead of evaluating the disjunction
+        # over every row.
+        leading, value = self.keys[0], cursor.values[0]
+        if value is not None and not leading.nullable:
+            lookup = "lte" if leading.descending != cursor.reverse else "gte"
+            condition &= Q(**{f"{leading.field}__{lookup}": value})
+        return condition
+
+    def _after(self, key, value, reverse):
+        descending = key.descending != reverse
+        nulls_last = not reverse
+        if value is None:
+            return None if nulls_last else Q(**{f"{key.field}__isnull": False})
+        after = Q(**{f"{key.field}__{'lt' if descending else 'gt'}": value})
+        if key.nullable and nulls_last:
+            after |= Q(**{f"{key.field}__isnull": True})
+        return after
+
+    def _resolve(self, queryset, field):
+        """
+        Return whether the ordering field can be NULL, and the field whose
+        `to_python` converts its cursor values.
+        """
+        opts = queryset.model._meta
+        if field == "pk":
+            return False, opts.pk
+        nullable = False
+        for part in field.split("__"):
+            try:
+                model_field = opts.get_field(part)
+            except FieldDoesNotExist:
+                # Annotations are assumed to always produce a value.
+                annotation = queryset.query.annotations.get(field)
+                try:
+                    return False, annotation.output_field
+                except (AttributeError, FieldError):
+                    return False, None
+            nullable = nullable or model_field.null
+            if model_field.is_relation:
+                opts = model_field.related_model._meta
+        return nullable, model_field
+
+    def get_position(self, instance):
+        if isinstance(instance, Mapping):
+            # A `values()` row, keyed by the ordering fields themselves.
+            return [instance[key.field] for key in self.keys]
+
+        values = []
+        for key in self.keys:
+            value = instance
+            for attr in key.field.split("__"):
+                if value is None:
+                    break
+                value = getattr(value, attr)
+            values.append(value)
+        return values
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            payload = json.loads(
+                base64.urlsafe_b64decode(encoded.encode("ascii")).decode("utf-8")
+            )
+            fields, values, reverse = payload["f"], payload["v"], payload["r"]
+        except (TypeError, ValueError, KeyError, UnicodeError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+
+        # A cursor minted under a different `?ordering=` cannot be applied.
+        if (
+            fields != self._signature()
+            or not isinstance(values, list)
+            or len(values) != len(self.keys)
+        ):
+            raise NotFound(self.invalid_cursor_message)
+        try:
+            values = [
+                self._to_python(key, value) for key, value in zip(self.keys, values)
+            ]
+        except (ValidationError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        return Cursor(values=values, reverse=bool(reverse))
+
+    def _to_python(self, key, value):
+        to_python = getattr(key.output_field, "to_python", None)
+        if value is None or to_python is None:
+            return value
+        if isinstance(value, (list, dict)):
+            raise ValidationError("Cursor values must be scalars.")
+        return to_python(value)
+
+    def encode_cursor(self, cursor):
+        payload = {
+            "f": self._signature(),
+            "v": cursor.values,
+            "r": int(cursor.reverse),
+        }
+        data = json.dumps(payload, cls=DjangoJSONEncoder, separators=(",", ":"))
+        encoded = base64.urlsafe_b64encode(data.encode("utf-8")).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def _signature(self):
+        return [("-" if key.descending else "") + key.field for key in self.keys]
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if self.page:
+            values = self._jsonable(self.get_position(self.page[-1]))
+        else:
+            values = self.cursor.values
+        return self.encode_cursor(Cursor(values=values, reverse=False))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if self.page:
+            values = self._jsonable(self.get_position(self.page[0]))
+        else:
+            values = self.cursor.values
+        return self.encode_cursor(Cursor(values=values, reverse=True))
+
+    def _jsonable(self, values):
+        return json.loads(json.dumps(values, cls=DjangoJSONEncoder))
+
+    def get_schema_operation_parameters(self, view):
+        parameters = [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "The pagination cursor value.",
+                "schema": {"type": "string"},
+            }
+        ]
+        if self.page_size_query_param:
+            parameters.append(
+                {
+                    "name": self.page_size_query_param,
+                    "required": False,
+                    "in": "query",
+                    "description": "Number of results to return per page.",
+                    "schema": {"type": "integer"},
+                }
+            )
+        stream_query_param = getattr(view, "stream_query_param", None)
+        if stream_query_param:
+            parameters.append(
+                {
+                    "name": stream_query_param,
+                    "required": False,
+                    "in": "query",
+                    "description": (
+                        "Return all results as a single streamed array "
+                        "instead of a page."
+                    ),
+                    "schema": {"type": "boolean"},
+                }
+            )
+        return parameters
@@ -0,0 +1,47 @@
+"""API renderers."""
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_encoder = JSONEncoder()
+_fallback_renderer = JSONRenderer()
+
+
+def dumps(data):
+    """
+    Encode `data` as compact UTF-8 JSON bytes, with orjson when it is
+    installed and DRF's encoder otherwise.
+
+    orjson handles UUIDs natively. Everything else it doesn't know,
+    including datetimes (so that they keep DRF's formatting), goes through
+    DRF's `JSONEncoder`.
+    """
+    if orjson is None:
+        return _fallback_renderer.render(data)
+    return orjson.dumps(
+        data,
+        default=_encoder.default,
+        option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME,
+    )
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    `JSONRenderer` encoding with `dumps()`. Indented output, as requested
+    with `Accept: application/json; indent=4`, is left to the stock
+    renderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if orjson is None or self.get_indent(
+            accepted_media_type, renderer_context or {}
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        return dumps(data)
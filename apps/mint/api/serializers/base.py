@@ -1,8 +1,13 @@
 """Base serializers with common functionality."""
 
+from functools import cached_property
+from operator import itemgetter
+
+from django.core.exceptions import FieldDoesNotExist
 from drf_spectacular.extensions import OpenApiSerializerFieldExtension
 from drf_spectacular.openapi import AutoSchema
 from rest_flex_fields import FlexFieldsModelSerializer
+from rest_flex_fields.serializers import FlexFieldsSerializerMixin
 from rest_framework import serializers
 
 
@@ -13,6 +18,10 @@ class UUIDPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
     - On write: looks up objects by their UUID
     """
 
+    def use_pk_only_optimization(self):
+        # The UUID lives on the related object, not in the foreign key column.
+        return False
+
     def to_internal_value(self, data):
         """Accept UUID for lookups instead of numeric ID."""
         queryset = self.get_queryset()
@@ -43,6 +52,136 @@ class UUIDPrimaryKeyRelatedFieldExtension(OpenApiSerializerFieldExtension):
         }
 
 
+def get_effective_fields(serializer):
+    """
+    A serializer's fields after flex fields has applied the request's
+    `fields`, `omit` and `expand` to them.
+    """
+    if isinstance(serializer, FlexFieldsSerializerMixin):
+        if not serializer._flex_fields_rep_applied:
+            serializer.apply_flex_fields(
+                serializer.fields, serializer._flex_options_rep_only
+            )
+            serializer._flex_fields_rep_applied = True
+    return serializer.fields
+
+
+# Fields whose to_representation() returns database values unchanged.
+PASSTHROUGH_FIELDS = {
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.ChoiceField,
+    serializers.FloatField,
+    serializers.IntegerField,
+    serializers.JSONField,
+}
+
+
+class RowPlan:
+    """
+    A serializer's representation compiled against `values()` rows.
+
+    `columns` are the lookups to pass to `values()`: plain columns, the
+    related UUID of each foreign key, and the columns of expanded foreign
+    keys through their joins. `render()` then builds the same dict as the
+    serializer would from a model instance, without per-field dispatch:
+    every value is picked off the row at once, and only the fields whose
+    representation differs from the database value are converted.
+    """
+
+    def __init__(self):
+        self.columns = []
+        self.names = []
+        self.keys = []
+        # (field name, converter) for values that need converting.
+        self.converters = []
+        # (field name, nested RowPlan) for expanded foreign keys.
+        self.nested = []
+
+    def add(self, name, key, convert=None, nested=None):
+        self.names.append(name)
+        self.keys.append(key)
+        if convert is not None:
+            self.converters.append((name, convert))
+        if nested is not None:
+            self.nested.append((name, nested))
+
+    @classmethod
+    def compile(cls, serializer, model, prefix=""):
+        """
+        Compile `serializer` for rows of `model`, or return None if any of
+        its fields needs more than a flat row can provide.
+        """
+        renders = type(serializer).to_representation
+        if renders is not BaseModelSerializer.to_representation:
+            return None
+
+        plan = cls()
+        get_effective_fields(serializer)
+        for field in serializer._readable_fields:
+            if field.source == "*" or "." in field.source:
+                return None
+            try:
+                model_field = model._meta.get_field(field.source)
+            except FieldDoesNotExist:
+                return None
+
+            if not model_field.is_relation:
+                key = prefix + model_field.name
+                plan.columns.append(key)
+                plan.add(field.field_name, key, cls.get_converter(field))
+            elif not model_field.concrete or model_field.many_to_many:
+                return None
+            elif isinstance(field, UUIDPrimaryKeyRelatedField):
+                key = f"{prefix}{model_field.name}__uuid"
+                plan.columns.append(key)
+                plan.add(field.field_name, key)
+            elif isinstance(field, BaseModelSerializer):
+                nested = cls.compile(
+                    field,
+                    model_field.related_model,
+                    prefix=f"{prefix}{model_field.name}__",
+                )
+                if nested is None:
+                    return None
+                # The foreign key column tells a missing relation apart.
+                key = prefix + model_field.name
+                plan.columns.append(key)
+                plan.columns.extend(nested.columns)
+                plan.add(field.field_name, key, nested=nested)
+            else:
+                return None
+
+        # itemgetter only returns a tuple for two or more keys.
+        if len(plan.keys) > 1:
+            plan.get_values = itemgetter(*plan.keys)
+        else:
+            getters = [itemgetter(key) for key in plan.keys]
+            plan.get_values = lambda row: [getter(row) for getter in getters]
+        return plan
+
+    @staticmethod
+    def get_converter(field):
+        if type(field) in PASSTHROUGH_FIELDS:
+            return None
+        if type(field) is serializers.UUIDField and field.uuid_format == "hex_verbose":
+            # Renderers encode UUIDs as exactly this string already, as
+            # they do for the UUIDs of related fields.
+            return None
+        return field.to_representation
+
+    def render(self, row):
+        ret = dict(zip(self.names, self.get_values(row)))
+        for name, convert in self.converters:
+            value = ret[name]
+            if value is not None:
+                ret[name] = convert(value)
+        for name, nested in self.nested:
+            if ret[name] is not None:
+                ret[name] = nested.render(row)
+        return ret
+
+
 class BaseModelSerializer(FlexFieldsModelSerializer):
     """
     Base serializer that automatically maps 'uuid' field to 'id' in the API.
@@ -56,3 +195,14 @@ class BaseModelSerializer(FlexFieldsModelSerializer):
 
     class Meta:
         abstract = True
+
+    # Besides model instances, `values()` rows selecting `row_plan.columns`
+    # can be serialized; they are rendered by the compiled row plan.
+    @cached_property
+    def row_plan(self):
+        return RowPlan.compile(self, self.Meta.model)
+
+    def to_representation(self, instance):
+        if type(instance) is dict and self.row_plan is not None:
+            return self.row_plan.render(instance)
+        return super().to_representation(instance)
@@ -5,6 +5,7 @@ from minty_db.models import (
     Continent,
     CraftingIngredient,
     CraftingRecipe,
+    FarmingSpot,
     Item,
     ItemDrop,
     Job,
@@ -18,6 +19,7 @@ from minty_db.models import (
     Quest,
     QuestReward,
     Region,
+    SearchEntry,
     Skill,
 )
 
@@ -34,14 +36,14 @@ class JobSerializer(BaseModelSerializer):
     class Meta:
         model = Job
         fields = ["id", "source_id", "name", "description", "maple_class"]
-        expandable_fields = {"maple_class": (MapleClassSerializer, {"source": "maple_class"})}
+        expandable_fields = {"maple_class": MapleClassSerializer}
 
 
 class SkillSerializer(BaseModelSerializer):
     class Meta:
         model = Skill
         fields = ["id", "source_id", "name", "description", "job"]
-        expandable_fields = {"job": (JobSerializer, {"source": "job"})}
+        expandable_fields = {"job": JobSerializer}
 
 
 class ItemSerializer(BaseModelSerializer):
@@ -75,14 +77,14 @@ class RegionSerializer(BaseModelSerializer):
     class Meta:
         model = Region
         fields = ["id", "source_id", "name", "description", "continent"]
-        expandable_fields = {"continent": (ContinentSerializer, {"source": "continent"})}
+        expandable_fields = {"continent": ContinentSerializer}
 
 
 class MapSerializer(BaseModelSerializer):
     class Meta:
         model = Map
         fields = ["id", "source_id", "name", "description", "region"]
-        expandable_fields = {"region": (RegionSerializer, {"source": "region"})}
+        expandable_fields = {"region": RegionSerializer}
 
 
 class NPCSerializer(BaseModelSerializer):
@@ -110,13 +112,10 @@ class QuestSerializer(BaseModelSerializer):
             "misc_requirements",
         ]
         expandable_fields = {
-            "started_by": (NPCSerializer, {"source": "started_by"}),
-            "prerequisite_quest": (
-                "api.serializers.game_v1.QuestSerializer",
-                {"source": "prerequisite_quest"},
-            ),
-            "required_class": (MapleClassSerializer, {"source": "required_class"}),
-            "required_job": (JobSerializer, {"source": "required_job"}),
+            "started_by": NPCSerializer,
+            "prerequisite_quest": "api.serializers.game_v1.QuestSerializer",
+            "required_class": MapleClassSerializer,
+            "required_job": JobSerializer,
         }
 
 
@@ -131,8 +130,8 @@ class CraftingRecipeSerializer(BaseModelSerializer):
             "crafter_npc",
         ]
         expandable_fields = {
-            "result_item": (ItemSerializer, {"source": "result_item"}),
-            "crafter_npc": (NPCSerializer, {"source": "crafter_npc"}),
+            "result_item": ItemSerializer,
+            "crafter_npc": NPCSerializer,
         }
 
 
@@ -141,8 +140,8 @@ class ItemDropSerializer(BaseModelSerializer):
         model = ItemDrop
         fields = ["id", "item", "mob", "drop_rate"]
         expandable_fields = {
-            "item": (ItemSerializer, {"source": "item"}),
-            "mob": (MobSerializer, {"source": "mob"}),
+            "item": ItemSerializer,
+            "mob": MobSerializer,
         }
 
 
@@ -151,8 +150,8 @@ class MobSpawnSerializer(BaseModelSerializer):
         model = MobSpawn
         fields = ["id", "mob", "map"]
         expandable_fields = {
-            "mob": (MobSerializer, {"source": "mob"}),
-            "map": (MapSerializer, {"source": "map"}),
+            "mob": MobSerializer,
+            "map": MapSerializer,
         }
 
 
@@ -161,8 +160,8 @@ class NPCLocationSerializer(BaseModelSerializer):
         model = NPCLocation
         fields = ["id", "npc", "map"]
         expandable_fields = {
-            "npc": (NPCSerializer, {"source": "npc"}),
-            "map": (MapSerializer, {"source": "map"}),
+            "npc": NPCSerializer,
+            "map": MapSerializer,
         }
 
 
@@ -171,8 +170,8 @@ class NPCShopItemSerializer(BaseModelSerializer):
         model = NPCShopItem
         fields = ["id", "npc", "item", "price"]
         expandable_fields = {
-            "npc": (NPCSerializer, {"source": "npc"}),
-            "item": (ItemSerializer, {"source": "item"}),
+            "npc": NPCSerializer,
+            "item": ItemSerializer,
         }
 
 
@@ -181,8 +180,8 @@ class QuestRewardSerializer(BaseModelSerializer):
         model = QuestReward
         fields = ["id", "quest", "item", "quantity", "reward_group"]
         expandable_fields = {
-            "quest": (QuestSerializer, {"source": "quest"}),
-            "item": (ItemSerializer, {"source": "item"}),
+            "quest": QuestSerializer,
+            "item": ItemSerializer,
         }
 
 
@@ -191,6 +190,78 @@ class CraftingIngredientSerializer(BaseModelSerializer):
         model = CraftingIngredient
         fields = ["id", "recipe", "item", "quantity"]
         expandable_fields = {
-            "recipe": (CraftingRecipeSerializer, {"source": "recipe"}),
-            "item": (ItemSerializer, {"source": "item"}),
+            "recipe": CraftingRecipeSerializer,
+            "item": ItemSerializer,
         }
+
+
+class FarmingPlaceSerializer(serializers.Serializer):
+    id = serializers.UUIDField()
+    name = serializers.CharField()
+
+
+class FarmingMapSerializer(FarmingPlaceSerializer):
+    region = FarmingPlaceSerializer()
+    continent = FarmingPlaceSerializer()
+
+
+class FarmingSpotSerializer(serializers.ModelSerializer):
+    item = serializers.UUIDField(source="item_uuid")
+    mob = serializers.UUIDField(source="mob_uuid")
+    maps = FarmingMapSerializer(many=True)
+
+    class Meta:
+        model = FarmingSpot
+        fields = ["item", "mob", "mob_name", "drop_rate", "hp", "exp", "mesos", "maps"]
+        read_only_fields = fields
+
+
+class CraftingTreeNodeSerializer(serializers.Serializer):
+    item = serializers.UUIDField()
+    name = serializers.CharField()
+    quantity = serializers.IntegerField()
+    recipe = serializers.UUIDField(allow_null=True)
+    crafts = serializers.IntegerField()
+    meso_cost = serializers.IntegerField()
+    cycle = serializers.BooleanField()
+
+
+# Declared after the class so the field can refer to its own serializer.
+CraftingTreeNodeSerializer._declared_fields["ingredients"] = CraftingTreeNodeSerializer(
+    many=True
+)
+
+
+class RawMaterialSerializer(serializers.Serializer):
+    item = serializers.UUIDField()
+    name = serializers.CharField()
+    quantity = serializers.IntegerField()
+
+
+class RawMaterialsSerializer(serializers.Serializer):
+    item = serializers.UUIDField()
+    name = serializers.CharField()
+    quantity = serializers.IntegerField()
+    meso_cost = serializers.IntegerField()
+    materials = RawMaterialSerializer(many=True)
+
+
+class SearchHitSerializer(serializers.ModelSerializer):
+    id = serializers.UUIDField(source="entity_uuid")
+    score = serializers.FloatField()
+
+    class Meta:
+        model = SearchEntry
+        fields = ["id", "source_id", "name", "score"]
+        read_only_fields = fields
+
+
+class SearchGroupSerializer(serializers.Serializer):
+    type = serializers.ChoiceField(choices=list(SearchEntry.ENTITY_MODELS))
+    results = SearchHitSerializer(many=True)
+
+
+class AutocompleteSuggestionSerializer(serializers.Serializer):
+    type = serializers.CharField(source="entity_type")
+    id = serializers.UUIDField(source="uuid")
+    name = serializers.CharField()
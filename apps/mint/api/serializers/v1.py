@@ -1,9 +1,19 @@
 """API v1 serializers."""
-from minty_hq.models import Guild
+
+from rest_framework import serializers
+
+from minty_hq.models import (
+    TAGS_PER_USER,
+    Guild,
+    GuildFame,
+    GuildFameDay,
+    GuildStanding,
+    GuildTag,
+)
 from minty_mogul.models import MarketplaceItem
 from users.models import User
 
-from api.serializers.base import BaseModelSerializer
+from api.serializers.base import BaseModelSerializer, UUIDPrimaryKeyRelatedField
 
 
 class UserSerializerV1(BaseModelSerializer):
@@ -14,7 +24,7 @@ class UserSerializerV1(BaseModelSerializer):
         fields = ["id", "username", "email", "guild", "created_at", "updated_at"]
         read_only_fields = ["id", "created_at", "updated_at"]
         expandable_fields = {
-            "guild": ("api.serializers.v1.GuildSerializerV1", {"source": "guild"}),
+            "guild": "api.serializers.v1.GuildSerializerV1",
         }
 
 
@@ -28,15 +38,92 @@ class GuildSerializerV1(BaseModelSerializer):
             "name",
             "description",
             "owner",
+            "fame_total",
+            "fame_count",
+            "defame_count",
+            "created_at",
+            "updated_at",
+        ]
+        read_only_fields = [
+            "id",
+            "fame_total",
+            "fame_count",
+            "defame_count",
             "created_at",
             "updated_at",
         ]
-        read_only_fields = ["id", "created_at", "updated_at"]
         expandable_fields = {
-            "owner": ("api.serializers.v1.UserSerializerV1", {"source": "owner"}),
+            "owner": "api.serializers.v1.UserSerializerV1",
         }
 
 
+class GuildStandingSerializerV1(serializers.ModelSerializer):
+    """Version 1 of the GuildStanding serializer."""
+
+    rank = serializers.IntegerField(read_only=True)
+    guild = GuildSerializerV1(read_only=True)
+
+    class Meta:
+        model = GuildStanding
+        fields = ["board", "rank", "score", "guild"]
+        read_only_fields = fields
+
+
+class LeaderboardSerializerV1(serializers.Serializer):
+    board = serializers.CharField()
+    title = serializers.CharField()
+
+
+class GuildTagsSerializerV1(serializers.Serializer):
+    tags = serializers.ListField(
+        child=serializers.ChoiceField(choices=GuildTag.TagValue.choices),
+        max_length=TAGS_PER_USER,
+    )
+
+
+class GuildTagAssignmentSerializerV1(GuildTagsSerializerV1):
+    guild = UUIDPrimaryKeyRelatedField(queryset=Guild.objects.all())
+
+
+class GuildHistoryEventSerializerV1(serializers.ModelSerializer):
+    """
+    A change to a rating or tag: `id` is the rating's or tag's, `value` what
+    it was set to.
+    """
+
+    id = serializers.UUIDField(source="uuid", read_only=True)
+    user = UUIDPrimaryKeyRelatedField(read_only=True)
+    change = serializers.SerializerMethodField()
+
+    class Meta:
+        fields = ["id", "user", "value", "change", "history_date"]
+        read_only_fields = fields
+
+    def get_change(self, record) -> str:
+        if record.history_type == "+":
+            return "added"
+        if record.history_type == "-" or record.deleted_at is not None:
+            return "removed"
+        return "changed"
+
+
+class GuildFameEventSerializerV1(GuildHistoryEventSerializerV1):
+    class Meta(GuildHistoryEventSerializerV1.Meta):
+        model = GuildFame.history.model
+
+
+class GuildTagEventSerializerV1(GuildHistoryEventSerializerV1):
+    class Meta(GuildHistoryEventSerializerV1.Meta):
+        model = GuildTag.history.model
+
+
+class GuildFameDaySerializerV1(serializers.ModelSerializer):
+    class Meta:
+        model = GuildFameDay
+        fields = ["day", "fame_delta", "changes"]
+        read_only_fields = fields
+
+
 class MarketplaceItemSerializerV1(BaseModelSerializer):
     """Version 1 of the MarketplaceItem serializer."""
 
@@ -53,5 +140,5 @@ class MarketplaceItemSerializerV1(BaseModelSerializer):
         ]
         read_only_fields = ["id", "created_at", "updated_at"]
         expandable_fields = {
-            "seller": ("api.serializers.v1.UserSerializerV1", {"source": "seller"}),
+            "seller": "api.serializers.v1.UserSerializerV1",
         }
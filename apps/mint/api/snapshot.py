@@ -0,0 +1,319 @@
+"""
+Static snapshots of the game data API.
+
+Game data only changes on import, so every list page, detail and nested
+relation endpoint can be rendered ahead of time. A snapshot is made of
+content-addressed, compressed response bodies under `objects/`, an index
+entry per request (keyed like the response cache) naming its body and
+headers under `index/<data version>/`, and a manifest naming the current
+version. Serving from it needs no database access at all, and the bodies
+can be handed to the web server to send.
+
+A snapshot is only served while its game data version is current.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.urls import resolve, reverse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import parse_http_date_safe
+
+from minty_db.versioning import get_data_version
+from api.views.mixins import request_fingerprint
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+SNAPSHOT_HEADERS = ("Content-Type", "Vary", "Allow", "ETag", "Last-Modified")
+# Content-Encoding -> file suffix, in order of preference.
+SNAPSHOT_ENCODINGS = {"br": "br", "gzip": "gz"}
+
+MANIFEST_NAME = "manifest.json"
+
+
+def get_object_path(digest, encoding):
+    return os.path.join(
+        "objects", digest[:2], f"{digest}.json.{SNAPSHOT_ENCODINGS[encoding]}"
+    )
+
+
+def get_index_path(version, key):
+    return os.path.join("index", str(version), key[:2], f"{key}.json")
+
+
+class SnapshotBuilder:
+    """
+    Renders every game data endpoint of the given viewsets into a snapshot
+    under `root`, as seen from `base_url` (list pages hold absolute links).
+    Bodies already stored by earlier builds are reused.
+    """
+
+    def __init__(self, root, base_url, stdout=None):
+        self.root = root
+        url = urlsplit(base_url)
+        self.host = url.netloc
+        self.secure = url.scheme == "https"
+        self.factory = RequestFactory()
+        self.stdout = stdout
+        self.encodings = ["br", "gzip"] if brotli is not None else ["gzip"]
+        self.version = None
+        self.entries = 0
+        self.objects = set()
+
+    def build(self, viewsets):
+        """
+        Render every endpoint of `viewsets`, given as (basename, viewset)
+        pairs, then publish the snapshot by writing its manifest. Returns
+        the manifest.
+        """
+        self.version = get_data_version()
+        for basename, viewset in viewsets:
+            self.render_viewset(basename, viewset)
+
+        if get_data_version() != self.version:
+            raise RuntimeError("Game data changed while the snapshot was built.")
+
+        manifest = {
+            "data_version": self.version,
+            "encodings": self.encodings,
+            "entries": self.entries,
+        }
+        self.write_file(MANIFEST_NAME, json.dumps(manifest).encode())
+
+        index = os.path.join(self.root, "index")
+        for name in os.listdir(index):
+            if name.isdigit() and int(name) < self.version:
+                shutil.rmtree(os.path.join(index, name), ignore_errors=True)
+        return manifest
+
+    def render_viewset(self, basename, viewset):
+        """
+        Render every list page, detail route and nested relation route of a
+        viewset.
+        """
+        api_version = settings.REST_FRAMEWORK["DEFAULT_VERSION"]
+        kwargs = {"version": api_version}
+        pages = self.render_pages(reverse(f"{basename}-list", kwargs=kwargs))
+
+        detail_actions = [
+            action for action in viewset.get_extra_actions() if action.detail
+        ]
+        uuids = viewset.queryset.order_by().values_list("uuid", flat=True)
+        count = 0
+        for uuid in uuids.iterator():
+            kwargs = {"version": api_version, viewset.lookup_field: uuid}
+            self.render(reverse(f"{basename}-detail", kwargs=kwargs))
+            for action in detail_actions:
+                self.render(reverse(f"{basename}-{action.url_name}", kwargs=kwargs))
+            count += 1
+        self.log(f"{basename}: {pages} list pages, {count} entities")
+
+    def render_pages(self, url):
+        pages = 0
+        while url:
+            response = self.render(url)
+            if response is None:
+                break
+            pages += 1
+            url = json.loads(response.content).get("next")
+            if url:
+                url = urlsplit(url)
+                url = f"{url.path}?{url.query}"
+        return pages
+
+    def render(self, url):
+        """
+        Render one GET through the API and store it. Only successful
+        responses are stored; anything else is left to the live API.
+        """
+        request = self.factory.get(url, HTTP_HOST=self.host, secure=self.secure)
+        match = resolve(request.path)
+        # Rendered live: not from the snapshot being replaced, nor through
+        # the response cache, which a build would only flood.
+        view = match.func.cls.as_view(
+            match.func.actions,
+            **match.func.initkwargs,
+            use_snapshot=False,
+            use_response_cache=False,
+        )
+        response = view(request, *match.args, **match.kwargs)
+        if hasattr(response, "render"):
+            response.render()
+        if response.status_code != 200:
+            return None
+
+        body = response.content
+        digest = hashlib.sha256(body).hexdigest()
+        if digest not in self.objects:
+            for encoding in self.encodings:
+                path = get_object_path(digest, encoding)
+                if not os.path.exists(os.path.join(self.root, path)):
+                    self.write_file(path, self.compress(body, encoding))
+            self.objects.add(digest)
+
+        entry = {
+            "object": digest,
+            "headers": {
+                header: response[header]
+                for header in SNAPSHOT_HEADERS
+                if header in response
+            },
+        }
+        key = request_fingerprint(request)
+        self.write_file(get_index_path(self.version, key), json.dumps(entry).encode())
+        self.entries += 1
+        return response
+
+    @staticmethod
+    def compress(body, encoding):
+        if encoding == "br":
+            return brotli.compress(body)
+        return gzip.compress(body, compresslevel=9, mtime=0)
+
+    def write_file(self, path, content):
+        # Written aside and moved into place, so readers never see a
+        # partial file.
+        path = os.path.join(self.root, path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(content)
+            # mkstemp() creates the file private to this process' user.
+            os.chmod(temp_path, 0o644)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def prune(self):
+        """
+        Remove stored bodies the last build didn't refer to. Returns the
+        number of files removed.
+        """
+        removed = 0
+        for directory, _, filenames in os.walk(os.path.join(self.root, "objects")):
+            for filename in filenames:
+                if filename.split(".", 1)[0] not in self.objects:
+                    os.unlink(os.path.join(directory, filename))
+                    removed += 1
+        return removed
+
+    def log(self, message):
+        if self.stdout is not None:
+            self.stdout.write(message)
+
+
+_manifest = None
+_manifest_lock = threading.Lock()
+
+
+def get_manifest():
+    """
+    The snapshot manifest, if there is one for the current game data
+    version. Reloaded whenever the manifest file is replaced.
+    """
+    global _manifest
+    path = os.path.join(settings.SNAPSHOT_ROOT, MANIFEST_NAME)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+    with _manifest_lock:
+        if _manifest is None or _manifest[0] != mtime:
+            with open(path, "rb") as file:
+                _manifest = (mtime, json.load(file))
+        manifest = _manifest[1]
+    if manifest["data_version"] != get_data_version():
+        return None
+    return manifest
+
+
+def serve_snapshot(request):
+    """
+    Answer a GET from the current snapshot, or return None if it isn't
+    there.
+
+    The body is sent in the best encoding the client accepts, and handed
+    to the web server via `SNAPSHOT_SENDFILE_HEADER` when that is set.
+    Clients accepting no stored encoding get the body decompressed here.
+    """
+    manifest = get_manifest()
+    if manifest is None:
+        return None
+    root = settings.SNAPSHOT_ROOT
+    index_path = get_index_path(manifest["data_version"], request_fingerprint(request))
+    try:
+        with open(os.path.join(root, index_path), "rb") as file:
+            entry = json.load(file)
+    except FileNotFoundError:
+        return None
+
+    headers = entry["headers"]
+    not_modified = get_conditional_response(
+        request,
+        etag=headers.get("ETag"),
+        last_modified=parse_http_date_safe(headers.get("Last-Modified", "")),
+    )
+    if not_modified is not None:
+        return not_modified
+
+    accepted = {
+        value.split(";")[0].strip()
+        for value in request.headers.get("Accept-Encoding", "").split(",")
+    }
+    encoding = next(
+        (encoding for encoding in manifest["encodings"] if encoding in accepted),
+        None,
+    )
+    try:
+        if encoding is not None and settings.SNAPSHOT_SENDFILE_HEADER:
+            path = get_object_path(entry["object"], encoding)
+            response = HttpResponse(headers=headers)
+            response[settings.SNAPSHOT_SENDFILE_HEADER] = (
+                settings.SNAPSHOT_SENDFILE_PREFIX + path
+            )
+        else:
+            path = get_object_path(entry["object"], encoding or "gzip")
+            with open(os.path.join(root, path), "rb") as file:
+                content = file.read()
+            if encoding is None:
+                content = gzip.decompress(content)
+            response = HttpResponse(content, headers=headers)
+        if encoding is not None:
+            response["Content-Encoding"] = encoding
+    except FileNotFoundError:
+        # Pruned by a newer build since the index entry was read.
+        return None
+    patch_vary_headers(response, ["Accept-Encoding"])
+    return response
+
+
+class SnapshotMixin:
+    """
+    With `SNAPSHOT_SERVE` on, answers GETs found in the current snapshot
+    straight from its files, before anything else runs. Everything else
+    (query variants the snapshot doesn't hold, or any request once the game
+    data version has moved on) falls through to the live view.
+    """
+
+    use_snapshot = True
+
+    def dispatch(self, request, *args, **kwargs):
+        if settings.SNAPSHOT_SERVE and self.use_snapshot and request.method == "GET":
+            response = serve_snapshot(request)
+            if response is not None:
+                return response
+        return super().dispatch(request, *args, **kwargs)
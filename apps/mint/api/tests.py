@@ -1,3 +1,343 @@
-from django.test import TestCase
+import base64
+import json
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework import serializers
+
+from api.renderers import dumps
+from api.serializers.game_v1 import QuestSerializer
+from minty_db.models import (
+    NPC,
+    CraftingIngredient,
+    CraftingRecipe,
+    Item,
+    Job,
+    MapleClass,
+    Quest,
+)
+from minty_db.versioning import bump_data_version
+
+TEST_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "versions": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "versions",
+    },
+}
+
+
+@override_settings(CACHES=TEST_CACHES)
+class GameDataAPITestCase(TestCase):
+    def setUp(self):
+        # Responses cached by earlier tests would otherwise be served again.
+        cache.clear()
+        bump_data_version()
+
+    def get_json(self, url, status=200, **headers):
+        response = self.client.get(url, headers=headers)
+        self.assertEqual(response.status_code, status, response.content)
+        return response.json()
+
+
+class KeysetPaginationTests(GameDataAPITestCase):
+    def setUp(self):
+        super().setUp()
+        # Names tie, so pages are split between rows of the same name.
+        for source_id, name in enumerate(["Arrow", "Bow", "Bow", "Bow", "Claw"]):
+            Item.objects.create(source_id=source_id, name=name)
+
+    def get_pages(self, url):
+        pages = []
+        while url:
+            page = self.get_json(url)
+            pages.append([item["source_id"] for item in page["results"]])
+            url = page["next"]
+        return pages
+
+    def test_pages_follow_the_ordering_without_gaps_or_repeats(self):
+        pages = self.get_pages("/api/v1/db/items/?page_size=2")
+        self.assertEqual(pages, [[0, 1], [2, 3], [4]])
+        pages = self.get_pages("/api/v1/db/items/?page_size=2&ordering=-name")
+        self.assertEqual(pages, [[4, 1], [2, 3], [0]])
+
+    def test_previous_link_returns_the_page_before(self):
+        first = self.get_json("/api/v1/db/items/?page_size=2")
+        self.assertIsNone(first["previous"])
+        second = self.get_json(first["next"])
+        self.assertEqual(self.get_json(second["previous"]), first)
+
+    def test_bad_cursors_are_not_found(self):
+        def encode(payload):
+            data = json.dumps(payload).encode("utf-8")
+            return base64.urlsafe_b64encode(data).decode("ascii")
+
+        signature = ["name", "pk"]
+        for cursor in [
+            "not-a-cursor",
+            encode({"f": signature}),
+            # Minted under a different ordering.
+            encode({"f": ["-name", "pk"], "v": ["Bow", 1], "r": 0}),
+            encode({"f": signature, "v": ["Bow"], "r": 0}),
+            encode({"f": signature, "v": ["Bow", "one"], "r": 0}),
+            encode({"f": signature, "v": ["Bow", [1]], "r": 0}),
+        ]:
+            with self.subTest(cursor=cursor):
+                self.get_json(f"/api/v1/db/items/?cursor={cursor}", status=404)
+
+
+class CraftingTests(GameDataAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.items = {
+            name: Item.objects.create(source_id=source_id, name=name)
+            for source_id, name in enumerate(["Ore", "Plate", "Gear", "Egg", "Hen"])
+        }
+
+    def add_recipe(self, result, ingredients, meso_cost=0, result_quantity=1):
+        recipe = CraftingRecipe.objects.create(
+            result_item=self.items[result],
+            result_quantity=result_quantity,
+            meso_cost=meso_cost,
+        )
+        for name, quantity in ingredients.items():
+            CraftingIngredient.objects.create(
+                recipe=recipe, item=self.items[name], quantity=quantity
+            )
+        return recipe
+
+    def get_raw_materials(self, name, quantity):
+        item = self.items[name]
+        url = f"/api/v1/db/items/{item.uuid}/raw_materials/?quantity={quantity}"
+        return self.get_json(url)
+
+    def get_materials(self, raw_materials):
+        return [
+            (material["name"], material["quantity"])
+            for material in raw_materials["materials"]
+        ]
+
+    def test_raw_materials_multiply_through_every_level(self):
+        self.add_recipe("Plate", {"Ore": 3}, meso_cost=10, result_quantity=2)
+        self.add_recipe("Gear", {"Plate": 3, "Ore": 1}, meso_cost=5)
+
+        materials = self.get_raw_materials("Gear", 2)
+        # 2 gears take 6 plates, so 3 plate crafts of 3 ore each, plus 2 ore.
+        self.assertEqual(materials["meso_cost"], 2 * 5 + 3 * 10)
+        self.assertEqual(
+            self.get_materials(materials),
+            [("Ore", 11)],
+        )
+
+    def test_items_outside_every_recipe_are_their_own_raw_material(self):
+        materials = self.get_raw_materials("Ore", 4)
+        self.assertEqual(materials["meso_cost"], 0)
+        self.assertEqual(
+            self.get_materials(materials),
+            [("Ore", 4)],
+        )
+
+    def test_cycles_are_flagged_and_not_expanded(self):
+        egg = self.add_recipe("Egg", {"Hen": 1}, meso_cost=1)
+        self.add_recipe("Hen", {"Egg": 2}, meso_cost=1)
+
+        tree = self.get_json(f"/api/v1/db/recipes/{egg.uuid}/tree/")
+        (hen,) = tree["ingredients"]
+        (repeated_egg,) = hen["ingredients"]
+        self.assertEqual((hen["name"], hen["cycle"]), ("Hen", False))
+        self.assertEqual(
+            (repeated_egg["name"], repeated_egg["quantity"], repeated_egg["cycle"]),
+            ("Egg", 2, True),
+        )
+        self.assertEqual(repeated_egg["ingredients"], [])
+        self.assertEqual(tree["meso_cost"], 2)
+
+        # The repeated egg is where the expansion stops, so it is the raw
+        # material.
+        materials = self.get_raw_materials("Egg", 1)
+        self.assertEqual(
+            self.get_materials(materials),
+            [("Egg", 2)],
+        )
+
+    def test_recipes_missing_from_the_graph_have_no_tree(self):
+        recipe = self.add_recipe("Plate", {"Ore": 3})
+        self.items["Plate"].delete()
+        self.get_json(f"/api/v1/db/recipes/{recipe.uuid}/tree/", status=404)
+
+
+class ResponseCacheTests(GameDataAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.item = Item.objects.create(source_id=1, name="Ore")
+
+    def test_responses_are_cached_until_the_data_version_changes(self):
+        url = "/api/v1/db/items/"
+        first = self.client.get(url)
+        # update() doesn't bump the data version, so the cached body stays.
+        Item.objects.filter(pk=self.item.pk).update(name="Iron Ore")
+        with self.assertNumQueries(0):
+            cached = self.client.get(url)
+        self.assertEqual(cached.content, first.content)
+        self.assertEqual(cached["ETag"], first["ETag"])
+
+        bump_data_version()
+        fresh = self.client.get(url)
+        self.assertEqual(fresh.json()["results"][0]["name"], "Iron Ore")
+        self.assertNotEqual(fresh["ETag"], first["ETag"])
+
+    def test_reordered_parameters_share_an_entry(self):
+        self.client.get("/api/v1/db/items/?fields=name,id&page_size=5")
+        with self.assertNumQueries(0):
+            self.client.get("/api/v1/db/items/?page_size=5&fields=id,name")
+
+
+class ConditionalGetTests(GameDataAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.item = Item.objects.create(source_id=1, name="Ore")
+
+    def assertNotModified(self, url, **headers):
+        response = self.client.get(url, headers=headers)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+
+    def test_matching_etag_is_not_modified(self):
+        url = f"/api/v1/db/items/{self.item.uuid}/"
+        response = self.client.get(url)
+        self.assertIn("Last-Modified", response)
+        # Answered from the response cache, then by the view.
+        self.assertNotModified(url, if_none_match=response["ETag"])
+        cache.clear()
+        self.assertNotModified(url, if_none_match=response["ETag"])
+        self.assertNotModified(url, if_modified_since=response["Last-Modified"])
+
+        bump_data_version()
+        response = self.client.get(url, headers={"If-None-Match": response["ETag"]})
+        self.assertEqual(response.status_code, 200)
+
+    def test_lists_send_no_last_modified(self):
+        url = "/api/v1/db/items/"
+        response = self.client.get(url)
+        self.assertNotIn("Last-Modified", response)
+        cache.clear()
+        self.assertNotModified(url, if_none_match=response["ETag"])
+
+
+class QuestTestCase(GameDataAPITestCase):
+    def setUp(self):
+        super().setUp()
+        self.smith = NPC.objects.create(source_id=1, name="Smith")
+        self.warrior = MapleClass.objects.create(source_id=1, name="Warrior")
+        self.fighter = Job.objects.create(
+            source_id=1, name="Fighter", maple_class=self.warrior
+        )
+
+    def add_quests(self, count):
+        quests = list(Quest.objects.order_by("source_id"))
+        while len(quests) < count:
+            quests.append(
+                Quest.objects.create(
+                    source_id=len(quests),
+                    name=f"Quest {len(quests)}",
+                    started_by=self.smith,
+                    prerequisite_quest=quests[-1] if quests else None,
+                    required_class=self.warrior,
+                    required_job=self.fighter,
+                )
+            )
+        return quests
+
+
+class QueryCountTests(QuestTestCase):
+    def test_lists_take_one_query_for_any_number_of_rows(self):
+        for count in (1, 5):
+            self.add_quests(count)
+            for params in [
+                "",
+                "?expand=started_by,prerequisite_quest,required_class,required_job",
+                "?expand=prerequisite_quest.started_by&fields=name,prerequisite_quest",
+            ]:
+                cache.clear()
+                with self.subTest(params=params, count=count):
+                    with self.assertNumQueries(1):
+                        page = self.get_json(f"/api/v1/db/quests/{params}")
+                    self.assertEqual(len(page["results"]), count)
+
+
+class QuestListTests(QuestTestCase):
+    def test_lists_render_like_the_serializer(self):
+        quests = self.add_quests(3)
+        Quest.objects.filter(pk=quests[-1].pk).update(
+            required_job=None, misc_requirements={"level": 10}
+        )
+        expand = ["started_by", "prerequisite_quest", "required_job"]
+        page = self.get_json(f"/api/v1/db/quests/?expand={','.join(expand)}")
+        serializer = QuestSerializer(Quest.objects.all(), many=True, expand=expand)
+        self.assertEqual(page["results"], json.loads(dumps(serializer.data)))
+
+    def test_chain_ordering_puts_quests_after_their_prerequisites(self):
+        # Named against the chain, so that ordering by name would reverse it.
+        previous = None
+        for source_id, name in enumerate(["C", "B", "A"]):
+            previous = Quest.objects.create(
+                source_id=source_id,
+                name=name,
+                quest_line="Main",
+                started_by=self.smith,
+                prerequisite_quest=previous,
+            )
+        Quest.objects.create(
+            source_id=3, name="Other", quest_line="Side", started_by=self.smith
+        )
+
+        quests = self.get_json(
+            "/api/v1/db/quests/?ordered=chain&quest_line=Main"
+            "&expand=prerequisite_quest"
+        )
+        self.assertEqual([quest["name"] for quest in quests], ["C", "B", "A"])
+        self.assertIsNone(quests[0]["prerequisite_quest"])
+        self.assertEqual(
+            [quest["prerequisite_quest"]["name"] for quest in quests[1:]], ["C", "B"]
+        )
+        self.get_json("/api/v1/db/quests/?ordered=chain", status=400)
+
+
+class RowPlanTests(QuestTestCase):
+    def test_rows_render_like_instances(self):
+        quests = self.add_quests(2)
+        # The first quest has no prerequisite; this one has no class or job.
+        Quest.objects.filter(pk=quests[-1].pk).update(
+            required_class=None, required_job=None, misc_requirements={"level": 10}
+        )
+        for options in [
+            {},
+            {"expand": ["started_by", "prerequisite_quest", "required_class"]},
+            {"expand": ["prerequisite_quest.started_by", "required_job.maple_class"]},
+            {"fields": ["id", "required_job"], "expand": ["required_job"]},
+            {"omit": ["description", "misc_requirements"]},
+        ]:
+            serializer = QuestSerializer(**options)
+            self.assertIsNotNone(serializer.row_plan)
+            rows = Quest.objects.values(*serializer.row_plan.columns)
+            for quest in quests:
+                with self.subTest(options=options, quest=quest.name):
+                    quest = Quest.objects.get(pk=quest.pk)
+                    row = rows.get(pk=quest.pk)
+                    self.assertEqual(
+                        dumps(serializer.to_representation(row)),
+                        dumps(serializer.to_representation(quest)),
+                    )
+
+    def test_fields_not_read_off_the_row_are_not_compiled(self):
+        class RatedQuestSerializer(QuestSerializer):
+            rating = serializers.SerializerMethodField()
+
+            class Meta(QuestSerializer.Meta):
+                fields = [*QuestSerializer.Meta.fields, "rating"]
+
+            def get_rating(self, quest):
+                return 5
+
+        self.assertIsNone(RatedQuestSerializer().row_plan)
+        self.assertIsNotNone(RatedQuestSerializer(omit=["rating"]).row_plan)
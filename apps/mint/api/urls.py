@@ -1,8 +1,15 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from api.views.guilds import GuildViewSet
+from api.views.export import ExportView
+from api.views.guilds import (
+    GuildFameHistoryViewSet,
+    GuildLeaderboardViewSet,
+    GuildTagHistoryViewSet,
+    GuildViewSet,
+)
 from api.views.mogul import MarketplaceItemViewSet
+from api.views.search import AutocompleteViewSet, SearchViewSet
 from api.views.users import UserViewSet
 from api.views.game import (
     ContinentViewSet,
@@ -28,6 +35,21 @@ router.register(r"mogul/items", MarketplaceItemViewSet, basename="marketplace-it
 
 # MintyHQ - Guild registry
 router.register(r"guilds", GuildViewSet, basename="guild")
+router.register(
+    r"guilds/leaderboards/(?P<board>[\w-]+)",
+    GuildLeaderboardViewSet,
+    basename="guild-leaderboard",
+)
+router.register(
+    r"guilds/(?P<guild_uuid>[^/.]+)/fame-history",
+    GuildFameHistoryViewSet,
+    basename="guild-fame-history",
+)
+router.register(
+    r"guilds/(?P<guild_uuid>[^/.]+)/tag-history",
+    GuildTagHistoryViewSet,
+    basename="guild-tag-history",
+)
 
 # MintyDB - Game data endpoints
 router.register(r"db/classes", MapleClassViewSet, basename="db-class")
@@ -41,7 +63,14 @@ router.register(r"db/maps", MapViewSet, basename="db-map")
 router.register(r"db/npcs", NPCViewSet, basename="db-npc")
 router.register(r"db/quests", QuestViewSet, basename="db-quest")
 router.register(r"db/recipes", CraftingRecipeViewSet, basename="db-recipe")
+router.register(r"db/search", SearchViewSet, basename="db-search")
+router.register(r"db/autocomplete", AutocompleteViewSet, basename="db-autocomplete")
 
 urlpatterns = [
     path("", include(router.urls)),
+    path(
+        "db/export/<slug:entity>.<slug:export_format>",
+        ExportView.as_view(),
+        name="db-export",
+    ),
 ]
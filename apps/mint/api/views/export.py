@@ -0,0 +1,82 @@
+from django.http import FileResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+from rest_framework.exceptions import APIException, NotFound
+from rest_framework.views import APIView
+
+from minty_db.versioning import get_data_version
+from api.exports import (
+    EXPORT_CONTENT_TYPES,
+    EXPORT_SERIALIZERS,
+    ExportInProgress,
+    get_export_formats,
+    get_export_path,
+)
+
+
+class ExportUnavailable(APIException):
+    status_code = 503
+    default_detail = "This export is being built. Try again shortly."
+    default_code = "export_in_progress"
+    # Sent as Retry-After by DRF's exception handler.
+    wait = 30
+
+
+class ExportView(APIView):
+    @extend_schema(
+        tags=["MintyDB"],
+        operation_id="api_v1_db_export_retrieve",
+        parameters=[
+            OpenApiParameter(
+                "entity",
+                OpenApiTypes.STR,
+                OpenApiParameter.PATH,
+                enum=list(EXPORT_SERIALIZERS),
+            ),
+            OpenApiParameter(
+                "export_format",
+                OpenApiTypes.STR,
+                OpenApiParameter.PATH,
+                enum=list(EXPORT_CONTENT_TYPES),
+                description="`parquet` is only available when pyarrow is installed.",
+            ),
+        ],
+        responses={
+            (200, content_type.split(";")[0]): OpenApiTypes.BINARY
+            for content_type in EXPORT_CONTENT_TYPES.values()
+        },
+    )
+    def get(self, request, entity, export_format, **kwargs):
+        """
+        Every active row of one kind of game data as a single file, with
+        foreign keys as UUIDs. Through tables such as `item-drops` and
+        `mob-spawns` are included, so a full mirror of the database is one
+        download per entity.
+        """
+        if entity not in EXPORT_SERIALIZERS:
+            raise NotFound(f"Unknown entity '{entity}'.")
+        if export_format not in get_export_formats():
+            raise NotFound(f"Unsupported export format '{export_format}'.")
+
+        etag = quote_etag(str(get_data_version()))
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+
+        try:
+            path = get_export_path(entity, export_format)
+        except ExportInProgress:
+            raise ExportUnavailable()
+        response = FileResponse(
+            open(path, "rb"),
+            content_type=EXPORT_CONTENT_TYPES[export_format],
+            filename=f"{entity}.{export_format}",
+        )
+        response["ETag"] = etag
+        return response
+
+    def perform_content_negotiation(self, request, force=False):
+        # The response is a file, whatever the client accepts.
+        return super().perform_content_negotiation(request, force=True)
@@ -1,12 +1,16 @@
-from drf_spectacular.utils import extend_schema_view, extend_schema
+from django_filters.rest_framework import DjangoFilterBackend
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema_view, extend_schema
 from rest_framework import viewsets
 from rest_framework.decorators import action
-from rest_framework.filters import OrderingFilter, SearchFilter
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.filters import OrderingFilter
 from rest_framework.response import Response
 
 from minty_db.models import (
     Continent,
     CraftingRecipe,
+    FarmingSpot,
     Item,
     Job,
     Map,
@@ -21,6 +25,8 @@ from api.serializers.game_v1 import (
     ContinentSerializer,
     CraftingIngredientSerializer,
     CraftingRecipeSerializer,
+    CraftingTreeNodeSerializer,
+    FarmingSpotSerializer,
     ItemDropSerializer,
     ItemSerializer,
     JobSerializer,
@@ -33,84 +39,191 @@ from api.serializers.game_v1 import (
     NPCShopItemSerializer,
     QuestRewardSerializer,
     QuestSerializer,
+    RawMaterialsSerializer,
     RegionSerializer,
     SkillSerializer,
 )
+from api.filters import GameDataSearchFilter
+from api.views.mixins import (
+    CachedResponseMixin,
+    ConditionalGetMixin,
+    QueryPlanningMixin,
+    StreamingListMixin,
+    plan_serializer_query,
+)
+from api.pagination import KeysetPagination
+from api.snapshot import SnapshotMixin
+from minty_db.crafting import get_crafting_graph
+from minty_db.models.quests import order_by_chain
+
+
+# Base viewset for read-only MintyDB game data. Kept docstring-free so that
+# subclasses don't inherit it as their OpenAPI description.
+class GameDataViewSet(
+    SnapshotMixin,
+    CachedResponseMixin,
+    ConditionalGetMixin,
+    QueryPlanningMixin,
+    StreamingListMixin,
+    viewsets.ReadOnlyModelViewSet,
+):
+    @property
+    def pagination_class(self):
+        # Only `list` is keyset-paginated; nested relation actions return
+        # their full (small) result sets.
+        return KeysetPagination if self.action == "list" else None
 
 
 @extend_schema_view(
-    list=extend_schema(tags=["MintyDB"]),
-    retrieve=extend_schema(tags=["MintyDB"]),
+    list=extend_schema(tags=["MintyDB"], description="List classes."),
+    retrieve=extend_schema(tags=["MintyDB"], description="Retrieve a class."),
 )
-class MapleClassViewSet(viewsets.ReadOnlyModelViewSet):
+class MapleClassViewSet(GameDataViewSet):
     queryset = MapleClass.objects.all()
     serializer_class = MapleClassSerializer
     lookup_field = "uuid"
-    filter_backends = [SearchFilter, OrderingFilter]
+    filter_backends = [GameDataSearchFilter, OrderingFilter]
     search_fields = ["name"]
     ordering_fields = ["name"]
 
 
 @extend_schema_view(
-    list=extend_schema(tags=["MintyDB"]),
-    retrieve=extend_schema(tags=["MintyDB"]),
+    list=extend_schema(tags=["MintyDB"], description="List jobs."),
+    retrieve=extend_schema(tags=["MintyDB"], description="Retrieve a job."),
 )
-class JobViewSet(viewsets.ReadOnlyModelViewSet):
+class JobViewSet(GameDataViewSet):
     queryset = Job.objects.with_class()  # type:ignore[attr-defined]
     serializer_class = JobSerializer
     lookup_field = "uuid"
-    filter_backends = [SearchFilter, OrderingFilter]
+    filter_backends = [GameDataSearchFilter, OrderingFilter]
     search_fields = ["name"]
     filterset_fields = ["maple_class"]
     ordering_fields = ["name"]
 
 
 @extend_schema_view(
-    list=extend_schema(tags=["MintyDB"]),
-    retrieve=extend_schema(tags=["MintyDB"]),
+    list=extend_schema(tags=["MintyDB"], description="List skills."),
+    retrieve=extend_schema(tags=["MintyDB"], description="Retrieve a skill."),
 )
-class SkillViewSet(viewsets.ReadOnlyModelViewSet):
+class SkillViewSet(GameDataViewSet):
     queryset = Skill.objects.with_job()  # type:ignore[attr-defined]
     serializer_class = SkillSerializer
     lookup_field = "uuid"
-    filter_backends = [SearchFilter, OrderingFilter]
+    filter_backends = [GameDataSearchFilter, OrderingFilter]
     search_fields = ["name"]
     filterset_fields = ["job"]
     ordering_fields = ["name"]
 
 
 @extend_schema_view(
-    list=extend_schema(tags=["MintyDB"]),
-    retrieve=extend_schema(tags=["MintyDB"]),
+    list=extend_schema(tags=["MintyDB"], description="List items."),
+    retrieve=extend_schema(tags=["MintyDB"], description="Retrieve an item."),
 )
-class ItemViewSet(viewsets.ReadOnlyModelViewSet):
+class ItemViewSet(GameDataViewSet):
     queryset = Item.objects.all()
     serializer_class = ItemSerializer
     lookup_field = "uuid"
-    filter_backends = [SearchFilter, OrderingFilter]
+    filter_backends = [GameDataSearchFilter, OrderingFilter]
     search_fields = ["name"]
     filterset_fields = ["slot", "category", "subcategory"]
     ordering_fields = ["name", "slot", "category"]
 
-    @extend_schema(tags=["MintyDB"], responses={200: ItemDropSerializer(many=True)})
-    @action(detail=True, methods=["get"])
-    def dropped_by(self, request, uuid=None):
+    @extend_schema(
+        tags=["MintyDB"],
+        description="Mobs that drop this item.",
+        responses={200: ItemDropSerializer(many=True)},
+    )
+    @action(
+        detail=True,
+        methods=["get"],
+        last_modified_relations=["itemdrop", "itemdrop__mob"],
+    )
+    def dropped_by(self, request, uuid=None, **kwargs):
         item = self.get_object()
         drops = item.itemdrop_set.select_related("mob").order_by("-drop_rate")
         serializer = ItemDropSerializer(drops, many=True)
         return Response(serializer.data)
 
-    @extend_schema(tags=["MintyDB"], responses={200: NPCShopItemSerializer(many=True)})
+    @extend_schema(tags=["MintyDB"], responses={200: FarmingSpotSerializer(many=True)})
+    @action(
+        detail=True,
+        methods=["get"],
+        last_modified_relations=["itemdrop", "itemdrop__mob"],
+    )
+    def farm(self, request, uuid=None, **kwargs):
+        """
+        Mobs dropping this item with the maps they spawn in, best drop rate
+        first, served from the precomputed farming index.
+        """
+        spots = list(FarmingSpot.objects.for_item(uuid))
+        if not spots:
+            # Distinguish items that nothing drops from unknown items.
+            self.get_object()
+        serializer = FarmingSpotSerializer(spots, many=True)
+        return Response(serializer.data)
+
+    @extend_schema(
+        tags=["MintyDB"],
+        parameters=[
+            OpenApiParameter(
+                "quantity",
+                OpenApiTypes.INT,
+                description="Number of the item to craft (default: 1).",
+            )
+        ],
+        responses={200: RawMaterialsSerializer},
+    )
     @action(detail=True, methods=["get"])
-    def sold_by(self, request, uuid=None):
+    def raw_materials(self, request, uuid=None, **kwargs):
+        """
+        Base materials and total meso cost needed to craft this item,
+        expanding the cheapest recipe at every level.
+        """
+        try:
+            quantity = int(request.query_params.get("quantity", 1))
+        except ValueError:
+            quantity = 0
+        if quantity < 1:
+            raise ValidationError({"quantity": "Must be a positive integer."})
+
+        item = self.get_object()
+        graph = get_crafting_graph()
+        if item.pk in graph.items:
+            materials = graph.raw_materials(item.pk, quantity)
+        else:
+            # Not part of any recipe, so it is its own raw material.
+            material = {"item": item.uuid, "name": item.name, "quantity": quantity}
+            materials = {**material, "meso_cost": 0, "materials": [material]}
+        serializer = RawMaterialsSerializer(materials)
+        return Response(serializer.data)
+
+    @extend_schema(
+        tags=["MintyDB"],
+        description="NPCs that sell this item.",
+        responses={200: NPCShopItemSerializer(many=True)},
+    )
+    @action(
+        detail=True,
+        methods=["get"],
+        last_modified_relations=["npcshopitem", "npcshopitem__npc"],
+    )
+    def sold_by(self, request, uuid=None, **kwargs):
         item = self.get_object()
         shops = item.npcshopitem_set.select_related("npc").order_by("price")
         serializer = NPCShopItemSerializer(shops, many=True)
         return Response(serializer.data)
 
-    @extend_schema(tags=["MintyDB"], responses={200: CraftingIngredientSerializer(many=True)})
-    @action(detail=True, methods=["get"])
-    def used_in_recipes(self, request, uuid=None):
+    @extend_schema(
+        tags=["MintyDB"],
+        description="Crafting recipes that use this item as an ingredient.",
+        responses={200: CraftingIngredientSerializer(many=True)},
+    )
+    @action(
+        detail=True,
+        methods=["get"],
+        last_modified_relations=["craftingingredient", "craftingingredient__recipe"],
+    )
+    def used_in_recipes(self, request, uuid=None, **kwargs):
         item = self.get_object()
         ingredients = item.craftingingredient_set.select_related(
             "recipe__result_item"
@@ -118,9 +231,17 @@ class ItemViewSet(viewsets.ReadOnlyModelViewSet):
         serializer = CraftingIngredientSerializer(ingredients, many=True)
         return Response(serializer.data)
 
-    @extend_schema(tags=["MintyDB"], responses={200: QuestRewardSerializer(many=True)})
-    @action(detail=True, methods=["get"])
-    def quest_rewards(self, request, uuid=None):
+    @extend_schema(
+        tags=["MintyDB"],
+        description="Quests that reward this item.",
+        responses={200: QuestRewardSerializer(many=True)},
+    )
+    @action(
+        detail=True,
+        methods=["get"],
+        last_modified_relations=["questreward", "questreward__quest"],
+    )
+    def quest_rewards(self, request, uuid=None, **kwargs):
         item = self.get_object()
         rewards = item.questreward_set.select_related("quest").order_by(
             "reward_group", "quest__name"
@@ -130,88 +251,120 @@ class ItemViewSet(viewsets.ReadOnlyModelViewSet):
 
 
 @extend_schema_view(
-    list=extend_schema(tags=["MintyDB"]),
-    retrieve=extend_schema(tags=["MintyDB"]),
+    list=extend_schema(tags=["MintyDB"], description="List mobs."),
+    retrieve=extend_schema(tags=["MintyDB"], description="Retrieve a mob."),
 )
-class MobViewSet(viewsets.ReadOnlyModelViewSet):
+class MobViewSet(GameDataViewSet):
     queryset = Mob.objects.all()
     serializer_class = MobSerializer
     lookup_field = "uuid"
-    filter_backends = [SearchFilter, OrderingFilter]
+    filter_backends = [GameDataSearchFilter, OrderingFilter]
     search_fields = ["name"]
     filterset_fields = ["hp", "exp", "mesos"]
     ordering_fields = ["name", "hp", "exp", "mesos"]
 
-    @extend_schema(tags=["MintyDB"], responses={200: ItemDropSerializer(many=True)})
-    @action(detail=True, methods=["get"])
-    def drops(self, request, uuid=None):
+    @extend_schema(
+        tags=["MintyDB"],
+        description="Items this mob drops.",
+        responses={200: ItemDropSerializer(many=True)},
+    )
+    @action(
+        detail=True,
+        methods=["get"],
+        last_modified_relations=["itemdrop", "itemdrop__item"],
+    )
+    def drops(self, request, uuid=None, **kwargs):
         mob = self.get_object()
         drops = mob.itemdrop_set.select_related("item").order_by("-drop_rate")
         serializer = ItemDropSerializer(drops, many=True)
         return Response(serializer.data)
 
-    @extend_schema(tags=["MintyDB"], responses={200: MobSpawnSerializer(many=True)})
-    @action(detail=True, methods=["get"])
-    def spawns(self, request, uuid=None):
+    @extend_schema(
+        tags=["MintyDB"],
+        description="Maps this mob spawns on.",
+        responses={200: MobSpawnSerializer(many=True)},
+    )
+    @action(
+        detail=True,
+        methods=["get"],
+        last_modified_relations=["mobspawn", "mobspawn__map"],
+    )
+    def spawns(self, request, uuid=None, **kwargs):
         mob = self.get_object()
-        spawns = mob.mobspawn_set.select_related(
-            "map__region__continent"
-        ).order_by("map__name")
+        spawns = mob.mobspawn_set.select_related("map__region__continent").order_by(
+            "map__name"
+        )
         serializer = MobSpawnSerializer(spawns, many=True)
         return Response(serializer.data)
 
 
 @extend_schema_view(
-    list=extend_schema(tags=["MintyDB"]),
-    retrieve=extend_schema(tags=["MintyDB"]),
+    list=extend_schema(tags=["MintyDB"], description="List continents."),
+    retrieve=extend_schema(tags=["MintyDB"], description="Retrieve a continent."),
 )
-class ContinentViewSet(viewsets.ReadOnlyModelViewSet):
+class ContinentViewSet(GameDataViewSet):
     queryset = Continent.objects.all()
     serializer_class = ContinentSerializer
     lookup_field = "uuid"
-    filter_backends = [SearchFilter, OrderingFilter]
+    filter_backends = [GameDataSearchFilter, OrderingFilter]
     search_fields = ["name"]
     ordering_fields = ["name"]
 
 
 @extend_schema_view(
-    list=extend_schema(tags=["MintyDB"]),
-    retrieve=extend_schema(tags=["MintyDB"]),
+    list=extend_schema(tags=["MintyDB"], description="List regions."),
+    retrieve=extend_schema(tags=["MintyDB"], description="Retrieve a region."),
 )
-class RegionViewSet(viewsets.ReadOnlyModelViewSet):
+class RegionViewSet(GameDataViewSet):
     queryset = Region.objects.with_continent()  # type:ignore[attr-defined]
     serializer_class = RegionSerializer
     lookup_field = "uuid"
-    filter_backends = [SearchFilter, OrderingFilter]
+    filter_backends = [GameDataSearchFilter, OrderingFilter]
     search_fields = ["name"]
     filterset_fields = ["continent"]
     ordering_fields = ["name"]
 
 
 @extend_schema_view(
-    list=extend_schema(tags=["MintyDB"]),
-    retrieve=extend_schema(tags=["MintyDB"]),
+    list=extend_schema(tags=["MintyDB"], description="List maps."),
+    retrieve=extend_schema(tags=["MintyDB"], description="Retrieve a map."),
 )
-class MapViewSet(viewsets.ReadOnlyModelViewSet):
+class MapViewSet(GameDataViewSet):
     queryset = Map.objects.with_region()  # type:ignore[attr-defined]
     serializer_class = MapSerializer
     lookup_field = "uuid"
-    filter_backends = [SearchFilter, OrderingFilter]
+    filter_backends = [GameDataSearchFilter, OrderingFilter]
     search_fields = ["name"]
     filterset_fields = ["region"]
     ordering_fields = ["name"]
 
-    @extend_schema(tags=["MintyDB"], responses={200: MobSpawnSerializer(many=True)})
-    @action(detail=True, methods=["get"])
-    def mobs(self, request, uuid=None):
+    @extend_schema(
+        tags=["MintyDB"],
+        description="Mobs that spawn on this map.",
+        responses={200: MobSpawnSerializer(many=True)},
+    )
+    @action(
+        detail=True,
+        methods=["get"],
+        last_modified_relations=["mobspawn", "mobspawn__mob"],
+    )
+    def mobs(self, request, uuid=None, **kwargs):
         map_obj = self.get_object()
         spawns = map_obj.mobspawn_set.select_related("mob").order_by("mob__name")
         serializer = MobSpawnSerializer(spawns, many=True)
         return Response(serializer.data)
 
-    @extend_schema(tags=["MintyDB"], responses={200: NPCLocationSerializer(many=True)})
-    @action(detail=True, methods=["get"])
-    def npcs(self, request, uuid=None):
+    @extend_schema(
+        tags=["MintyDB"],
+        description="NPCs found on this map.",
+        responses={200: NPCLocationSerializer(many=True)},
+    )
+    @action(
+        detail=True,
+        methods=["get"],
+        last_modified_relations=["npclocation", "npclocation__npc"],
+    )
+    def npcs(self, request, uuid=None, **kwargs):
         map_obj = self.get_object()
         locations = map_obj.npclocation_set.select_related("npc").order_by("npc__name")
         serializer = NPCLocationSerializer(locations, many=True)
@@ -219,28 +372,44 @@ class MapViewSet(viewsets.ReadOnlyModelViewSet):
 
 
 @extend_schema_view(
-    list=extend_schema(tags=["MintyDB"]),
-    retrieve=extend_schema(tags=["MintyDB"]),
+    list=extend_schema(tags=["MintyDB"], description="List NPCs."),
+    retrieve=extend_schema(tags=["MintyDB"], description="Retrieve an NPC."),
 )
-class NPCViewSet(viewsets.ReadOnlyModelViewSet):
+class NPCViewSet(GameDataViewSet):
     queryset = NPC.objects.all()
     serializer_class = NPCSerializer
     lookup_field = "uuid"
-    filter_backends = [SearchFilter, OrderingFilter]
+    filter_backends = [GameDataSearchFilter, OrderingFilter]
     search_fields = ["name"]
     ordering_fields = ["name"]
 
-    @extend_schema(tags=["MintyDB"], responses={200: NPCShopItemSerializer(many=True)})
-    @action(detail=True, methods=["get"])
-    def sells(self, request, uuid=None):
+    @extend_schema(
+        tags=["MintyDB"],
+        description="Items this NPC sells.",
+        responses={200: NPCShopItemSerializer(many=True)},
+    )
+    @action(
+        detail=True,
+        methods=["get"],
+        last_modified_relations=["npcshopitem", "npcshopitem__item"],
+    )
+    def sells(self, request, uuid=None, **kwargs):
         npc = self.get_object()
         items = npc.npcshopitem_set.select_related("item").order_by("price")
         serializer = NPCShopItemSerializer(items, many=True)
         return Response(serializer.data)
 
-    @extend_schema(tags=["MintyDB"], responses={200: NPCLocationSerializer(many=True)})
-    @action(detail=True, methods=["get"])
-    def locations(self, request, uuid=None):
+    @extend_schema(
+        tags=["MintyDB"],
+        description="Maps this NPC is found on.",
+        responses={200: NPCLocationSerializer(many=True)},
+    )
+    @action(
+        detail=True,
+        methods=["get"],
+        last_modified_relations=["npclocation", "npclocation__map"],
+    )
+    def locations(self, request, uuid=None, **kwargs):
         npc = self.get_object()
         locations = npc.npclocation_set.select_related(
             "map__region__continent"
@@ -248,17 +417,33 @@ class NPCViewSet(viewsets.ReadOnlyModelViewSet):
         serializer = NPCLocationSerializer(locations, many=True)
         return Response(serializer.data)
 
-    @extend_schema(tags=["MintyDB"], responses={200: QuestSerializer(many=True)})
-    @action(detail=True, methods=["get"])
-    def quests(self, request, uuid=None):
+    @extend_schema(
+        tags=["MintyDB"],
+        description="Quests this NPC starts.",
+        responses={200: QuestSerializer(many=True)},
+    )
+    @action(
+        detail=True,
+        methods=["get"],
+        last_modified_relations=["quests"],
+    )
+    def quests(self, request, uuid=None, **kwargs):
         npc = self.get_object()
-        quests = npc.quests.order_by("name")
+        quests = npc.quests.with_requirements().order_by("name")
         serializer = QuestSerializer(quests, many=True)
         return Response(serializer.data)
 
-    @extend_schema(tags=["MintyDB"], responses={200: CraftingRecipeSerializer(many=True)})
-    @action(detail=True, methods=["get"])
-    def recipes(self, request, uuid=None):
+    @extend_schema(
+        tags=["MintyDB"],
+        description="Crafting recipes this NPC crafts.",
+        responses={200: CraftingRecipeSerializer(many=True)},
+    )
+    @action(
+        detail=True,
+        methods=["get"],
+        last_modified_relations=["crafting_recipes"],
+    )
+    def recipes(self, request, uuid=None, **kwargs):
         npc = self.get_object()
         recipes = npc.crafting_recipes.select_related("result_item").order_by(
             "result_item__name"
@@ -268,21 +453,91 @@ class NPCViewSet(viewsets.ReadOnlyModelViewSet):
 
 
 @extend_schema_view(
-    list=extend_schema(tags=["MintyDB"]),
-    retrieve=extend_schema(tags=["MintyDB"]),
+    list=extend_schema(
+        tags=["MintyDB"],
+        description="List quests.",
+        parameters=[
+            OpenApiParameter(
+                "ordered",
+                OpenApiTypes.STR,
+                enum=["chain"],
+                description=(
+                    "`chain` returns the whole (unpaginated) `quest_line` with "
+                    "every quest after its prerequisite. Requires `quest_line`."
+                ),
+            )
+        ],
+    ),
+    retrieve=extend_schema(tags=["MintyDB"], description="Retrieve a quest."),
 )
-class QuestViewSet(viewsets.ReadOnlyModelViewSet):
+class QuestViewSet(GameDataViewSet):
     queryset = Quest.objects.with_requirements()  # type:ignore[attr-defined]
     serializer_class = QuestSerializer
     lookup_field = "uuid"
-    filter_backends = [SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, GameDataSearchFilter, OrderingFilter]
     search_fields = ["name"]
     filterset_fields = ["quest_line", "required_level", "required_class", "required_job", "started_by"]
     ordering_fields = ["name", "required_level"]
 
-    @extend_schema(tags=["MintyDB"], responses={200: QuestRewardSerializer(many=True)})
+    @property
+    def pagination_class(self):
+        request = getattr(self, "request", None)
+        if request is not None and request.query_params.get("ordered") == "chain":
+            return None
+        return super().pagination_class
+
+    def should_plan_query(self):
+        # Chain ordering reads each quest's prerequisite off whole instances;
+        # see plan_chain().
+        ordered = self.request.query_params.get("ordered")
+        return super().should_plan_query() and ordered != "chain"
+
+    def plan_chain(self, queryset):
+        """
+        Join and prefetch what the serializer renders for a chain of quests,
+        keeping every column for `order_by_chain()`.
+        """
+        plan = plan_serializer_query(self.get_serializer(), queryset.model)
+        plan.can_defer = False
+        return plan.apply(queryset)
+
+    def list(self, request, *args, **kwargs):
+        ordered = request.query_params.get("ordered")
+        if ordered is None:
+            return super().list(request, *args, **kwargs)
+        if ordered != "chain":
+            raise ValidationError({"ordered": "Must be 'chain'."})
+        if not request.query_params.get("quest_line"):
+            raise ValidationError({"quest_line": "Required when ordered=chain."})
+
+        queryset = self.plan_chain(self.filter_queryset(self.get_queryset()))
+        quests = order_by_chain(queryset)
+        serializer = self.get_serializer(quests, many=True)
+        return Response(serializer.data)
+
+    @extend_schema(tags=["MintyDB"], responses={200: QuestSerializer(many=True)})
     @action(detail=True, methods=["get"])
-    def rewards(self, request, uuid=None):
+    def chain(self, request, uuid=None, **kwargs):
+        """
+        The quest's full chain, from the first prerequisite through every
+        quest it unlocks, with each quest after its prerequisite.
+        """
+        quest = self.get_object()
+        quests = order_by_chain(self.plan_chain(self.get_queryset().chain(quest)))
+        serializer = self.get_serializer(quests, many=True)
+        return Response(serializer.data)
+
+    @extend_schema(
+        tags=["MintyDB"],
+        description="Items this quest rewards.",
+        responses={200: QuestRewardSerializer(many=True)},
+    )
+    @action(
+        detail=True,
+        methods=["get"],
+        last_modified_relations=["questreward", "questreward__item"],
+    )
+    def rewards(self, request, uuid=None, **kwargs):
         quest = self.get_object()
         rewards = quest.questreward_set.select_related("item").order_by(
             "reward_group", "item__name"
@@ -292,10 +547,10 @@ class QuestViewSet(viewsets.ReadOnlyModelViewSet):
 
 
 @extend_schema_view(
-    list=extend_schema(tags=["MintyDB"]),
-    retrieve=extend_schema(tags=["MintyDB"]),
+    list=extend_schema(tags=["MintyDB"], description="List crafting recipes."),
+    retrieve=extend_schema(tags=["MintyDB"], description="Retrieve a crafting recipe."),
 )
-class CraftingRecipeViewSet(viewsets.ReadOnlyModelViewSet):
+class CraftingRecipeViewSet(GameDataViewSet):
     queryset = CraftingRecipe.objects.with_result()  # type:ignore[attr-defined]
     serializer_class = CraftingRecipeSerializer
     lookup_field = "uuid"
@@ -303,12 +558,37 @@ class CraftingRecipeViewSet(viewsets.ReadOnlyModelViewSet):
     filterset_fields = ["result_item", "crafter_npc", "meso_cost"]
     ordering_fields = ["result_item__name", "meso_cost"]
 
-    @extend_schema(tags=["MintyDB"], responses={200: CraftingIngredientSerializer(many=True)})
-    @action(detail=True, methods=["get"])
-    def ingredients(self, request, uuid=None):
+    @extend_schema(
+        tags=["MintyDB"],
+        description="Ingredients of this recipe.",
+        responses={200: CraftingIngredientSerializer(many=True)},
+    )
+    @action(
+        detail=True,
+        methods=["get"],
+        last_modified_relations=["craftingingredient", "craftingingredient__item"],
+    )
+    def ingredients(self, request, uuid=None, **kwargs):
         recipe = self.get_object()
         ingredients = recipe.craftingingredient_set.select_related("item").order_by(
             "item__name"
         )
         serializer = CraftingIngredientSerializer(ingredients, many=True)
         return Response(serializer.data)
+
+    @extend_schema(tags=["MintyDB"], responses={200: CraftingTreeNodeSerializer})
+    @action(detail=True, methods=["get"])
+    def tree(self, request, uuid=None, **kwargs):
+        """
+        Full ingredient tree for one craft of this recipe, with quantities
+        multiplied through each level and the total meso cost of the subtree
+        on every node. Craftable ingredients are expanded with their
+        cheapest recipe; a repeated item is flagged as a cycle and not
+        expanded further.
+        """
+        recipe = self.get_object()
+        tree = get_crafting_graph().expand(recipe.pk)
+        if tree is None:
+            raise NotFound("No crafting tree is available for this recipe.")
+        serializer = CraftingTreeNodeSerializer(tree)
+        return Response(serializer.data)
@@ -1,9 +1,35 @@
-from drf_spectacular.utils import extend_schema_view, extend_schema
-from rest_framework import viewsets
+from datetime import timedelta
+from uuid import UUID
+
+from django.db import transaction
+from django.utils import timezone
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import (
+    OpenApiParameter,
+    extend_schema_view,
+    extend_schema,
+)
+from rest_framework import mixins, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.filters import OrderingFilter, SearchFilter
+from rest_framework.generics import get_object_or_404
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 
-from minty_hq.models import Guild
-from api.serializers.v1 import GuildSerializerV1
+from minty_hq.models import Guild, GuildStanding
+from api.filters import GuildTagFilter
+from api.pagination import KeysetPagination
+from api.serializers.v1 import (
+    GuildFameDaySerializerV1,
+    GuildFameEventSerializerV1,
+    GuildSerializerV1,
+    GuildStandingSerializerV1,
+    GuildTagAssignmentSerializerV1,
+    GuildTagEventSerializerV1,
+    GuildTagsSerializerV1,
+    LeaderboardSerializerV1,
+)
 
 
 @extend_schema_view(
@@ -17,10 +43,238 @@ from api.serializers.v1 import GuildSerializerV1
 class GuildViewSet(viewsets.ModelViewSet):
     """API endpoint for guilds."""
 
-    queryset = Guild.objects.all()
+    queryset = Guild.objects.select_related("owner")
     serializer_class = GuildSerializerV1
     lookup_field = "uuid"
-    filter_backends = [SearchFilter, OrderingFilter]
+    filter_backends = [SearchFilter, GuildTagFilter, OrderingFilter]
     search_fields = ["name"]
     filterset_fields = ["owner"]
-    ordering_fields = ["name", "created_at"]
+    ordering_fields = [
+        "name",
+        "created_at",
+        "fame_total",
+        "fame_count",
+        "defame_count",
+        "tag_count",
+    ]
+    max_bulk_tags = 100
+    max_activity_days = 366
+
+    @extend_schema(
+        tags=["MintyHQ"], responses={200: LeaderboardSerializerV1(many=True)}
+    )
+    @action(detail=False, methods=["get"], filter_backends=[])
+    def leaderboards(self, request, **kwargs):
+        """
+        Every guild leaderboard: overall fame, fame gained this week, and
+        one per tag.
+        """
+        boards = [
+            {"board": board, "title": title}
+            for board, title in GuildStanding.get_boards().items()
+        ]
+        return Response(LeaderboardSerializerV1(boards, many=True).data)
+
+    @extend_schema(
+        tags=["MintyHQ"], responses={200: GuildStandingSerializerV1(many=True)}
+    )
+    @action(detail=True, methods=["get"], filter_backends=[])
+    def standings(self, request, uuid=None, **kwargs):
+        """
+        The guild's rank on every leaderboard it is on.
+        """
+        guild = self.get_object()
+        standings = GuildStanding.objects.for_guild(guild)
+        for standing in standings:
+            # Already fetched; saves a query per standing.
+            standing.guild = guild
+        return Response(GuildStandingSerializerV1(standings, many=True).data)
+
+    @extend_schema(
+        tags=["MintyHQ"],
+        parameters=[
+            OpenApiParameter(
+                "days",
+                OpenApiTypes.INT,
+                description="Number of days back from today (default: 30, max: 366).",
+            ),
+        ],
+        responses={200: GuildFameDaySerializerV1(many=True)},
+    )
+    @action(detail=True, methods=["get"], url_path="fame-activity", filter_backends=[])
+    def fame_activity(self, request, uuid=None, **kwargs):
+        """
+        The fame the guild gained or lost per day, latest first, for days
+        with any ratings changed.
+        """
+        guild = self.get_object()
+        try:
+            days = int(request.query_params.get("days", 30))
+        except ValueError:
+            raise ValidationError({"days": "Must be a positive integer."})
+        days = max(1, min(days, self.max_activity_days))
+        since = timezone.localdate() - timedelta(days=days)
+        fame_days = guild.fame_days.filter(day__gt=since).order_by("-day")
+        return Response(GuildFameDaySerializerV1(fame_days, many=True).data)
+
+    @extend_schema(
+        tags=["MintyHQ"],
+        methods=["GET"],
+        responses={200: GuildTagAssignmentSerializerV1},
+    )
+    @extend_schema(
+        tags=["MintyHQ"],
+        methods=["PUT"],
+        request=GuildTagsSerializerV1,
+        responses={200: GuildTagAssignmentSerializerV1},
+    )
+    @action(
+        detail=True,
+        methods=["get", "put"],
+        filter_backends=[],
+        permission_classes=[IsAuthenticated],
+    )
+    def tags(self, request, uuid=None, **kwargs):
+        """
+        The tags you give the guild, at most 5. `PUT` replaces all of them
+        at once.
+        """
+        guild = self.get_object()
+        if request.method == "PUT":
+            serializer = GuildTagsSerializerV1(data=request.data)
+            serializer.is_valid(raise_exception=True)
+            tags = guild.set_tags(request.user, serializer.validated_data["tags"])
+        else:
+            tags = guild.get_user_tags(request.user)
+        assignment = {"guild": guild, "tags": [tag.value for tag in tags]}
+        return Response(GuildTagAssignmentSerializerV1(assignment).data)
+
+    @extend_schema(
+        tags=["MintyHQ"],
+        operation_id="api_v1_guilds_tags_bulk_update",
+        request=GuildTagAssignmentSerializerV1(many=True),
+        responses={200: GuildTagAssignmentSerializerV1(many=True)},
+    )
+    @action(
+        detail=False,
+        methods=["put"],
+        url_path="tags",
+        filter_backends=[],
+        permission_classes=[IsAuthenticated],
+    )
+    def bulk_tags(self, request, **kwargs):
+        """
+        Replace the tags you give each of the listed guilds, at most 5 per
+        guild, as one transaction.
+        """
+        serializer = GuildTagAssignmentSerializerV1(
+            data=request.data, many=True, max_length=self.max_bulk_tags
+        )
+        serializer.is_valid(raise_exception=True)
+        assignments = serializer.validated_data
+        tags = {}
+        with transaction.atomic():
+            # In guild order, so that concurrent bulk writes over the same
+            # guilds take their locks in the same order.
+            for assignment in sorted(
+                assignments, key=lambda assignment: assignment["guild"].pk
+            ):
+                guild = assignment["guild"]
+                tags[guild.pk] = [
+                    tag.value
+                    for tag in guild.set_tags(request.user, assignment["tags"])
+                ]
+        assignments = [
+            {"guild": assignment["guild"], "tags": tags[assignment["guild"].pk]}
+            for assignment in assignments
+        ]
+        return Response(GuildTagAssignmentSerializerV1(assignments, many=True).data)
+
+
+@extend_schema_view(
+    list=extend_schema(
+        tags=["MintyHQ"],
+        operation_id="api_v1_guilds_leaderboards_standings_list",
+        parameters=[
+            OpenApiParameter(
+                "board",
+                OpenApiTypes.STR,
+                OpenApiParameter.PATH,
+                enum=list(GuildStanding.get_boards()),
+            ),
+        ],
+    ),
+)
+class GuildLeaderboardViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
+    """
+    Guilds on a leaderboard, best first, with their rank. Ties share a
+    rank.
+    """
+
+    serializer_class = GuildStandingSerializerV1
+    pagination_class = KeysetPagination
+    filter_backends = []
+
+    def get_queryset(self):
+        board = self.kwargs["board"]
+        if board not in GuildStanding.get_boards():
+            raise NotFound(f"Unknown leaderboard '{board}'.")
+        return (
+            GuildStanding.objects.on_board(board)
+            .select_related("guild")
+            .order_by("-score", "pk")
+        )
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        return GuildStanding.objects.with_ranks(page)
+
+
+class GuildHistoryViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
+    pagination_class = KeysetPagination
+    filter_backends = []
+    # Name of the Guild method returning the history, e.g. "get_fame_history".
+    history_method = None
+
+    def get_queryset(self):
+        guild = get_object_or_404(Guild.objects, uuid=self.kwargs["guild_uuid"])
+        queryset = getattr(guild, self.history_method)()
+        user = self.request.query_params.get("user")
+        if user:
+            try:
+                queryset = queryset.filter(user__uuid=UUID(user))
+            except ValueError:
+                raise ValidationError({"user": "Must be a UUID."})
+        return queryset.select_related("user")
+
+
+history_parameters = [
+    OpenApiParameter("guild_uuid", OpenApiTypes.UUID, OpenApiParameter.PATH),
+    OpenApiParameter(
+        "user", OpenApiTypes.UUID, description="Only changes made by this user."
+    ),
+]
+
+
+@extend_schema_view(
+    list=extend_schema(tags=["MintyHQ"], parameters=history_parameters),
+)
+class GuildFameHistoryViewSet(GuildHistoryViewSet):
+    """
+    Every change to the guild's fame ratings, latest first.
+    """
+
+    serializer_class = GuildFameEventSerializerV1
+    history_method = "get_fame_history"
+
+
+@extend_schema_view(
+    list=extend_schema(tags=["MintyHQ"], parameters=history_parameters),
+)
+class GuildTagHistoryViewSet(GuildHistoryViewSet):
+    """
+    Every change to the guild's tags, latest first.
+    """
+
+    serializer_class = GuildTagEventSerializerV1
+    history_method = "get_tag_history"
@@ -0,0 +1,375 @@
+"""Reusable viewset mixins."""
+
+import hashlib
+from urllib.parse import urlencode
+
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Max, Prefetch
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+from rest_framework import serializers
+
+from minty_db.versioning import get_data_version
+from api.renderers import dumps
+from api.serializers.base import UUIDPrimaryKeyRelatedField, get_effective_fields
+
+# Comma-separated parameters whose order doesn't matter.
+LIST_PARAMS = ("expand", "fields", "omit")
+
+
+def request_fingerprint(request):
+    """
+    Digest identifying the representation a GET request asks for: host,
+    path and query string, with parameters (and the values of `expand`,
+    `fields` and `omit`) sorted.
+    """
+    params = []
+    for name, values in request.GET.lists():
+        if name in LIST_PARAMS:
+            values = [",".join(sorted(",".join(values).split(",")))]
+        params.extend((name, value) for value in sorted(values))
+    query = urlencode(sorted(params))
+    return hashlib.blake2b(
+        # Bodies hold absolute links, so the host is part of the key.
+        f"{request.get_host()}{request.path}?{query}".encode("utf-8"),
+        digest_size=16,
+    ).hexdigest()
+
+
+class NotModified(Exception):
+    def __init__(self, response):
+        self.response = response
+
+
+class ConditionalGetMixin:
+    """
+    Strong ETag and Last-Modified validators for GET responses, answering
+    `If-None-Match` / `If-Modified-Since` with 304 before the view fetches
+    or serializes anything.
+
+    The ETag covers the request's representation and the game data
+    version, which changes on every import or admin edit. Last-Modified is
+    only sent where it can be derived from every row the response reads:
+    `retrieve`, and detail actions that name the relations they read in
+    `last_modified_relations`, e.g.
+    `@action(detail=True, last_modified_relations=["itemdrop", "itemdrop__mob"])`.
+    It is then the newest `updated_at` among the looked-up row and those
+    relations, found with a single aggregate. Soft-deleted relation rows
+    still count, since the join doesn't skip them. Lists (where deleted rows
+    drop out of the set) and actions computed from derived state send the
+    ETag alone.
+    """
+
+    # None: the action's Last-Modified can't be derived from `updated_at`.
+    last_modified_relations = None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.validators = None
+        if request.method != "GET":
+            return
+
+        self.validators = self.get_validators(request)
+        if self.validators is not None:
+            etag, last_modified = self.validators
+            response = get_conditional_response(
+                request._request, etag=etag, last_modified=last_modified
+            )
+            if response is not None:
+                raise NotModified(response)
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return exc.response
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        validators = getattr(self, "validators", None)
+        if validators is not None and response.status_code in (200, 304):
+            etag, last_modified = validators
+            response["ETag"] = etag
+            if last_modified is not None:
+                response["Last-Modified"] = http_date(last_modified)
+        return response
+
+    def get_validators(self, request):
+        """
+        Return `(etag, last_modified)` for the request, with last_modified
+        as a Unix timestamp or None, or None to skip conditional handling.
+        """
+        if self.action != "list" and not self.detail:
+            return None
+
+        relations = self.last_modified_relations
+        if relations is None and self.action == "retrieve":
+            relations = ()
+
+        last_modified = None
+        if self.detail and relations is not None:
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            try:
+                queryset = self.get_queryset().filter(
+                    **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+                )
+            except ValidationError:
+                # Malformed lookup values are left for the view to reject.
+                return None
+
+            fields = ["updated_at"]
+            fields += [f"{path}__updated_at" for path in relations]
+            latest = queryset.order_by().aggregate(
+                **{f"latest_{index}": Max(field) for index, field in enumerate(fields)}
+            )
+            timestamps = [value.timestamp() for value in latest.values() if value]
+            last_modified = int(max(timestamps)) if timestamps else None
+
+        etag = hashlib.blake2b(
+            f"{request_fingerprint(request._request)}:{get_data_version()}:"
+            f"{last_modified}".encode("utf-8"),
+            digest_size=16,
+        ).hexdigest()
+        return f'"{etag}"', last_modified
+
+
+class CachedResponseMixin:
+    """
+    Read-through cache for the rendered bodies of successful GET responses.
+
+    Keys combine the host and path, the normalized query string (so
+    `?expand=b,a&fields=x` and `?fields=x&expand=a,b` share an entry) and
+    the game data version. Writers bump the version instead of deleting
+    keys, and stale entries simply age out of the cache. Hits are answered
+    before the view runs, so they never touch the database.
+    """
+
+    use_response_cache = True
+    response_cache_timeout = 60 * 60 * 24
+    response_cache_headers = (
+        "Content-Type",
+        "Vary",
+        "Allow",
+        "ETag",
+        "Last-Modified",
+    )
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method != "GET" or not self.use_response_cache:
+            return super().dispatch(request, *args, **kwargs)
+
+        key = self.get_response_cache_key(request)
+        cached = cache.get(key)
+        if cached is not None:
+            content, headers = cached
+            response = HttpResponse(content, headers=headers)
+            # Conditional requests are answered from the cached validators.
+            last_modified = parse_http_date_safe(headers.get("Last-Modified", ""))
+            return get_conditional_response(
+                request,
+                etag=headers.get("ETag"),
+                last_modified=last_modified,
+                response=response,
+            )
+
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code == 200 and not response.streaming:
+
+            def store(response):
+                headers = {
+                    header: response[header]
+                    for header in self.response_cache_headers
+                    if header in response
+                }
+                cache.set(key, (response.content, headers), self.response_cache_timeout)
+
+            if hasattr(response, "add_post_render_callback"):
+                response.add_post_render_callback(store)
+            else:
+                store(response)
+        return response
+
+    def get_response_cache_key(self, request):
+        return f"api:response:{get_data_version()}:{request_fingerprint(request)}"
+
+
+class QueryPlan:
+    """
+    The `select_related`, `prefetch_related` and `only` arguments needed to
+    render a serializer's effective fields without further queries.
+    """
+
+    def __init__(self):
+        self.select_related = []
+        self.prefetch_related = []
+        self.only = []
+        # False once a field reads something other than a model field, in
+        # which case the columns it needs can't be known.
+        self.can_defer = True
+
+    def apply(self, queryset):
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*self.prefetch_related)
+        if self.can_defer and self.only:
+            queryset = queryset.only(*self.only)
+        return queryset
+
+
+def plan_serializer_query(serializer, model, plan=None, prefix=""):
+    """
+    Walk a (flex fields) serializer's effective fields, after `fields`,
+    `omit` and `expand` are applied, and record what `model`'s queryset
+    must join or prefetch so that rendering it issues no extra queries.
+    Expanded foreign keys are followed with `select_related` and planned
+    recursively; expanded reverse and many-to-many relations get a
+    `Prefetch` whose queryset is planned the same way.
+    """
+    plan = plan or QueryPlan()
+    plan.only.append(prefix + model._meta.pk.name)
+    for field in get_effective_fields(serializer).values():
+        if field.source == "*":
+            plan.can_defer = False
+            continue
+        name = field.source.split(".")[0]
+        try:
+            model_field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            plan.can_defer = False
+            continue
+
+        nested = field.child if isinstance(field, serializers.ListSerializer) else field
+        if not model_field.is_relation:
+            plan.only.append(prefix + model_field.name)
+        elif model_field.concrete and not model_field.many_to_many:
+            # Forward foreign key / one-to-one.
+            plan.only.append(prefix + model_field.name)
+            if isinstance(nested, serializers.BaseSerializer):
+                plan.select_related.append(prefix + model_field.name)
+                plan_serializer_query(
+                    nested,
+                    model_field.related_model,
+                    plan,
+                    prefix=f"{prefix}{model_field.name}__",
+                )
+            elif isinstance(nested, UUIDPrimaryKeyRelatedField):
+                plan.select_related.append(prefix + model_field.name)
+                plan.only.append(f"{prefix}{model_field.name}__uuid")
+        else:
+            # Reverse relations and many-to-many.
+            related_model = model_field.related_model
+            queryset = related_model._default_manager.all()
+            if isinstance(nested, serializers.BaseSerializer):
+                child_plan = plan_serializer_query(nested, related_model)
+                # The prefetch needs the column joining back to the parent.
+                child_plan.can_defer = False
+                queryset = child_plan.apply(queryset)
+            plan.prefetch_related.append(
+                Prefetch(prefix + model_field.name, queryset=queryset)
+            )
+    return plan
+
+
+def _related_paths(select_related, prefix=""):
+    for name, nested in select_related.items():
+        yield prefix + name
+        yield from _related_paths(nested, prefix=f"{prefix}{name}__")
+
+
+class QueryPlanningMixin:
+    """
+    Shapes the queryset of planned actions to the serializer's effective
+    fields (see `plan_serializer_query`), so that any combination of
+    `?expand=`, `?fields=` and `?omit=` renders in a bounded number of
+    queries. Columns the serializer doesn't render are deferred, except
+    for the ordering keys that pagination reads back.
+
+    When the serializer compiles to a row plan (see `RowPlan`), rows are
+    fetched as `values()` dicts instead and rendered by the plan, skipping
+    model instantiation and DRF's per-field dispatch.
+    """
+
+    query_planned_actions = ("list", "retrieve")
+
+    def should_plan_query(self):
+        return self.action in self.query_planned_actions
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if not self.should_plan_query():
+            return queryset
+
+        serializer = self.get_serializer()
+        plan = plan_serializer_query(serializer, queryset.model)
+        row_plan = getattr(serializer, "row_plan", None)
+        values = [*row_plan.columns] if row_plan is not None else None
+        # Relations the viewset's queryset already joins stay loaded.
+        if queryset.query.select_related is True:
+            plan.can_defer = False
+        elif queryset.query.select_related:
+            plan.only.extend(_related_paths(queryset.query.select_related))
+        ordering = queryset.query.order_by or queryset.model._meta.ordering
+        # Pagination reads the ordering keys and the primary key back off
+        # each row.
+        ordering_keys = ["pk"]
+        for field in ordering:
+            if not isinstance(field, str):
+                plan.can_defer = False
+                values = None
+                continue
+            field = field.lstrip("-")
+            if field == "?":
+                continue
+            ordering_keys.append(field)
+            if field in queryset.query.annotations or field == "pk":
+                continue
+            if "__" in field:
+                plan.select_related.append(field.rsplit("__", 1)[0])
+            plan.only.append(field)
+
+        if values is not None:
+            return queryset.values(*dict.fromkeys([*values, *ordering_keys]))
+        return plan.apply(queryset)
+
+
+class StreamingListMixin:
+    """
+    `?stream=true` makes `list` return every result as a single JSON array
+    instead of a page. Rows are read from the database in chunks (through a
+    server-side cursor on PostgreSQL) and encoded as they are produced, so
+    memory use stays flat however large the table is.
+    """
+
+    stream_query_param = "stream"
+    stream_chunk_size = 2000
+    # Bytes of encoded rows gathered before each write.
+    stream_buffer_size = 64 * 1024
+
+    def list(self, request, *args, **kwargs):
+        if request.query_params.get(self.stream_query_param) not in ("true", "1"):
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        return StreamingHttpResponse(
+            self.stream_json(queryset, self.get_serializer()),
+            content_type="application/json",
+        )
+
+    def stream_json(self, queryset, serializer):
+        buffer = [b"["]
+        size = 0
+        separator = b""
+        for row in queryset.iterator(chunk_size=self.stream_chunk_size):
+            encoded = dumps(serializer.to_representation(row))
+            buffer.append(separator)
+            buffer.append(encoded)
+            separator = b","
+            size += len(encoded)
+            if size >= self.stream_buffer_size:
+                yield b"".join(buffer)
+                buffer = []
+                size = 0
+        buffer.append(b"]")
+        yield b"".join(buffer)
@@ -17,7 +17,7 @@ from api.serializers.v1 import MarketplaceItemSerializerV1
 class MarketplaceItemViewSet(viewsets.ModelViewSet):
     """API endpoint for marketplace items."""
 
-    queryset = MarketplaceItem.objects.all()
+    queryset = MarketplaceItem.objects.select_related("seller")
     serializer_class = MarketplaceItemSerializerV1
     lookup_field = "uuid"
     filter_backends = [SearchFilter, OrderingFilter]
@@ -0,0 +1,88 @@
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+from rest_framework import viewsets
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from minty_db.autocomplete import get_autocomplete_index
+from minty_db.models import SearchEntry
+from api.serializers.game_v1 import (
+    AutocompleteSuggestionSerializer,
+    SearchGroupSerializer,
+)
+
+
+class SearchViewSet(viewsets.ViewSet):
+    max_per_type = 20
+
+    @extend_schema(
+        tags=["MintyDB"],
+        parameters=[
+            OpenApiParameter("q", OpenApiTypes.STR, required=True),
+            OpenApiParameter(
+                "limit",
+                OpenApiTypes.INT,
+                description="Maximum hits per entity type (default: 5, max: 20).",
+            ),
+        ],
+        responses={200: SearchGroupSerializer(many=True)},
+    )
+    def list(self, request, *args, **kwargs):
+        """
+        Search every kind of game data by name. Hits are grouped by entity
+        type, best group first, and ranked within each group.
+        """
+        term = request.query_params.get("q", "").strip()
+        if not term:
+            raise ValidationError({"q": "This query parameter is required."})
+        try:
+            limit = int(request.query_params.get("limit", 5))
+        except ValueError:
+            raise ValidationError({"limit": "Must be a positive integer."})
+        limit = max(1, min(limit, self.max_per_type))
+
+        groups = {}
+        for entry in SearchEntry.objects.search(term, per_type=limit):
+            groups.setdefault(entry.entity_type, []).append(entry)
+        ranked = sorted(
+            groups.items(), key=lambda group: (-group[1][0].score, -group[1][0].weight)
+        )
+
+        serializer = SearchGroupSerializer(
+            [{"type": entity_type, "results": hits} for entity_type, hits in ranked],
+            many=True,
+        )
+        return Response(serializer.data)
+
+
+class AutocompleteViewSet(viewsets.ViewSet):
+    max_limit = 50
+
+    @extend_schema(
+        tags=["MintyDB"],
+        parameters=[
+            OpenApiParameter("q", OpenApiTypes.STR, required=True),
+            OpenApiParameter(
+                "limit",
+                OpenApiTypes.INT,
+                description="Maximum number of suggestions (default: 10, max: 50).",
+            ),
+        ],
+        responses={200: AutocompleteSuggestionSerializer(many=True)},
+    )
+    def list(self, request, *args, **kwargs):
+        """
+        Items, mobs, NPCs, maps, quests and skills with a word in their name
+        starting with `q`, shortest names first. Served from memory.
+        """
+        try:
+            limit = int(request.query_params.get("limit", 10))
+        except ValueError:
+            raise ValidationError({"limit": "Must be a positive integer."})
+        limit = max(1, min(limit, self.max_limit))
+
+        suggestions = get_autocomplete_index().suggest(
+            request.query_params.get("q", ""), limit
+        )
+        serializer = AutocompleteSuggestionSerializer(suggestions, many=True)
+        return Response(serializer.data)
@@ -17,7 +17,7 @@ from api.serializers.v1 import UserSerializerV1
 class UserViewSet(viewsets.ModelViewSet):
     """API endpoint for users."""
 
-    queryset = User.objects.all()
+    queryset = User.objects.select_related("guild")
     serializer_class = UserSerializerV1
     lookup_field = "uuid"
     filter_backends = [SearchFilter, OrderingFilter]
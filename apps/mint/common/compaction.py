@@ -0,0 +1,176 @@
+"""
+Compaction of soft-deleted rows.
+
+Soft deletes never remove rows, so tombstones from re-imports and user
+churn pile up in every table and index. Compaction hard-deletes tombstones
+older than a retention window, in short batched transactions, optionally
+archiving them to NDJSON first.
+
+A tombstone is only removed once no row that is kept still references it,
+so live rows are never cascaded into or nulled out. Models are compacted
+referencing models first, so that expired children don't hold back their
+parents.
+"""
+
+import json
+import time
+from dataclasses import dataclass, field
+from graphlib import TopologicalSorter
+from pathlib import Path
+
+from django.apps import apps
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import OperationalError, connection, transaction
+from django.db.models import Exists, OuterRef, Q
+
+from common.models import BaseModel
+
+# SQLSTATE of a lock wait running out on PostgreSQL.
+LOCK_NOT_AVAILABLE = "55P03"
+
+
+@dataclass
+class CompactionStats:
+    reclaimed: int = 0
+    batches: int = 0
+    retries: int = 0
+    seconds: float = 0.0
+    # Rows of other models removed along with the tombstones, by label.
+    cascaded: dict[str, int] = field(default_factory=dict)
+
+    def __str__(self):
+        stats = (
+            f"{self.reclaimed} reclaimed in {self.batches} batches "
+            f"({self.seconds:.1f}s, {self.retries} retries)"
+        )
+        if self.cascaded:
+            cascaded = ", ".join(
+                f"{count} {label}" for label, count in sorted(self.cascaded.items())
+            )
+            stats += f", cascaded to {cascaded}"
+        return stats
+
+
+def get_soft_delete_models():
+    """
+    Every concrete BaseModel subclass, ordered so that models come before
+    the models they reference. Nullable references are left out of the
+    ordering, which breaks the users <-> guilds cycle.
+    """
+    models = [
+        model
+        for model in apps.get_models()
+        if issubclass(model, BaseModel) and not model._meta.proxy
+    ]
+    graph = {model: set() for model in models}
+    for model in models:
+        for fk in model._meta.concrete_fields:
+            target = fk.related_model
+            if fk.many_to_one and target in graph and target is not model:
+                if not fk.null:
+                    graph[target].add(model)
+    return list(TopologicalSorter(graph).static_order())
+
+
+class Compactor:
+    """
+    Hard-deletes the tombstones of a model deleted before `cutoff`, in
+    batches of `batch_size` rows, each in its own transaction.
+
+    Between batches it sleeps `pause` seconds. On PostgreSQL each batch
+    waits at most `lock_timeout` milliseconds for row locks, and is retried
+    after a growing back-off instead of queueing behind (and in front of)
+    other writers.
+    """
+
+    def __init__(
+        self,
+        cutoff,
+        batch_size=1000,
+        pause=0.1,
+        lock_timeout=2000,
+        max_retries=5,
+        archive_dir: Path | None = None,
+    ):
+        self.cutoff = cutoff
+        self.batch_size = batch_size
+        self.pause = pause
+        self.lock_timeout = lock_timeout
+        self.max_retries = max_retries
+        self.archive_dir = archive_dir
+
+    def get_expired(self, model):
+        """
+        Tombstones of `model` past the cutoff that no kept row references.
+        """
+        queryset = model.all_objects.filter(deleted_at__lt=self.cutoff)
+        kept = Q(deleted_at__isnull=True) | Q(deleted_at__gte=self.cutoff)
+        for relation in model._meta.related_objects:
+            related = relation.related_model
+            if relation.many_to_many or not issubclass(related, BaseModel):
+                continue
+            fk = relation.field
+            references = related.all_objects.filter(
+                kept, **{fk.attname: OuterRef(fk.target_field.attname)}
+            )
+            queryset = queryset.filter(~Exists(references))
+        return queryset
+
+    def compact(self, model) -> CompactionStats:
+        stats = CompactionStats()
+        started = time.monotonic()
+        while True:
+            ids = list(
+                self.get_expired(model)
+                .order_by("pk")
+                .values_list("pk", flat=True)[: self.batch_size]
+            )
+            if not ids:
+                break
+            deleted = self.delete_batch(model, ids, stats)
+            stats.batches += 1
+            label = model._meta.label
+            stats.reclaimed += deleted.pop(label, 0)
+            for other, count in deleted.items():
+                if count:
+                    stats.cascaded[other] = stats.cascaded.get(other, 0) + count
+            time.sleep(self.pause)
+        stats.seconds = time.monotonic() - started
+        return stats
+
+    def delete_batch(self, model, ids, stats) -> dict[str, int]:
+        for attempt in range(self.max_retries + 1):
+            try:
+                with transaction.atomic():
+                    if connection.vendor == "postgresql":
+                        with connection.cursor() as cursor:
+                            cursor.execute(
+                                "SET LOCAL lock_timeout = %s",
+                                [f"{self.lock_timeout}ms"],
+                            )
+                    # Checked again, in case a reference was added since.
+                    batch = self.get_expired(model).filter(pk__in=ids)
+                    rows = list(batch.values()) if self.archive_dir else None
+                    _, deleted = batch.delete()
+                    if rows:
+                        # Written before commit: a failed write rolls back.
+                        self.archive(model, rows)
+                    return deleted
+            except OperationalError as exc:
+                pgcode = getattr(exc.__cause__, "pgcode", None)
+                if pgcode != LOCK_NOT_AVAILABLE or attempt == self.max_retries:
+                    raise
+                stats.retries += 1
+                time.sleep((self.pause or 0.1) * 2 ** (attempt + 1))
+
+    def archive(self, model, rows):
+        """
+        Append rows, as stored, to `<app_label>.<model>.ndjson` in the
+        archive directory.
+        """
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        path = self.archive_dir / f"{model._meta.label_lower}.ndjson"
+        with path.open("a", encoding="utf-8") as file:
+            for row in rows:
+                file.write(json.dumps(row, cls=DjangoJSONEncoder))
+                file.write("\n")
@@ -0,0 +1,102 @@
+from datetime import timedelta
+from pathlib import Path
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from common.compaction import Compactor, get_soft_delete_models
+
+
+class Command(BaseCommand):
+    help = (
+        "Hard-delete soft-deleted rows older than the retention window, in "
+        "small batched transactions, optionally archiving them to NDJSON first. "
+        "Tombstones still referenced by rows that are kept are left alone."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "models",
+            nargs="*",
+            metavar="app_label.Model",
+            help="Models to compact (default: every soft-deleting model).",
+        )
+        parser.add_argument(
+            "--older-than",
+            type=int,
+            default=30,
+            metavar="DAYS",
+            help="Retention window in days (default: 30).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of rows deleted per transaction (default: 1000).",
+        )
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0.1,
+            help="Seconds to sleep between batches (default: 0.1).",
+        )
+        parser.add_argument(
+            "--lock-timeout",
+            type=int,
+            default=2000,
+            metavar="MS",
+            help="Longest wait for row locks before a batch backs off and is "
+            "retried, on PostgreSQL (default: 2000).",
+        )
+        parser.add_argument(
+            "--archive",
+            type=Path,
+            metavar="DIRECTORY",
+            help="Append deleted rows to <app_label>.<model>.ndjson here first.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only count the rows that would be deleted.",
+        )
+
+    def handle(self, *args, **options):
+        models = get_soft_delete_models()
+        if options["models"]:
+            try:
+                selected = {apps.get_model(label) for label in options["models"]}
+            except (LookupError, ValueError) as exc:
+                raise CommandError(str(exc)) from exc
+            if unknown := selected.difference(models):
+                names = ", ".join(model._meta.label for model in unknown)
+                raise CommandError(f"Not soft-deleting models: {names}")
+            models = [model for model in models if model in selected]
+
+        cutoff = timezone.now() - timedelta(days=options["older_than"])
+        compactor = Compactor(
+            cutoff,
+            batch_size=options["batch_size"],
+            pause=options["pause"],
+            lock_timeout=options["lock_timeout"],
+            archive_dir=options["archive"],
+        )
+
+        total = 0
+        for model in models:
+            label = model._meta.label
+            if options["dry_run"]:
+                count = compactor.get_expired(model).count()
+                self.stdout.write(f"{label}: {count} to reclaim")
+            else:
+                stats = compactor.compact(model)
+                count = stats.reclaimed
+                self.stdout.write(f"{label}: {stats}")
+            total += count
+
+        verb = "to reclaim" if options["dry_run"] else "reclaimed"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{total} soft-deleted rows older than {cutoff:%Y-%m-%d} {verb}."
+            )
+        )
@@ -1,7 +1,48 @@
 import uuid
 
 from django.db import models
+from django.db.models import Q
 from django.utils import timezone
+from simple_history.models import HistoricalRecords
+
+# The condition SoftDeleteManager adds to every query.
+ACTIVE_ROWS = Q(deleted_at__isnull=True)
+
+
+def active_index(*fields, name):
+    """
+    An index over active rows only, for the Meta.indexes of BaseModel
+    subclasses. Matches the filter of their default manager, so lookups of
+    active rows can use it and tombstones don't bloat it.
+    """
+    return models.Index(fields=list(fields), name=name, condition=ACTIVE_ROWS)
+
+
+def active_unique(*fields, name):
+    """
+    A unique constraint among active rows only, for the Meta.constraints of
+    BaseModel subclasses, so that a soft-deleted row doesn't block adding
+    its replacement.
+    """
+    return models.UniqueConstraint(
+        fields=list(fields), name=name, condition=ACTIVE_ROWS
+    )
+
+
+class IndexedHistoricalRecords(HistoricalRecords):
+    """
+    HistoricalRecords whose historical model also gets `indexes`, e.g. to
+    page through the history of one parent by date.
+    """
+
+    def __init__(self, *args, indexes=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.indexes = list(indexes)
+
+    def get_meta_options(self, model):
+        meta_fields = super().get_meta_options(model)
+        meta_fields["indexes"] = [*meta_fields.get("indexes", ()), *self.indexes]
+        return meta_fields
 
 
 class SoftDeleteQuerySet(models.QuerySet):
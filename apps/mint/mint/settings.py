@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 import os
+import tempfile
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -46,6 +47,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     # Third party
     "rest_framework",
     "django_filters",
@@ -108,6 +110,62 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Cached responses must be visible to every process, including management
+# commands, so the default is a file-based cache rather than a per-process
+# in-memory one. The game data version (see minty_db.versioning) that every
+# cache key depends on gets a cache of its own: it holds nothing else, so it
+# is never culled along with responses when the default cache fills up.
+
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv(
+            "CACHE_BACKEND", "django.core.cache.backends.filebased.FileBasedCache"
+        ),
+        "LOCATION": os.getenv(
+            "CACHE_LOCATION", os.path.join(tempfile.gettempdir(), "mint-cache")
+        ),
+        "OPTIONS": {"MAX_ENTRIES": int(os.getenv("CACHE_MAX_ENTRIES", "10000"))},
+    },
+    "versions": {
+        "BACKEND": os.getenv(
+            "VERSION_CACHE_BACKEND",
+            "django.core.cache.backends.filebased.FileBasedCache",
+        ),
+        "LOCATION": os.getenv(
+            "VERSION_CACHE_LOCATION",
+            os.path.join(tempfile.gettempdir(), "mint-versions"),
+        ),
+        "TIMEOUT": None,
+    },
+}
+
+
+# Bulk exports
+# Built per game data version by `manage.py build_exports`, or on first request
+# to /api/<version>/db/export/ (see api.exports).
+
+EXPORT_ROOT = os.getenv(
+    "EXPORT_ROOT", os.path.join(tempfile.gettempdir(), "mint-exports")
+)
+
+
+# Static snapshot
+# Built with `manage.py build_snapshot` (see api.snapshot). With
+# SNAPSHOT_SERVE on, game data GETs are answered from the snapshot while it
+# matches the game data version. Set SNAPSHOT_SENDFILE_HEADER (e.g.
+# X-Accel-Redirect) to have the web server send the files, found at
+# SNAPSHOT_SENDFILE_PREFIX followed by their path under SNAPSHOT_ROOT.
+
+SNAPSHOT_ROOT = os.getenv(
+    "SNAPSHOT_ROOT", os.path.join(tempfile.gettempdir(), "mint-snapshot")
+)
+SNAPSHOT_SERVE = os.getenv("SNAPSHOT_SERVE", "False") == "True"
+SNAPSHOT_SENDFILE_HEADER = os.getenv("SNAPSHOT_SENDFILE_HEADER", "")
+SNAPSHOT_SENDFILE_PREFIX = os.getenv("SNAPSHOT_SENDFILE_PREFIX", "/snapshot/")
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -162,7 +220,7 @@ AUTH_USER_MODEL = "users.User"
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_RENDERER_CLASSES": [
-        "rest_framework.renderers.JSONRenderer",
+        "api.renderers.FastJSONRenderer",
     ],
     "DEFAULT_PARSER_CLASSES": [
         "rest_framework.parsers.JSONParser",
@@ -200,6 +258,10 @@ SPECTACULAR_SETTINGS = {
             "description": "Guilds API - Mint's community-driven guild registry.",
         },
     ],
+    "ENUM_NAME_OVERRIDES": {
+        "FameValueEnum": "minty_hq.models.GuildFame.FameValue",
+        "TagValueEnum": "minty_hq.models.GuildTag.TagValue",
+    },
 }
 
 # Django Vite
@@ -1,4 +1,5 @@
 from django.contrib import admin
+from django.db import transaction
 
 from minty_db.models import (
     Continent,
@@ -19,111 +20,144 @@ from minty_db.models import (
     Region,
     Skill,
 )
+from minty_db.models.derived import refresh_derived_tables
+from minty_db.versioning import bump_data_version
+
+
+def game_data_changed():
+    refresh_derived_tables()
+    bump_data_version()
+
+
+class GameDataAdmin(admin.ModelAdmin):
+    """
+    After every admin change, rebuilds the farming and search indexes as an
+    import does, and bumps the game data version, so caches and in-memory
+    indexes built from the previous data are dropped.
+    """
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        transaction.on_commit(game_data_changed)
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        transaction.on_commit(game_data_changed)
+
+    def delete_queryset(self, request, queryset):
+        super().delete_queryset(request, queryset)
+        transaction.on_commit(game_data_changed)
 
 
 @admin.register(MapleClass)
-class MapleClassAdmin(admin.ModelAdmin):
+class MapleClassAdmin(GameDataAdmin):
     list_display = ("name", "source_id")
     search_fields = ("name",)
 
 
 @admin.register(Job)
-class JobAdmin(admin.ModelAdmin):
+class JobAdmin(GameDataAdmin):
     list_display = ("name", "maple_class", "source_id")
     list_filter = ("maple_class",)
     search_fields = ("name",)
 
 
 @admin.register(Skill)
-class SkillAdmin(admin.ModelAdmin):
+class SkillAdmin(GameDataAdmin):
     list_display = ("name", "job", "source_id")
     list_filter = ("job",)
     search_fields = ("name",)
 
 
 @admin.register(Item)
-class ItemAdmin(admin.ModelAdmin):
+class ItemAdmin(GameDataAdmin):
     list_display = ("name", "slot", "category", "subcategory", "source_id")
     list_filter = ("slot", "category", "subcategory")
     search_fields = ("name",)
 
 
 @admin.register(Mob)
-class MobAdmin(admin.ModelAdmin):
+class MobAdmin(GameDataAdmin):
     list_display = ("name", "hp", "exp", "mesos", "source_id")
     search_fields = ("name",)
 
 
 @admin.register(Continent)
-class ContinentAdmin(admin.ModelAdmin):
+class ContinentAdmin(GameDataAdmin):
     list_display = ("name", "source_id")
     search_fields = ("name",)
 
 
 @admin.register(Region)
-class RegionAdmin(admin.ModelAdmin):
+class RegionAdmin(GameDataAdmin):
     list_display = ("name", "continent", "source_id")
     list_filter = ("continent",)
     search_fields = ("name",)
 
 
 @admin.register(Map)
-class MapAdmin(admin.ModelAdmin):
+class MapAdmin(GameDataAdmin):
     list_display = ("name", "region", "source_id")
     list_filter = ("region",)
     search_fields = ("name",)
 
 
 @admin.register(NPC)
-class NPCAdmin(admin.ModelAdmin):
+class NPCAdmin(GameDataAdmin):
     list_display = ("name", "source_id")
     search_fields = ("name",)
 
 
 @admin.register(Quest)
-class QuestAdmin(admin.ModelAdmin):
+class QuestAdmin(GameDataAdmin):
     list_display = ("name", "quest_line", "required_level", "source_id")
     list_filter = ("quest_line", "required_level")
     search_fields = ("name",)
 
 
 @admin.register(CraftingRecipe)
-class CraftingRecipeAdmin(admin.ModelAdmin):
-    list_display = ("result_item", "result_quantity", "meso_cost", "crafter_npc")
+class CraftingRecipeAdmin(GameDataAdmin):
+    list_display = (
+        "result_item",
+        "result_quantity",
+        "meso_cost",
+        "crafter_npc",
+        "source_id",
+    )
     list_filter = ("crafter_npc",)
 
 
 @admin.register(ItemDrop)
-class ItemDropAdmin(admin.ModelAdmin):
+class ItemDropAdmin(GameDataAdmin):
     list_display = ("item", "mob", "drop_rate")
     list_filter = ("mob",)
 
 
 @admin.register(MobSpawn)
-class MobSpawnAdmin(admin.ModelAdmin):
+class MobSpawnAdmin(GameDataAdmin):
     list_display = ("mob", "map")
     list_filter = ("map", "mob")
 
 
 @admin.register(NPCLocation)
-class NPCLocationAdmin(admin.ModelAdmin):
+class NPCLocationAdmin(GameDataAdmin):
     list_display = ("npc", "map")
     list_filter = ("map", "npc")
 
 
 @admin.register(NPCShopItem)
-class NPCShopItemAdmin(admin.ModelAdmin):
+class NPCShopItemAdmin(GameDataAdmin):
     list_display = ("npc", "item", "price")
     list_filter = ("npc",)
 
 
 @admin.register(QuestReward)
-class QuestRewardAdmin(admin.ModelAdmin):
+class QuestRewardAdmin(GameDataAdmin):
     list_display = ("quest", "item", "quantity", "reward_group")
     list_filter = ("quest", "reward_group")
 
 
 @admin.register(CraftingIngredient)
-class CraftingIngredientAdmin(admin.ModelAdmin):
+class CraftingIngredientAdmin(GameDataAdmin):
     list_display = ("recipe", "item", "quantity")
     list_filter = ("recipe",)
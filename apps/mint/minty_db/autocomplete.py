@@ -0,0 +1,106 @@
+"""
+Prefix autocomplete over game data names.
+
+Suggestions are served from a sorted in-memory array of normalized names,
+built once per game data version, so the hot path never touches the
+database.
+"""
+
+import bisect
+import heapq
+import threading
+from dataclasses import dataclass
+
+from django.apps import apps
+
+from minty_db.models.derived import SearchEntry, normalize_name
+from minty_db.versioning import get_data_version
+
+AUTOCOMPLETE_TYPES = ["item", "mob", "npc", "map", "quest", "skill"]
+
+
+@dataclass(frozen=True)
+class Suggestion:
+    entity_type: str
+    uuid: str
+    name: str
+
+
+class AutocompleteIndex:
+    """
+    Every word-suffix of every normalized name ("zakum helmet" is indexed
+    under both "zakum helmet" and "helmet"), kept sorted so the entries
+    for a prefix are one contiguous slice found by binary search.
+
+    Matches are ranked by name length, then entity type weight, then name.
+    Results for one- and two-character prefixes, whose slices are the
+    largest, are memoized.
+    """
+
+    memo_prefix_length = 2
+
+    def __init__(self, entries):
+        # entries: (key, rank, Suggestion)
+        entries.sort(key=lambda entry: entry[0])
+        self.keys = [key for key, _, _ in entries]
+        self.entries = [(rank, suggestion) for _, rank, suggestion in entries]
+        self._memo = {}
+
+    @classmethod
+    def load(cls):
+        entries = []
+        for entity_type in AUTOCOMPLETE_TYPES:
+            model = apps.get_model("minty_db", SearchEntry.ENTITY_MODELS[entity_type])
+            weight = SearchEntry.WEIGHTS[entity_type]
+            for entity_uuid, name in model.objects.values_list("uuid", "name"):
+                normalized = normalize_name(name)
+                if not normalized:
+                    continue
+                suggestion = Suggestion(entity_type, str(entity_uuid), name)
+                rank = (len(normalized), -weight, name, suggestion.uuid)
+                words = normalized.split(" ")
+                for index in range(len(words)):
+                    entries.append((" ".join(words[index:]), rank, suggestion))
+        return cls(entries)
+
+    def suggest(self, prefix, limit=10):
+        prefix = normalize_name(prefix)
+        if not prefix:
+            return []
+        if len(prefix) <= self.memo_prefix_length:
+            key = (prefix, limit)
+            if key not in self._memo:
+                self._memo[key] = self._suggest(prefix, limit)
+            return self._memo[key]
+        return self._suggest(prefix, limit)
+
+    def _suggest(self, prefix, limit):
+        start = bisect.bisect_left(self.keys, prefix)
+        # Every key starting with the prefix sorts below prefix + U+10FFFF.
+        end = bisect.bisect_left(self.keys, prefix + "\U0010ffff", lo=start)
+        best = {}
+        for rank, suggestion in self.entries[start:end]:
+            best[suggestion] = rank
+        return [
+            suggestion
+            for _, suggestion in heapq.nsmallest(
+                limit, ((rank, suggestion) for suggestion, rank in best.items())
+            )
+        ]
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_autocomplete_index() -> AutocompleteIndex:
+    """
+    Return the autocomplete index for the current game data version,
+    building it on first use after each version bump.
+    """
+    global _index
+    version = get_data_version()
+    with _index_lock:
+        if _index is None or _index[0] != version:
+            _index = (version, AutocompleteIndex.load())
+        return _index[1]
@@ -0,0 +1,234 @@
+"""
+Crafting tree resolution.
+
+Recipes and their ingredients form a DAG (ingredients can themselves be
+crafted). The whole graph is small, so it is loaded into memory once per
+game data version and trees are expanded from there instead of issuing a
+query per level.
+"""
+
+import math
+import threading
+from dataclasses import dataclass, replace
+
+from minty_db.models import CraftingIngredient, CraftingRecipe, Item
+from minty_db.versioning import get_data_version
+
+
+@dataclass(frozen=True)
+class Recipe:
+    id: int
+    uuid: str
+    result_item_id: int
+    result_quantity: int
+    meso_cost: int
+    # (item_id, quantity) per craft
+    ingredients: tuple[tuple[int, int], ...]
+
+
+class CraftingGraph:
+    """
+    In-memory adjacency structure over all active recipes.
+
+    When several recipes produce the same item, the cheapest (by meso cost,
+    then oldest) is used to expand it. Within one expansion, subtrees are
+    memoized per `(item, quantity)` unless a cycle is reachable from them,
+    since those depend on the path taken to reach them.
+    """
+
+    def __init__(self, items, recipes):
+        self.items = items
+        self.recipes = recipes
+        self.preferred = {}
+        for recipe in sorted(
+            recipes.values(), key=lambda recipe: (recipe.meso_cost, recipe.id)
+        ):
+            self.preferred.setdefault(recipe.result_item_id, recipe)
+        self.cyclic = self._find_cyclic()
+
+    @classmethod
+    def load(cls):
+        ingredients = {}
+        for recipe_id, item_id, quantity in CraftingIngredient.objects.values_list(
+            "recipe_id", "item_id", "quantity"
+        ):
+            ingredients.setdefault(recipe_id, []).append((item_id, quantity))
+
+        rows = CraftingRecipe.objects.values_list(
+            "id", "uuid", "result_item_id", "result_quantity", "meso_cost"
+        )
+        recipes = {
+            recipe_id: Recipe(
+                id=recipe_id,
+                uuid=recipe_uuid,
+                result_item_id=result_item_id,
+                result_quantity=max(quantity, 1),
+                meso_cost=meso_cost or 0,
+                ingredients=tuple(ingredients.get(recipe_id, ())),
+            )
+            for recipe_id, recipe_uuid, result_item_id, quantity, meso_cost in rows
+        }
+
+        item_ids = {recipe.result_item_id for recipe in recipes.values()}
+        item_ids.update(
+            item_id for pairs in ingredients.values() for item_id, _ in pairs
+        )
+        items = {
+            item_id: (item_uuid, name)
+            for item_id, item_uuid, name in Item.objects.filter(
+                pk__in=item_ids
+            ).values_list("id", "uuid", "name")
+        }
+
+        # Drop anything pointing at soft-deleted items.
+        recipes = {
+            recipe_id: replace(
+                recipe,
+                ingredients=tuple(
+                    (item_id, quantity)
+                    for item_id, quantity in recipe.ingredients
+                    if item_id in items
+                ),
+            )
+            for recipe_id, recipe in recipes.items()
+            if recipe.result_item_id in items
+        }
+        return cls(items, recipes)
+
+    def expand(self, recipe_id):
+        """
+        Expand one craft of a recipe into its full ingredient tree, or return
+        None if the recipe is not in the graph (e.g. its result item was
+        deleted).
+        """
+        recipe = self.recipes.get(recipe_id)
+        if recipe is None:
+            return None
+        node = self._expand_recipe(recipe, 1, frozenset(), {})
+        return node
+
+    def raw_materials(self, item_id, quantity=1):
+        """
+        Total base materials and meso cost needed to craft `quantity` of an
+        item, following the preferred recipe at every level. Items that
+        cannot be crafted are their own raw material.
+        """
+        node = self._expand_item(item_id, quantity, frozenset(), {})
+        totals = {}
+        self._collect_leaves(node, totals)
+        materials = [
+            {
+                "item": self.items[item_id][0],
+                "name": self.items[item_id][1],
+                "quantity": total,
+            }
+            for item_id, total in totals.items()
+        ]
+        materials.sort(key=lambda material: material["name"])
+        return {
+            "item": node["item"],
+            "name": node["name"],
+            "quantity": quantity,
+            "meso_cost": node["meso_cost"],
+            "materials": materials,
+        }
+
+    def _find_cyclic(self):
+        """
+        Items whose expansion can run into a cycle: everything that is not
+        (transitively) built only from uncraftable items.
+        """
+        pending = {}
+        dependents = {}
+        for item_id, recipe in self.preferred.items():
+            inputs = {ingredient for ingredient, _ in recipe.ingredients}
+            pending[item_id] = len(inputs)
+            for ingredient in inputs:
+                dependents.setdefault(ingredient, []).append(item_id)
+
+        resolved = [item_id for item_id in self.items if not pending.get(item_id)]
+        acyclic = set(resolved)
+        while resolved:
+            for dependent in dependents.get(resolved.pop(), ()):
+                pending[dependent] -= 1
+                if not pending[dependent]:
+                    acyclic.add(dependent)
+                    resolved.append(dependent)
+        return set(self.items) - acyclic
+
+    def _expand_item(self, item_id, quantity, path, memo):
+        recipe = self.preferred.get(item_id)
+        cycle = item_id in path
+        if recipe is None or cycle:
+            item_uuid, name = self.items[item_id]
+            node = {
+                "item": item_uuid,
+                "name": name,
+                "quantity": quantity,
+                "recipe": None,
+                "crafts": 0,
+                "meso_cost": 0,
+                "cycle": cycle,
+                "ingredients": [],
+                "_item_id": item_id,
+            }
+            return node
+
+        key = (item_id, quantity)
+        if key in memo:
+            return memo[key]
+
+        crafts = math.ceil(quantity / recipe.result_quantity)
+        node = self._expand_recipe(recipe, crafts, path, memo)
+        node["quantity"] = quantity
+        if item_id not in self.cyclic:
+            memo[key] = node
+        return node
+
+    def _expand_recipe(self, recipe, crafts, path, memo):
+        path = path | {recipe.result_item_id}
+        ingredients = []
+        meso_cost = recipe.meso_cost * crafts
+        for item_id, quantity in recipe.ingredients:
+            child = self._expand_item(item_id, quantity * crafts, path, memo)
+            ingredients.append(child)
+            meso_cost += child["meso_cost"]
+
+        item_uuid, name = self.items[recipe.result_item_id]
+        node = {
+            "item": item_uuid,
+            "name": name,
+            "quantity": recipe.result_quantity * crafts,
+            "recipe": recipe.uuid,
+            "crafts": crafts,
+            "meso_cost": meso_cost,
+            "cycle": False,
+            "ingredients": ingredients,
+            "_item_id": recipe.result_item_id,
+        }
+        return node
+
+    def _collect_leaves(self, node, totals):
+        if not node["ingredients"]:
+            item_id = node["_item_id"]
+            totals[item_id] = totals.get(item_id, 0) + node["quantity"]
+            return
+        for child in node["ingredients"]:
+            self._collect_leaves(child, totals)
+
+
+_graph = None
+_graph_lock = threading.Lock()
+
+
+def get_crafting_graph() -> CraftingGraph:
+    """
+    Return the crafting graph for the current game data version, loading
+    it on first use after each version bump.
+    """
+    global _graph
+    version = get_data_version()
+    with _graph_lock:
+        if _graph is None or _graph[0] != version:
+            _graph = (version, CraftingGraph.load())
+        return _graph[1]
@@ -0,0 +1,13 @@
+from minty_db.importers.base import ImportStats
+from minty_db.importers.entities import ENTITY_SPECS, EntityImporter, EntitySpec
+from minty_db.importers.relations import RELATION_SPECS, RelationImporter, RelationSpec
+
+__all__ = [
+    "ImportStats",
+    "ENTITY_SPECS",
+    "EntityImporter",
+    "EntitySpec",
+    "RELATION_SPECS",
+    "RelationImporter",
+    "RelationSpec",
+]
@@ -0,0 +1,58 @@
+import hashlib
+import json
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+
+@dataclass
+class ImportStats:
+    """Row counts reported for one model after an import stage."""
+
+    read: int = 0
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    deleted: int = 0
+    skipped: int = 0
+
+    def __str__(self):
+        return (
+            f"{self.read} read, {self.inserted} inserted, {self.updated} updated, "
+            f"{self.unchanged} unchanged, {self.deleted} deleted, "
+            f"{self.skipped} skipped"
+        )
+
+
+def read_ndjson(path: Path) -> Iterator[dict]:
+    """
+    Stream records from a newline-delimited JSON file, one dict per line.
+    Blank lines are skipped.
+    """
+    with path.open(encoding="utf-8") as handle:
+        for line_number, line in enumerate(handle, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as exc:
+                raise ValueError(f"{path.name}:{line_number}: {exc}") from exc
+
+
+def load_source_keys(model) -> dict[int, int]:
+    """
+    Map every `source_id` of a game data model to its primary key,
+    including soft-deleted rows so that they can be restored on upsert.
+    """
+    rows = model.all_objects.exclude(source_id=None)
+    return dict(rows.values_list("source_id", "pk"))
+
+
+def content_hash(record: dict) -> str:
+    """
+    Hash a dump record independently of key order, so that unchanged
+    records can be recognised on re-import.
+    """
+    payload = json.dumps(record, sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
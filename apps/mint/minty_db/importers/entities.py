@@ -0,0 +1,249 @@
+from dataclasses import dataclass, field
+from itertools import batched
+from pathlib import Path
+
+from common.models import BaseModel
+from minty_db.importers.base import (
+    ImportStats,
+    content_hash,
+    load_source_keys,
+    read_ndjson,
+)
+from minty_db.models import (
+    NPC,
+    Continent,
+    CraftingRecipe,
+    Item,
+    Job,
+    Map,
+    MapleClass,
+    Mob,
+    Quest,
+    Region,
+    Skill,
+)
+from minty_db.models.base import BaseGameDataModel
+
+
+@dataclass(frozen=True)
+class EntitySpec:
+    """
+    Describes how records of one game data model are read from a dump.
+
+    Records are keyed by `source_id`. Game data entities also read `name`
+    and `description`. `fields` are copied verbatim, while `foreign_keys`
+    hold the `source_id` of the related entity and are resolved to primary
+    keys in memory. `self_foreign_keys` point back at the same model and are
+    linked in a second pass, once every row exists.
+    """
+
+    model: type[BaseModel]
+    fields: tuple[str, ...] = ()
+    foreign_keys: dict[str, type[BaseModel]] = field(default_factory=dict)
+    self_foreign_keys: tuple[str, ...] = ()
+
+    @property
+    def filename(self) -> str:
+        return f"{self.model._meta.model_name}.ndjson"
+
+    @property
+    def named(self) -> bool:
+        return issubclass(self.model, BaseGameDataModel)
+
+    @property
+    def update_fields(self) -> list[str]:
+        return [
+            *(("name", "description") if self.named else ()),
+            *self.fields,
+            *self.foreign_keys,
+            "content_hash",
+            "updated_at",
+            "deleted_at",
+        ]
+
+
+# Ordered so that every entity is imported after the entities it references.
+ENTITY_SPECS = [
+    EntitySpec(MapleClass),
+    EntitySpec(Job, foreign_keys={"maple_class": MapleClass}),
+    EntitySpec(Skill, foreign_keys={"job": Job}),
+    EntitySpec(Continent),
+    EntitySpec(Region, foreign_keys={"continent": Continent}),
+    EntitySpec(Map, foreign_keys={"region": Region}),
+    EntitySpec(Item, fields=("slot", "category", "subcategory", "attributes")),
+    EntitySpec(Mob, fields=("hp", "mp", "exp", "mesos")),
+    EntitySpec(NPC),
+    EntitySpec(
+        CraftingRecipe,
+        fields=("result_quantity", "meso_cost"),
+        foreign_keys={"result_item": Item, "crafter_npc": NPC},
+    ),
+    EntitySpec(
+        Quest,
+        fields=(
+            "quest_line",
+            "meso_reward",
+            "exp_reward",
+            "required_level",
+            "misc_requirements",
+        ),
+        foreign_keys={
+            "started_by": NPC,
+            "required_class": MapleClass,
+            "required_job": Job,
+        },
+        self_foreign_keys=("prerequisite_quest",),
+    ),
+]
+
+
+class EntityImporter:
+    """
+    Upserts game data entities from NDJSON dumps in large batches.
+
+    Every record's content hash is compared with the one stored on its row,
+    and only new or changed records are written, each batch as a single
+    `INSERT ... ON CONFLICT (source_id) DO UPDATE`. Foreign keys are resolved
+    through `source_id -> pk` maps loaded once per related model rather than
+    looked up per row. Soft-deleted rows that reappear in a dump are
+    restored, and active rows missing from it are soft-deleted.
+
+    With `force`, every record is rewritten regardless of its hash.
+    """
+
+    def __init__(self, directory: Path, batch_size: int = 5000, force: bool = False):
+        self.directory = directory
+        self.batch_size = batch_size
+        self.force = force
+        self._keys: dict[type[BaseModel], dict[int, int]] = {}
+
+    def keys(self, model: type[BaseModel]) -> dict[int, int]:
+        if model not in self._keys:
+            self._keys[model] = load_source_keys(model)
+        return self._keys[model]
+
+    def import_entities(self, spec: EntitySpec) -> ImportStats | None:
+        """
+        Import one model's dump. Returns None if the dump has no file for
+        the model.
+        """
+        path = self.directory / spec.filename
+        if not path.exists():
+            return None
+
+        # source_id -> (content_hash, is_deleted) for every existing row.
+        rows = spec.model.all_objects.exclude(source_id=None)
+        existing = {
+            source_id: (row_hash, deleted_at is not None)
+            for source_id, row_hash, deleted_at in rows.values_list(
+                "source_id", "content_hash", "deleted_at"
+            )
+        }
+        seen: set[int] = set()
+        links: list[tuple[int, dict[str, int | None]]] = []
+        stats = ImportStats()
+
+        for records in batched(read_ndjson(path), self.batch_size):
+            objs = []
+            for record in records:
+                stats.read += 1
+                source_id = record.get("source_id")
+                # A second upsert of the same row in one statement fails on
+                # PostgreSQL, and across batches the last record would win.
+                if source_id is not None and source_id in seen:
+                    raise ValueError(
+                        f"{spec.filename}: duplicate source_id {source_id}"
+                    )
+                record_hash = content_hash(record)
+                current = existing.get(source_id)
+                if current is None:
+                    stats.inserted += 1
+                elif self.force or current != (record_hash, False):
+                    stats.updated += 1
+                else:
+                    stats.unchanged += 1
+                    seen.add(source_id)
+                    continue
+
+                objs.append(spec.model(**self.build(spec, record, record_hash)))
+                seen.add(source_id)
+                if spec.self_foreign_keys:
+                    references = {
+                        name: record.get(name) for name in spec.self_foreign_keys
+                    }
+                    links.append((record["source_id"], references))
+
+            if objs:
+                spec.model.all_objects.bulk_create(
+                    objs,
+                    update_conflicts=True,
+                    unique_fields=["source_id"],
+                    update_fields=spec.update_fields,
+                )
+
+        vanished = [
+            source_id
+            for source_id, (_, is_deleted) in existing.items()
+            if not is_deleted and source_id not in seen
+        ]
+        for chunk in batched(vanished, self.batch_size):
+            stats.deleted += spec.model.objects.filter(source_id__in=chunk).delete()
+
+        # New rows were just assigned primary keys.
+        self._keys.pop(spec.model, None)
+        if links:
+            self.link_self_references(spec, links)
+        return stats
+
+    def build(self, spec: EntitySpec, record: dict, record_hash: str) -> dict:
+        try:
+            values = {
+                "source_id": record["source_id"],
+                "content_hash": record_hash,
+                "deleted_at": None,
+            }
+            if spec.named:
+                values["name"] = record["name"]
+                values["description"] = record.get("description", "")
+        except KeyError as exc:
+            raise ValueError(
+                f"{spec.filename}: record is missing required key {exc}: {record!r}"
+            ) from None
+
+        for name in spec.fields:
+            if name in record:
+                values[name] = record[name]
+        for name, related_model in spec.foreign_keys.items():
+            values[f"{name}_id"] = self.resolve(spec, record, name, related_model)
+        return values
+
+    def resolve(self, spec, record, name, related_model) -> int | None:
+        source_id = record.get(name)
+        if source_id is None:
+            if spec.model._meta.get_field(name).null:
+                return None
+            raise ValueError(
+                f"{spec.filename}: {spec.model.__name__} {record['source_id']} "
+                f"is missing required `{name}`"
+            )
+        try:
+            return self.keys(related_model)[source_id]
+        except KeyError:
+            raise ValueError(
+                f"{spec.filename}: {spec.model.__name__} {record['source_id']} "
+                f"references unknown {related_model.__name__} {source_id} "
+                f"via `{name}`"
+            ) from None
+
+    def link_self_references(self, spec, links) -> None:
+        keys = self.keys(spec.model)
+        for chunk in batched(links, self.batch_size):
+            objs = []
+            for source_id, references in chunk:
+                obj = spec.model(pk=keys[source_id])
+                for name, reference in references.items():
+                    record = {"source_id": source_id, name: reference}
+                    value = self.resolve(spec, record, name, spec.model)
+                    setattr(obj, f"{name}_id", value)
+                objs.append(obj)
+            spec.model.all_objects.bulk_update(objs, list(spec.self_foreign_keys))
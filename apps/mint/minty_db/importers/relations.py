@@ -0,0 +1,283 @@
+import csv
+import io
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from itertools import batched
+from pathlib import Path
+
+from django.db import connection
+
+from common.models import BaseModel
+from minty_db.importers.base import ImportStats, read_ndjson
+from minty_db.models import (
+    NPC,
+    CraftingIngredient,
+    CraftingRecipe,
+    Item,
+    ItemDrop,
+    Map,
+    Mob,
+    MobSpawn,
+    NPCLocation,
+    NPCShopItem,
+    Quest,
+    QuestReward,
+)
+
+
+@dataclass(frozen=True)
+class RelationSpec:
+    """
+    Describes how rows of a relation (through) table are read from a dump.
+
+    `keys` are the foreign keys making up the table's unique pair; each
+    record holds the `source_id` of the related entity under the key's name.
+    `fields` are the remaining value columns, copied verbatim.
+    """
+
+    model: type[BaseModel]
+    keys: dict[str, type[BaseModel]]
+    fields: tuple[str, ...] = field(default=())
+
+    @property
+    def filename(self) -> str:
+        return f"{self.model._meta.model_name}.ndjson"
+
+    @property
+    def columns(self) -> list[str]:
+        return [*self.keys, *self.fields]
+
+
+RELATION_SPECS = [
+    RelationSpec(ItemDrop, keys={"item": Item, "mob": Mob}, fields=("drop_rate",)),
+    RelationSpec(MobSpawn, keys={"mob": Mob, "map": Map}),
+    RelationSpec(NPCLocation, keys={"npc": NPC, "map": Map}),
+    RelationSpec(NPCShopItem, keys={"npc": NPC, "item": Item}, fields=("price",)),
+    RelationSpec(
+        QuestReward,
+        keys={"quest": Quest, "item": Item},
+        fields=("quantity", "reward_group"),
+    ),
+    RelationSpec(
+        CraftingIngredient,
+        keys={"recipe": CraftingRecipe, "item": Item},
+        fields=("quantity",),
+    ),
+]
+
+
+class RelationImporter:
+    """
+    Loads relation tables with set-based SQL on PostgreSQL.
+
+    Each dump is streamed into a temporary staging table with COPY, its
+    source_ids are resolved to primary keys with joins, and the result is
+    merged into the target with `INSERT ... ON CONFLICT` on the table's
+    unique pair, which is only unique among active rows. Pairs that only
+    have a soft-deleted row are restored first, so that they keep their row
+    (and uuid). Active rows absent from the dump are soft-deleted. Rows whose
+    values did not change are left untouched.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self.qn = connection.ops.quote_name
+
+    def import_relations(self, spec: RelationSpec) -> ImportStats | None:
+        """
+        Import one relation table's dump. Returns None if the dump has no
+        file for the table. Must run inside a transaction.
+        """
+        path = self.directory / spec.filename
+        if not path.exists():
+            return None
+        if connection.vendor != "postgresql":
+            raise ValueError("Importing relation tables requires PostgreSQL.")
+
+        stage = f"import_{spec.model._meta.model_name}"
+        resolved = f"{stage}_resolved"
+        stats = ImportStats()
+        with connection.cursor() as cursor:
+            self.create_stage(cursor, spec, stage)
+            cursor.copy_expert(
+                f"COPY {self.qn(stage)} FROM STDIN WITH (FORMAT csv)",
+                _CSVStream(self.rows(spec, read_ndjson(path))),
+            )
+            cursor.execute(f"SELECT count(*) FROM {self.qn(stage)}")
+            stats.read = cursor.fetchone()[0]
+
+            self.resolve(cursor, spec, stage, resolved)
+            cursor.execute(f"SELECT count(*) FROM {self.qn(resolved)}")
+            merged = cursor.fetchone()[0]
+            stats.skipped = stats.read - merged
+
+            restored = self.restore(cursor, spec, resolved)
+            stats.inserted, stats.updated = self.merge(cursor, spec, resolved)
+            stats.updated += restored
+            stats.unchanged = merged - stats.inserted - stats.updated
+            stats.deleted = self.soft_delete_absent(cursor, spec, resolved)
+        return stats
+
+    def rows(self, spec: RelationSpec, records: Iterable[dict]) -> Iterator[list]:
+        defaults = {
+            name: spec.model._meta.get_field(name).get_default() for name in spec.fields
+        }
+        for record in records:
+            try:
+                yield [record[name] for name in spec.keys] + [
+                    record.get(name, defaults[name]) for name in spec.fields
+                ]
+            except KeyError as exc:
+                raise ValueError(
+                    f"{spec.filename}: record is missing key {exc}: {record!r}"
+                ) from None
+
+    def create_stage(self, cursor, spec: RelationSpec, stage: str) -> None:
+        definitions = [f"{self.qn(name)} integer NOT NULL" for name in spec.keys]
+        for name in spec.fields:
+            db_type = spec.model._meta.get_field(name).db_type(connection)
+            definitions.append(f"{self.qn(name)} {db_type}")
+        cursor.execute(
+            f"CREATE TEMPORARY TABLE {self.qn(stage)} ({', '.join(definitions)}) "
+            "ON COMMIT DROP"
+        )
+
+    def key_source(self, model: type[BaseModel]) -> str:
+        """
+        SQL yielding `(source_id, id)` pairs used to resolve a key column.
+        """
+        return f"SELECT source_id, id FROM {self.qn(model._meta.db_table)}"
+
+    def key_columns(self, spec: RelationSpec) -> list[str]:
+        return [self.qn(spec.model._meta.get_field(name).column) for name in spec.keys]
+
+    def value_columns(self, spec: RelationSpec) -> list[str]:
+        return [
+            self.qn(spec.model._meta.get_field(name).column) for name in spec.fields
+        ]
+
+    def resolve(self, cursor, spec: RelationSpec, stage: str, resolved: str) -> None:
+        key_columns = self.key_columns(spec)
+        selects, joins = [], []
+        for index, (name, model) in enumerate(spec.keys.items()):
+            alias = f"k{index}"
+            selects.append(f"{alias}.id AS {key_columns[index]}")
+            joins.append(
+                f"JOIN ({self.key_source(model)}) {alias} "
+                f"ON {alias}.source_id = s.{self.qn(name)}"
+            )
+        for name, column in zip(spec.fields, self.value_columns(spec)):
+            selects.append(f"s.{self.qn(name)} AS {column}")
+
+        # Duplicate pairs in a dump would make ON CONFLICT touch a row twice.
+        cursor.execute(
+            f"CREATE TEMPORARY TABLE {self.qn(resolved)} ON COMMIT DROP AS "
+            f"SELECT DISTINCT ON ({', '.join(key_columns)}) {', '.join(selects)} "
+            f"FROM {self.qn(stage)} s {' '.join(joins)} "
+            f"ORDER BY {', '.join(key_columns)}"
+        )
+        cursor.execute(f"ANALYZE {self.qn(resolved)}")
+
+    def restore(self, cursor, spec: RelationSpec, resolved: str) -> int:
+        """
+        Restore the most recently deleted row of each pair in the dump that
+        has no active row, with the dump's values.
+        """
+        table = self.qn(spec.model._meta.db_table)
+        pk = self.qn(spec.model._meta.pk.column)
+        key_columns = ", ".join(self.key_columns(spec))
+        assignments = [f"{column} = r.{column}" for column in self.value_columns(spec)]
+        assignments += ["updated_at = now()", "deleted_at = NULL"]
+
+        def matches(alias):
+            return " AND ".join(
+                f"{alias}.{column} = r.{column}" for column in self.key_columns(spec)
+            )
+
+        cursor.execute(
+            f"UPDATE {table} t SET {', '.join(assignments)} "
+            f"FROM {self.qn(resolved)} r "
+            f"WHERE {matches('t')} AND t.{pk} IN ("
+            f"SELECT DISTINCT ON ({key_columns}) {pk} FROM {table} "
+            f"WHERE deleted_at IS NOT NULL "
+            f"ORDER BY {key_columns}, deleted_at DESC, {pk} DESC"
+            f") AND NOT EXISTS ("
+            f"SELECT 1 FROM {table} a WHERE a.deleted_at IS NULL AND {matches('a')})"
+        )
+        return cursor.rowcount
+
+    def merge(self, cursor, spec: RelationSpec, resolved: str) -> tuple[int, int]:
+        table = self.qn(spec.model._meta.db_table)
+        columns = self.key_columns(spec) + self.value_columns(spec)
+        if spec.fields:
+            changed = [
+                f"t.{column} IS DISTINCT FROM EXCLUDED.{column}"
+                for column in self.value_columns(spec)
+            ]
+            assignments = [
+                f"{column} = EXCLUDED.{column}" for column in self.value_columns(spec)
+            ]
+            assignments.append("updated_at = EXCLUDED.updated_at")
+            action = f"UPDATE SET {', '.join(assignments)} WHERE {' OR '.join(changed)}"
+        else:
+            action = "NOTHING"
+
+        # The predicate picks the partial unique index on active rows.
+        cursor.execute(
+            f"WITH merged AS ("
+            f"INSERT INTO {table} AS t "
+            f"(uuid, created_at, updated_at, deleted_at, {', '.join(columns)}) "
+            f"SELECT gen_random_uuid(), now(), now(), NULL, {', '.join(columns)} "
+            f"FROM {self.qn(resolved)} "
+            f"ON CONFLICT ({', '.join(self.key_columns(spec))}) "
+            f"WHERE deleted_at IS NULL DO {action} "
+            f"RETURNING (xmax = 0) AS inserted"
+            f") SELECT count(*) FILTER (WHERE inserted), "
+            f"count(*) FILTER (WHERE NOT inserted) FROM merged"
+        )
+        return cursor.fetchone()
+
+    def soft_delete_absent(self, cursor, spec: RelationSpec, resolved: str) -> int:
+        table = self.qn(spec.model._meta.db_table)
+        matches = " AND ".join(
+            f"r.{column} = t.{column}" for column in self.key_columns(spec)
+        )
+        cursor.execute(
+            f"UPDATE {table} t SET deleted_at = now(), updated_at = now() "
+            f"WHERE t.deleted_at IS NULL AND NOT EXISTS "
+            f"(SELECT 1 FROM {self.qn(resolved)} r WHERE {matches})"
+        )
+        return cursor.rowcount
+
+
+class _CSVStream(io.RawIOBase):
+    """
+    A read-only file object encoding rows as CSV on demand, so that COPY
+    can consume a dump without it ever being held in memory.
+    """
+
+    def __init__(self, rows: Iterator[list], chunk_size: int = 10000):
+        self._chunks = self._encode(rows, chunk_size)
+        self._chunk = b""
+        self._offset = 0
+
+    @staticmethod
+    def _encode(rows, chunk_size):
+        for chunk in batched(rows, chunk_size):
+            text = io.StringIO()
+            csv.writer(text).writerows(chunk)
+            yield text.getvalue().encode("utf-8")
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while self._offset >= len(self._chunk):
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return 0
+            self._chunk, self._offset = chunk, 0
+        size = min(len(buffer), len(self._chunk) - self._offset)
+        buffer[:size] = self._chunk[self._offset : self._offset + size]
+        self._offset += size
+        return size
@@ -0,0 +1,73 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from minty_db.importers import (
+    ENTITY_SPECS,
+    RELATION_SPECS,
+    EntityImporter,
+    RelationImporter,
+)
+from minty_db.models.derived import refresh_derived_tables
+from minty_db.versioning import bump_data_version
+
+
+class Command(BaseCommand):
+    help = (
+        "Import game data from a directory of NDJSON dumps, one file per model "
+        "(e.g. item.ndjson). Entities are upserted by source_id, skipping "
+        "records whose content hash is unchanged, and relation tables (e.g. "
+        "itemdrop.ndjson) are merged on their unique pairs. Rows missing from "
+        "a dump file are soft-deleted."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("directory", type=Path, help="Directory holding the dump.")
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Number of rows upserted per statement (default: 5000).",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Rewrite every entity, even if its content hash is unchanged.",
+        )
+
+    def handle(self, *args, **options):
+        directory = options["directory"]
+        if not directory.is_dir():
+            raise CommandError(f"{directory} is not a directory.")
+
+        importer = EntityImporter(
+            directory, batch_size=options["batch_size"], force=options["force"]
+        )
+        relation_importer = RelationImporter(directory)
+        try:
+            with transaction.atomic():
+                for spec in ENTITY_SPECS:
+                    stats = importer.import_entities(spec)
+                    name = spec.model.__name__
+                    if stats is None:
+                        self.stdout.write(f"{name}: skipped, no {spec.filename}")
+                    else:
+                        self.stdout.write(f"{name}: {stats}")
+
+                for spec in RELATION_SPECS:
+                    stats = relation_importer.import_relations(spec)
+                    name = spec.model.__name__
+                    if stats is None:
+                        self.stdout.write(f"{name}: skipped, no {spec.filename}")
+                    else:
+                        self.stdout.write(f"{name}: {stats}")
+
+                refresh_derived_tables()
+                self.stdout.write("Rebuilt the farming and search indexes")
+        except ValueError as exc:
+            raise CommandError(str(exc)) from exc
+
+        # Invalidates everything derived in memory from the previous data.
+        bump_data_version()
+        self.stdout.write(self.style.SUCCESS("Game data import complete."))
@@ -0,0 +1,83 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("minty_db", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="continent",
+            name="content_hash",
+            field=models.CharField(
+                blank=True, default="", editable=False, max_length=32
+            ),
+        ),
+        migrations.AddField(
+            model_name="item",
+            name="content_hash",
+            field=models.CharField(
+                blank=True, default="", editable=False, max_length=32
+            ),
+        ),
+        migrations.AddField(
+            model_name="job",
+            name="content_hash",
+            field=models.CharField(
+                blank=True, default="", editable=False, max_length=32
+            ),
+        ),
+        migrations.AddField(
+            model_name="map",
+            name="content_hash",
+            field=models.CharField(
+                blank=True, default="", editable=False, max_length=32
+            ),
+        ),
+        migrations.AddField(
+            model_name="mapleclass",
+            name="content_hash",
+            field=models.CharField(
+                blank=True, default="", editable=False, max_length=32
+            ),
+        ),
+        migrations.AddField(
+            model_name="mob",
+            name="content_hash",
+            field=models.CharField(
+                blank=True, default="", editable=False, max_length=32
+            ),
+        ),
+        migrations.AddField(
+            model_name="npc",
+            name="content_hash",
+            field=models.CharField(
+                blank=True, default="", editable=False, max_length=32
+            ),
+        ),
+        migrations.AddField(
+            model_name="quest",
+            name="content_hash",
+            field=models.CharField(
+                blank=True, default="", editable=False, max_length=32
+            ),
+        ),
+        migrations.AddField(
+            model_name="region",
+            name="content_hash",
+            field=models.CharField(
+                blank=True, default="", editable=False, max_length=32
+            ),
+        ),
+        migrations.AddField(
+            model_name="skill",
+            name="content_hash",
+            field=models.CharField(
+                blank=True, default="", editable=False, max_length=32
+            ),
+        ),
+    ]
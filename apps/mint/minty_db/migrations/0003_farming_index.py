@@ -0,0 +1,97 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:50
+
+from django.db import migrations, models
+
+CREATE_FARMING_INDEX = """
+CREATE MATERIALIZED VIEW minty_db_farmingspot AS
+WITH spawns AS (
+    SELECT
+        s.mob_id,
+        jsonb_agg(
+            jsonb_build_object(
+                'id', mp.uuid,
+                'name', mp.name,
+                'region', jsonb_build_object('id', r.uuid, 'name', r.name),
+                'continent', jsonb_build_object('id', c.uuid, 'name', c.name)
+            )
+            ORDER BY mp.name
+        ) AS maps
+    FROM minty_db_mobspawn s
+    JOIN minty_db_map mp ON mp.id = s.map_id AND mp.deleted_at IS NULL
+    JOIN minty_db_region r ON r.id = mp.region_id AND r.deleted_at IS NULL
+    JOIN minty_db_continent c ON c.id = r.continent_id AND c.deleted_at IS NULL
+    WHERE s.deleted_at IS NULL
+    GROUP BY s.mob_id
+)
+SELECT
+    d.id,
+    d.item_id,
+    d.mob_id,
+    i.uuid AS item_uuid,
+    m.uuid AS mob_uuid,
+    m.name AS mob_name,
+    d.drop_rate,
+    m.hp,
+    m.exp,
+    m.mesos,
+    COALESCE(spawns.maps, '[]'::jsonb) AS maps
+FROM minty_db_itemdrop d
+JOIN minty_db_item i ON i.id = d.item_id AND i.deleted_at IS NULL
+JOIN minty_db_mob m ON m.id = d.mob_id AND m.deleted_at IS NULL
+LEFT JOIN spawns ON spawns.mob_id = d.mob_id
+WHERE d.deleted_at IS NULL;
+
+CREATE UNIQUE INDEX minty_db_farmingspot_id ON minty_db_farmingspot (id);
+CREATE INDEX minty_db_farmingspot_item_rank
+    ON minty_db_farmingspot (item_uuid, drop_rate DESC, hp, id);
+"""
+
+DROP_FARMING_INDEX = "DROP MATERIALIZED VIEW IF EXISTS minty_db_farmingspot;"
+
+
+def create_farming_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(CREATE_FARMING_INDEX)
+
+
+def drop_farming_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(DROP_FARMING_INDEX)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("minty_db", "0002_content_hash"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FarmingSpot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("item_uuid", models.UUIDField()),
+                ("mob_uuid", models.UUIDField()),
+                ("mob_name", models.CharField(max_length=200)),
+                ("drop_rate", models.FloatField()),
+                ("hp", models.IntegerField()),
+                ("exp", models.IntegerField()),
+                ("mesos", models.IntegerField()),
+                ("maps", models.JSONField()),
+            ],
+            options={
+                "db_table": "minty_db_farmingspot",
+                "ordering": ["-drop_rate", "hp", "id"],
+                "managed": False,
+            },
+        ),
+        migrations.RunPython(create_farming_index, drop_farming_index),
+    ]
@@ -0,0 +1,259 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:57
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+import django.db.models.functions.text
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+SEARCH_INDEX_NAMES = [
+    "minty_db_continent_name_trgm",
+    "minty_db_continent_search",
+    "minty_db_item_name_trgm",
+    "minty_db_item_search",
+    "minty_db_job_name_trgm",
+    "minty_db_job_search",
+    "minty_db_map_name_trgm",
+    "minty_db_map_search",
+    "minty_db_mapleclass_name_trgm",
+    "minty_db_mapleclass_search",
+    "minty_db_mob_name_trgm",
+    "minty_db_mob_search",
+    "minty_db_npc_name_trgm",
+    "minty_db_npc_search",
+    "minty_db_quest_name_trgm",
+    "minty_db_quest_search",
+    "minty_db_region_name_trgm",
+    "minty_db_region_search",
+    "minty_db_skill_name_trgm",
+    "minty_db_skill_search",
+]
+
+
+# The indexes are only added to the migration state above; they are created
+# here so that other databases can still run the migrations.
+def search_indexes(apps):
+    for model in apps.get_app_config("minty_db").get_models():
+        for index in model._meta.indexes:
+            if index.name in SEARCH_INDEX_NAMES:
+                yield model, index
+
+
+def create_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for model, index in search_indexes(apps):
+        schema_editor.add_index(model, index)
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for model, index in search_indexes(apps):
+        schema_editor.remove_index(model, index)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("minty_db", "0003_farming_index"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddIndex(
+                    model_name="continent",
+                    index=django.contrib.postgres.indexes.GinIndex(
+                        django.contrib.postgres.indexes.OpClass(
+                            django.db.models.functions.text.Upper("name"),
+                            name="gin_trgm_ops",
+                        ),
+                        name="minty_db_continent_name_trgm",
+                    ),
+                ),
+                migrations.AddIndex(
+                    model_name="continent",
+                    index=django.contrib.postgres.indexes.GinIndex(
+                        django.contrib.postgres.search.SearchVector(
+                            "name", "description", config="english"
+                        ),
+                        name="minty_db_continent_search",
+                    ),
+                ),
+                migrations.AddIndex(
+                    model_name="item",
+                    index=django.contrib.postgres.indexes.GinIndex(
+                        django.contrib.postgres.indexes.OpClass(
+                            django.db.models.functions.text.Upper("name"),
+                            name="gin_trgm_ops",
+                        ),
+                        name="minty_db_item_name_trgm",
+                    ),
+                ),
+                migrations.AddIndex(
+                    model_name="item",
+                    index=django.contrib.postgres.indexes.GinIndex(
+                        django.contrib.postgres.search.SearchVector(
+                            "name", "description", config="english"
+                        ),
+                        name="minty_db_item_search",
+                    ),
+                ),
+                migrations.AddIndex(
+                    model_name="job",
+                    index=django.contrib.postgres.indexes.GinIndex(
+                        django.contrib.postgres.indexes.OpClass(
+                            django.db.models.functions.text.Upper("name"),
+                            name="gin_trgm_ops",
+                        ),
+                        name="minty_db_job_name_trgm",
+                    ),
+                ),
+                migrations.AddIndex(
+                    model_name="job",
+                    index=django.contrib.postgres.indexes.GinIndex(
+                        django.contrib.postgres.search.SearchVector(
+                            "name", "description", config="english"
+                        ),
+                        name="minty_db_job_search",
+                    ),
+                ),
+                migrations.AddIndex(
+                    model_name="map",
+                    index=django.contrib.postgres.indexes.GinIndex(
+                        django.contrib.postgres.indexes.OpClass(
+                            django.db.models.functions.text.Upper("name"),
+                            name="gin_trgm_ops",
+                        ),
+                        name="minty_db_map_name_trgm",
+                    ),
+                ),
+                migrations.AddIndex(
+                    model_name="map",
+                    index=django.contrib.postgres.indexes.GinIndex(
+                        django.contrib.postgres.search.SearchVector(
+                            "name", "description", config="english"
+                        ),
+                        name="minty_db_map_search",
+                    ),
+                ),
+                migrations.AddIndex(
+                    model_name="mapleclass",
+                    index=django.contrib.postgres.indexes.GinIndex(
+                        django.contrib.postgres.indexes.OpClass(
+                            django.db.models.functions.text.Upper("name"),
+                            name="gin_trgm_ops",
+                        ),
+                        name="minty_db_mapleclass_name_trgm",
+                    ),
+                ),
+                migrations.AddIndex(
+                    model_name="mapleclass",
+                    index=django.contrib.postgres.indexes.GinIndex(
+                        django.contrib.postgres.search.SearchVector(
+                            "name", "description", config="english"
+                        ),
+                        name="minty_db_mapleclass_search",
+                    ),
+                ),
+                migrations.AddIndex(
+                    model_name="mob",
+                    index=django.contrib.postgres.indexes.GinIndex(
+                        django.contrib.postgres.indexes.OpClass(
+                            django.db.models.functions.text.Upper("name"),
+                            name="gin_trgm_ops",
+                        ),
+                        name="minty_db_mob_name_trgm",
+                    ),
+                ),
+                migrations.AddIndex(
+                    model_name="mob",
+                    index=django.contrib.postgres.indexes.GinIndex(
+                        django.contrib.postgres.search.SearchVector(
+                            "name", "description", config="english"
+                        ),
+                        name="minty_db_mob_search",
+                    ),
+                ),
+                migrations.AddIndex(
+                    model_name="npc",
+                    index=django.contrib.postgres.indexes.GinIndex(
+                        django.contrib.postgres.indexes.OpClass(
+                            django.db.models.functions.text.Upper("name"),
+                            name="gin_trgm_ops",
+                        ),
+                        name="minty_db_npc_name_trgm",
+                    ),
+                ),
+                migrations.AddIndex(
+                    model_name="npc",
+                    index=django.contrib.postgres.indexes.GinIndex(
+                        django.contrib.postgres.search.SearchVector(
+                            "name", "description", config="english"
+                        ),
+                        name="minty_db_npc_search",
+                    ),
+                ),
+                migrations.AddIndex(
+                    model_name="quest",
+                    index=django.contrib.postgres.indexes.GinIndex(
+                        django.contrib.postgres.indexes.OpClass(
+                            django.db.models.functions.text.Upper("name"),
+                            name="gin_trgm_ops",
+                        ),
+                        name="minty_db_quest_name_trgm",
+                    ),
+                ),
+                migrations.AddIndex(
+                    model_name="quest",
+                    index=django.contrib.postgres.indexes.GinIndex(
+                        django.contrib.postgres.search.SearchVector(
+                            "name", "description", config="english"
+                        ),
+                        name="minty_db_quest_search",
+                    ),
+                ),
+                migrations.AddIndex(
+                    model_name="region",
+                    index=django.contrib.postgres.indexes.GinIndex(
+                        django.contrib.postgres.indexes.OpClass(
+                            django.db.models.functions.text.Upper("name"),
+                            name="gin_trgm_ops",
+                        ),
+                        name="minty_db_region_name_trgm",
+                    ),
+                ),
+                migrations.AddIndex(
+                    model_name="region",
+                    index=django.contrib.postgres.indexes.GinIndex(
+                        django.contrib.postgres.search.SearchVector(
+                            "name", "description", config="english"
+                        ),
+                        name="minty_db_region_search",
+                    ),
+                ),
+                migrations.AddIndex(
+                    model_name="skill",
+                    index=django.contrib.postgres.indexes.GinIndex(
+                        django.contrib.postgres.indexes.OpClass(
+                            django.db.models.functions.text.Upper("name"),
+                            name="gin_trgm_ops",
+                        ),
+                        name="minty_db_skill_name_trgm",
+                    ),
+                ),
+                migrations.AddIndex(
+                    model_name="skill",
+                    index=django.contrib.postgres.indexes.GinIndex(
+                        django.contrib.postgres.search.SearchVector(
+                            "name", "description", config="english"
+                        ),
+                        name="minty_db_skill_search",
+                    ),
+                ),
+            ],
+        ),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
@@ -0,0 +1,89 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:58
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+# The trigram index is only added to the migration state above; it is
+# created here so that other databases can still run the migrations.
+def create_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        model = apps.get_model("minty_db", "SearchEntry")
+        schema_editor.add_index(model, model._meta.indexes[0])
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        model = apps.get_model("minty_db", "SearchEntry")
+        schema_editor.remove_index(model, model._meta.indexes[0])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("minty_db", "0004_search_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SearchEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "entity_type",
+                    models.CharField(
+                        choices=[
+                            ("item", "item"),
+                            ("mob", "mob"),
+                            ("npc", "npc"),
+                            ("map", "map"),
+                            ("quest", "quest"),
+                            ("skill", "skill"),
+                            ("job", "job"),
+                            ("class", "class"),
+                            ("region", "region"),
+                            ("continent", "continent"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("entity_uuid", models.UUIDField()),
+                ("source_id", models.IntegerField(null=True)),
+                ("name", models.CharField(max_length=200)),
+                ("normalized_name", models.CharField(max_length=200)),
+                ("weight", models.IntegerField()),
+            ],
+            options={
+                "ordering": ["entity_type", "name"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="searchentry",
+            constraint=models.UniqueConstraint(
+                fields=("entity_type", "entity_uuid"),
+                name="minty_db_searchentry_entity",
+            ),
+        ),
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddIndex(
+                    model_name="searchentry",
+                    index=django.contrib.postgres.indexes.GinIndex(
+                        django.contrib.postgres.indexes.OpClass(
+                            "normalized_name", name="gin_trgm_ops"
+                        ),
+                        name="minty_db_searchentry_trgm",
+                    ),
+                ),
+            ],
+        ),
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
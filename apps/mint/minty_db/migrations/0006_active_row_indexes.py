@@ -0,0 +1,313 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("minty_db", "0005_search_entries"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="continent",
+            name="minty_db_co_name_ab3a01_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="craftingrecipe",
+            name="minty_db_cr_result__bd9813_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="craftingrecipe",
+            name="minty_db_cr_meso_co_b476ac_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="item",
+            name="minty_db_it_name_4f260c_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="item",
+            name="minty_db_it_slot_129f4a_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="itemdrop",
+            name="minty_db_it_drop_ra_da1cd7_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="job",
+            name="minty_db_jo_name_c2d837_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="map",
+            name="minty_db_ma_name_2917c5_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="mapleclass",
+            name="minty_db_ma_name_5367a0_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="mob",
+            name="minty_db_mo_name_c433b0_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="mob",
+            name="minty_db_mo_hp_8a88a4_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="mob",
+            name="minty_db_mo_exp_33020c_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="npc",
+            name="minty_db_np_name_32b2f3_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="npcshopitem",
+            name="game_npc_sh_price_261119_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="quest",
+            name="minty_db_qu_name_215f00_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="quest",
+            name="minty_db_qu_quest_l_736758_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="quest",
+            name="minty_db_qu_require_5e693f_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="region",
+            name="minty_db_re_name_32bfd9_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="skill",
+            name="minty_db_sk_name_263e0d_idx",
+        ),
+        migrations.AlterUniqueTogether(
+            name="craftingingredient",
+            unique_together=set(),
+        ),
+        migrations.AlterUniqueTogether(
+            name="itemdrop",
+            unique_together=set(),
+        ),
+        migrations.AlterUniqueTogether(
+            name="mobspawn",
+            unique_together=set(),
+        ),
+        migrations.AlterUniqueTogether(
+            name="npclocation",
+            unique_together=set(),
+        ),
+        migrations.AlterUniqueTogether(
+            name="npcshopitem",
+            unique_together=set(),
+        ),
+        migrations.AlterUniqueTogether(
+            name="questreward",
+            unique_together=set(),
+        ),
+        migrations.AddIndex(
+            model_name="continent",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["name"],
+                name="continent_name_active",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="craftingrecipe",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["result_item", "crafter_npc"],
+                name="recipe_result_npc_active",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="craftingrecipe",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["meso_cost"],
+                name="recipe_meso_cost_active",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="item",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["name"],
+                name="item_name_active",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="item",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["slot", "category"],
+                name="item_slot_category_active",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="itemdrop",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["drop_rate"],
+                name="itemdrop_drop_rate_active",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="job",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["name"],
+                name="job_name_active",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="map",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["name"],
+                name="map_name_active",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="mapleclass",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["name"],
+                name="mapleclass_name_active",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="mob",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["name"],
+                name="mob_name_active",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="mob",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["hp"],
+                name="mob_hp_active",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="mob",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["exp"],
+                name="mob_exp_active",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="npc",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["name"],
+                name="npc_name_active",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="npcshopitem",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["price"],
+                name="npcshopitem_price_active",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="quest",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["name"],
+                name="quest_name_active",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="quest",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["quest_line"],
+                name="quest_quest_line_active",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="quest",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["required_level"],
+                name="quest_required_level_active",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="region",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["name"],
+                name="region_name_active",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="skill",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["name"],
+                name="skill_name_active",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="craftingingredient",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=("recipe", "item"),
+                name="craftingingredient_recipe_item_active_unique",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="itemdrop",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=("item", "mob"),
+                name="itemdrop_item_mob_active_unique",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="mobspawn",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=("mob", "map"),
+                name="mobspawn_mob_map_active_unique",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="npclocation",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=("npc", "map"),
+                name="npclocation_npc_map_active_unique",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="npcshopitem",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=("npc", "item"),
+                name="npcshopitem_npc_item_active_unique",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="questreward",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=("quest", "item"),
+                name="questreward_quest_item_active_unique",
+            ),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("minty_db", "0006_active_row_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="craftingrecipe",
+            name="content_hash",
+            field=models.CharField(
+                blank=True, default="", editable=False, max_length=32
+            ),
+        ),
+        migrations.AddField(
+            model_name="craftingrecipe",
+            name="source_id",
+            field=models.IntegerField(blank=True, default=None, null=True, unique=True),
+        ),
+    ]
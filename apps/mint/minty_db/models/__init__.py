@@ -4,6 +4,9 @@ from minty_db.models.characters import Job, MapleClass, Skill
 # Crafting
 from minty_db.models.crafting import CraftingIngredient, CraftingRecipe
 
+# Derived
+from minty_db.models.derived import FarmingSpot, SearchEntry
+
 # Items
 from minty_db.models.items import Item, ItemDrop
 
@@ -27,6 +30,9 @@ __all__ = [
     # Crafting
     "CraftingRecipe",
     "CraftingIngredient",
+    # Derived
+    "FarmingSpot",
+    "SearchEntry",
     # Items
     "Item",
     "ItemDrop",
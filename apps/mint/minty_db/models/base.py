@@ -1,13 +1,67 @@
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+    TrigramSimilarity,
+)
+from django.db import connections, models
+from django.db.models import Q
+from django.db.models.functions import Upper
 
-from common.models import BaseModel
+from common.models import BaseModel, SoftDeleteQuerySet
+
+SEARCH_VECTOR = SearchVector("name", "description", config="english")
+
+# Added to the Meta.indexes of every game data model. The trigram index on
+# UPPER(name) serves both `icontains`-style substring matches and trigram
+# similarity; the full-text index must use the exact SEARCH_VECTOR expression
+# that GameDataQuerySet.search() filters on.
+SEARCH_INDEXES = [
+    GinIndex(
+        OpClass(Upper("name"), name="gin_trgm_ops"),
+        name="%(app_label)s_%(class)s_name_trgm",
+    ),
+    GinIndex(SEARCH_VECTOR, name="%(app_label)s_%(class)s_search"),
+]
+
+
+class GameDataQuerySet(SoftDeleteQuerySet):
+    def search(self, term):
+        """
+        Filter to entities whose name contains or resembles `term`, or whose
+        name and description match it as full text, best match first.
+
+        The relevance is annotated as `search_rank`. Off PostgreSQL this
+        falls back to an unranked substring match on name.
+        """
+        if connections[self.db].vendor != "postgresql":
+            return self.filter(name__icontains=term)
+
+        upper_term = term.upper()
+        query = SearchQuery(term, config="english", search_type="websearch")
+        return (
+            self.alias(upper_name=Upper("name"), search_vector=SEARCH_VECTOR)
+            .filter(
+                Q(upper_name__contains=upper_term)
+                | Q(upper_name__trigram_similar=upper_term)
+                | Q(search_vector=query)
+            )
+            .annotate(
+                search_rank=TrigramSimilarity(Upper("name"), upper_term)
+                + SearchRank(SEARCH_VECTOR, query)
+            )
+            .order_by("-search_rank", "pk")
+        )
 
 
 class BaseGameDataModel(BaseModel):
     """
     Base model for all entities scraped from game data.
     Primary addition is `source_id`, which is the ID of the
-    entity as represented in game files.
+    entity as represented in game files. `content_hash` fingerprints
+    the record last imported for the entity, so that unchanged
+    records can be skipped on re-import.
     """
 
     source_id = models.IntegerField(
@@ -15,6 +69,9 @@ class BaseGameDataModel(BaseModel):
     )
     name = models.CharField(max_length=200)
     description = models.TextField(blank=True, default="")
+    content_hash = models.CharField(
+        max_length=32, blank=True, default="", editable=False
+    )
 
     class Meta:
         abstract = True
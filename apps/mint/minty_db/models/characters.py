@@ -1,10 +1,10 @@
 from django.db import models
 
-from common.models import SoftDeleteManager, SoftDeleteQuerySet
-from minty_db.models.base import BaseGameDataModel
+from common.models import SoftDeleteManager, active_index
+from minty_db.models.base import SEARCH_INDEXES, BaseGameDataModel, GameDataQuerySet
 
 
-class MapleClassQuerySet(SoftDeleteQuerySet):
+class MapleClassQuerySet(GameDataQuerySet):
     def with_jobs(self):
         return self.prefetch_related("jobs")
 
@@ -22,14 +22,15 @@ class MapleClass(BaseGameDataModel):
     class Meta:
         ordering = ["name"]
         indexes = [
-            models.Index(fields=["name"]),
+            *SEARCH_INDEXES,
+            active_index("name", name="mapleclass_name_active"),
         ]
 
     def __str__(self):
         return self.name
 
 
-class JobQuerySet(SoftDeleteQuerySet):
+class JobQuerySet(GameDataQuerySet):
     def with_class(self):
         return self.select_related("maple_class")
 
@@ -51,14 +52,15 @@ class Job(BaseGameDataModel):
     class Meta:
         ordering = ["name"]
         indexes = [
-            models.Index(fields=["name"]),
+            *SEARCH_INDEXES,
+            active_index("name", name="job_name_active"),
         ]
 
     def __str__(self):
         return self.name
 
 
-class SkillQuerySet(SoftDeleteQuerySet):
+class SkillQuerySet(GameDataQuerySet):
     def with_job(self):
         return self.select_related("job__maple_class")
 
@@ -75,7 +77,8 @@ class Skill(BaseGameDataModel):
     class Meta:
         ordering = ["name"]
         indexes = [
-            models.Index(fields=["name"]),
+            *SEARCH_INDEXES,
+            active_index("name", name="skill_name_active"),
         ]
 
     def __str__(self):
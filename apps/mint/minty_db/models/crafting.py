@@ -1,6 +1,12 @@
 from django.db import models
 
-from common.models import BaseModel, SoftDeleteManager, SoftDeleteQuerySet
+from common.models import (
+    BaseModel,
+    SoftDeleteManager,
+    SoftDeleteQuerySet,
+    active_index,
+    active_unique,
+)
 
 
 class CraftingRecipeQuerySet(SoftDeleteQuerySet):
@@ -22,8 +28,18 @@ class CraftingRecipeQuerySet(SoftDeleteQuerySet):
 class CraftingRecipe(BaseModel):
     """
     Represents a crafting recipe in MapleStory.
+
+    Unlike the named game data entities, a recipe is not a
+    BaseGameDataModel, but imported recipes still carry the `source_id` and
+    `content_hash` of their dump record. Recipes added by hand have no
+    `source_id` and are left alone by imports.
     """
 
+    source_id = models.IntegerField(unique=True, blank=True, null=True, default=None)
+    content_hash = models.CharField(
+        max_length=32, blank=True, default="", editable=False
+    )
+
     result_item = models.ForeignKey(
         "Item", on_delete=models.CASCADE, related_name="crafted_by_recipes"
     )
@@ -44,8 +60,8 @@ class CraftingRecipe(BaseModel):
     class Meta:
         ordering = ["result_item__name"]
         indexes = [
-            models.Index(fields=["result_item", "crafter_npc"]),
-            models.Index(fields=["meso_cost"]),
+            active_index("result_item", "crafter_npc", name="recipe_result_npc_active"),
+            active_index("meso_cost", name="recipe_meso_cost_active"),
         ]
 
     def __str__(self):
@@ -62,8 +78,13 @@ class CraftingIngredient(BaseModel):
     quantity = models.IntegerField(default=1)
 
     class Meta:
-        unique_together = [["recipe", "item"]]
+        db_table = "game_crafting_ingredient"
         ordering = ["item__name"]
+        constraints = [
+            active_unique(
+                "recipe", "item", name="craftingingredient_recipe_item_active_unique"
+            ),
+        ]
 
     def __str__(self):
         return f"{self.quantity}x {self.item.name} for {self.recipe}"
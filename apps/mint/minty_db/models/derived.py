@@ -0,0 +1,217 @@
+import re
+import uuid
+
+from django.apps import apps
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db import connection, connections, models, transaction
+from django.db.models import Case, F, Q, Value, When, Window
+from django.db.models.functions import Length, RowNumber
+
+
+class FarmingSpotQuerySet(models.QuerySet):
+    def for_item(self, item_uuid):
+        try:
+            item_uuid = uuid.UUID(str(item_uuid))
+        except ValueError:
+            return self.none()
+        return self.filter(item_uuid=item_uuid)
+
+    def refresh(self):
+        """
+        Rebuild the farming index from the current drop and spawn tables.
+        Readers are not blocked while the refresh runs.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"REFRESH MATERIALIZED VIEW CONCURRENTLY {self.model._meta.db_table}"
+            )
+
+
+class FarmingSpot(models.Model):
+    """
+    Precomputed answer to "where do I farm this item": one row per mob
+    dropping an item, carrying the mob's stats and every map it spawns in
+    along with the map's region and continent. Soft-deleted rows are
+    excluded throughout.
+
+    Backed by a materialized view (see migration 0003), so reads are a
+    single index scan on `item_uuid`. Refreshed after game data imports and
+    admin edits.
+    """
+
+    # The primary key is the id of the underlying ItemDrop.
+    item = models.ForeignKey("Item", on_delete=models.DO_NOTHING, related_name="+")
+    mob = models.ForeignKey("Mob", on_delete=models.DO_NOTHING, related_name="+")
+    item_uuid = models.UUIDField()
+    mob_uuid = models.UUIDField()
+    mob_name = models.CharField(max_length=200)
+    drop_rate = models.FloatField()
+    hp = models.IntegerField()
+    exp = models.IntegerField()
+    mesos = models.IntegerField()
+    # [{"id", "name", "region": {"id", "name"}, "continent": {"id", "name"}}]
+    maps = models.JSONField()
+
+    objects = FarmingSpotQuerySet.as_manager()
+
+    class Meta:
+        managed = False
+        db_table = "minty_db_farmingspot"
+        ordering = ["-drop_rate", "hp", "id"]
+
+    def __str__(self):
+        return f"{self.mob_name} ({self.drop_rate:.2%})"
+
+
+def refresh_derived_tables():
+    """
+    Rebuild the tables derived from the game data: the farming index (on
+    PostgreSQL only) and the search index. Run after every change to the
+    game data, before its version is bumped.
+    """
+    if connection.vendor == "postgresql":
+        FarmingSpot.objects.refresh()
+    SearchEntry.objects.refresh()
+
+
+def normalize_name(name):
+    """
+    Lowercase a name and reduce punctuation and whitespace runs to single
+    spaces, so "Zakum's Helmet" and "zakum helmet" normalize alike.
+    """
+    return " ".join(re.sub(r"[^\w]+", " ", name.lower()).split())
+
+
+class SearchEntryQuerySet(models.QuerySet):
+    def search(self, term, per_type=5):
+        """
+        Up to `per_type` best hits for `term` per entity type, ordered by
+        entity type and then relevance within the type, as one query.
+
+        Exact name matches rank above prefix matches, which rank above
+        substring or (on PostgreSQL) trigram similarity matches; ties go to
+        the entity type's weight and then the shorter name.
+        """
+        term = normalize_name(term)
+        if not term:
+            return self.none()
+
+        match = Q(normalized_name__contains=term)
+        score = Case(
+            When(normalized_name=term, then=Value(3.0)),
+            When(normalized_name__startswith=term, then=Value(2.0)),
+            default=Value(1.0),
+            output_field=models.FloatField(),
+        )
+        if connections[self.db].vendor == "postgresql":
+            match |= Q(normalized_name__trigram_similar=term)
+            score = score + TrigramSimilarity("normalized_name", term)
+
+        ranking = [
+            F("score").desc(),
+            F("weight").desc(),
+            Length("name").asc(),
+            F("name").asc(),
+        ]
+        return (
+            self.filter(match)
+            .annotate(score=score)
+            .annotate(
+                position=Window(
+                    RowNumber(), partition_by=F("entity_type"), order_by=ranking
+                )
+            )
+            .filter(position__lte=per_type)
+            .order_by("entity_type", "position")
+        )
+
+    @transaction.atomic
+    def refresh(self, batch_size=5000):
+        """
+        Rebuild the search index from every active game data entity.
+        """
+        self.all().delete()
+        for entity_type, model_label in SearchEntry.ENTITY_MODELS.items():
+            model = apps.get_model("minty_db", model_label)
+            rows = model.objects.values_list("uuid", "source_id", "name")
+            batch = []
+            for entity_uuid, source_id, name in rows.iterator(chunk_size=batch_size):
+                batch.append(
+                    SearchEntry(
+                        entity_type=entity_type,
+                        entity_uuid=entity_uuid,
+                        source_id=source_id,
+                        name=name,
+                        normalized_name=normalize_name(name),
+                        weight=SearchEntry.WEIGHTS[entity_type],
+                    )
+                )
+                if len(batch) >= batch_size:
+                    self.bulk_create(batch)
+                    batch = []
+            self.bulk_create(batch)
+
+
+class SearchEntry(models.Model):
+    """
+    Denormalized name index over every game data entity, backing the
+    cross-entity search endpoint. Rebuilt after game data imports and admin
+    edits.
+    """
+
+    # Entity type as exposed by the API -> BaseGameDataModel subclass.
+    ENTITY_MODELS = {
+        "item": "Item",
+        "mob": "Mob",
+        "npc": "NPC",
+        "map": "Map",
+        "quest": "Quest",
+        "skill": "Skill",
+        "job": "Job",
+        "class": "MapleClass",
+        "region": "Region",
+        "continent": "Continent",
+    }
+    # Tiebreak between equally good matches of different types.
+    WEIGHTS = {
+        "item": 10,
+        "mob": 10,
+        "npc": 8,
+        "map": 8,
+        "quest": 6,
+        "skill": 4,
+        "job": 3,
+        "class": 3,
+        "region": 2,
+        "continent": 1,
+    }
+
+    entity_type = models.CharField(
+        max_length=20, choices=[(key, key) for key in ENTITY_MODELS]
+    )
+    entity_uuid = models.UUIDField()
+    source_id = models.IntegerField(null=True)
+    name = models.CharField(max_length=200)
+    normalized_name = models.CharField(max_length=200)
+    weight = models.IntegerField()
+
+    objects = SearchEntryQuerySet.as_manager()
+
+    class Meta:
+        ordering = ["entity_type", "name"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["entity_type", "entity_uuid"],
+                name="minty_db_searchentry_entity",
+            )
+        ]
+        indexes = [
+            GinIndex(
+                OpClass("normalized_name", name="gin_trgm_ops"),
+                name="minty_db_searchentry_trgm",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.entity_type})"
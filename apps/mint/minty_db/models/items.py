@@ -1,10 +1,10 @@
 from django.db import models
 
-from common.models import BaseModel, SoftDeleteManager, SoftDeleteQuerySet
-from minty_db.models.base import BaseGameDataModel
+from common.models import BaseModel, SoftDeleteManager, active_index, active_unique
+from minty_db.models.base import SEARCH_INDEXES, BaseGameDataModel, GameDataQuerySet
 
 
-class ItemQuerySet(SoftDeleteQuerySet):
+class ItemQuerySet(GameDataQuerySet):
     def with_drops(self):
         return self.prefetch_related("itemdrop_set__mob")
 
@@ -49,8 +49,9 @@ class Item(BaseGameDataModel):
     class Meta:
         ordering = ["name"]
         indexes = [
-            models.Index(fields=["name"]),
-            models.Index(fields=["slot", "category"]),
+            *SEARCH_INDEXES,
+            active_index("name", name="item_name_active"),
+            active_index("slot", "category", name="item_slot_category_active"),
         ]
 
     def __str__(self):
@@ -67,10 +68,12 @@ class ItemDrop(BaseModel):
     drop_rate = models.FloatField(help_text="Drop rate as a decimal (0.0 to 1.0)")
 
     class Meta:
-        unique_together = [["item", "mob"]]
         ordering = ["-drop_rate"]
+        constraints = [
+            active_unique("item", "mob", name="itemdrop_item_mob_active_unique"),
+        ]
         indexes = [
-            models.Index(fields=["drop_rate"]),
+            active_index("drop_rate", name="itemdrop_drop_rate_active"),
         ]
 
     def __str__(self):
@@ -1,11 +1,11 @@
 from django.db import models
 
-from common.models import BaseModel, SoftDeleteManager, SoftDeleteQuerySet
-from minty_db.models.base import BaseGameDataModel
+from common.models import BaseModel, SoftDeleteManager, active_index, active_unique
+from minty_db.models.base import SEARCH_INDEXES, BaseGameDataModel, GameDataQuerySet
 from minty_db.models.world import Map
 
 
-class MobQuerySet(SoftDeleteQuerySet):
+class MobQuerySet(GameDataQuerySet):
     def with_drops(self):
         return self.prefetch_related("itemdrop_set__item")
 
@@ -38,9 +38,10 @@ class Mob(BaseGameDataModel):
     class Meta:
         ordering = ["name"]
         indexes = [
-            models.Index(fields=["name"]),
-            models.Index(fields=["hp"]),
-            models.Index(fields=["exp"]),
+            *SEARCH_INDEXES,
+            active_index("name", name="mob_name_active"),
+            active_index("hp", name="mob_hp_active"),
+            active_index("exp", name="mob_exp_active"),
         ]
 
     def __str__(self):
@@ -56,7 +57,9 @@ class MobSpawn(BaseModel):
     map = models.ForeignKey(Map, on_delete=models.CASCADE)
 
     class Meta:
-        unique_together = [["mob", "map"]]
+        constraints = [
+            active_unique("mob", "map", name="mobspawn_mob_map_active_unique"),
+        ]
 
     def __str__(self):
         return f"{self.mob.name} in {self.map.name}"
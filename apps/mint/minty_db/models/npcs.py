@@ -1,11 +1,11 @@
 from django.db import models
 
-from common.models import BaseModel, SoftDeleteManager, SoftDeleteQuerySet
-from minty_db.models.base import BaseGameDataModel
+from common.models import BaseModel, SoftDeleteManager, active_index, active_unique
+from minty_db.models.base import SEARCH_INDEXES, BaseGameDataModel, GameDataQuerySet
 from minty_db.models.world import Map
 
 
-class NPCQuerySet(SoftDeleteQuerySet):
+class NPCQuerySet(GameDataQuerySet):
     def with_locations(self):
         return self.prefetch_related("npclocation_set__map__region__continent")
 
@@ -30,7 +30,8 @@ class NPC(BaseGameDataModel):
     class Meta:
         ordering = ["name"]
         indexes = [
-            models.Index(fields=["name"]),
+            *SEARCH_INDEXES,
+            active_index("name", name="npc_name_active"),
         ]
 
     def __str__(self):
@@ -46,7 +47,10 @@ class NPCLocation(BaseModel):
     map = models.ForeignKey(Map, on_delete=models.CASCADE)
 
     class Meta:
-        unique_together = [["npc", "map"]]
+        db_table = "game_npc_location"
+        constraints = [
+            active_unique("npc", "map", name="npclocation_npc_map_active_unique"),
+        ]
 
     def __str__(self):
         return f"{self.npc.name} in {self.map.name}"
@@ -62,10 +66,13 @@ class NPCShopItem(BaseModel):
     price = models.IntegerField(help_text="Price in mesos")
 
     class Meta:
-        unique_together = [["npc", "item"]]
+        db_table = "game_npc_shop_item"
         ordering = ["price"]
+        constraints = [
+            active_unique("npc", "item", name="npcshopitem_npc_item_active_unique"),
+        ]
         indexes = [
-            models.Index(fields=["price"]),
+            active_index("price", name="npcshopitem_price_active"),
         ]
 
     def __str__(self):
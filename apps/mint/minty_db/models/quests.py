@@ -1,10 +1,11 @@
 from django.db import models
+from django.db.models.expressions import RawSQL
 
-from common.models import BaseModel, SoftDeleteManager, SoftDeleteQuerySet
-from minty_db.models.base import BaseGameDataModel
+from common.models import BaseModel, SoftDeleteManager, active_index, active_unique
+from minty_db.models.base import SEARCH_INDEXES, BaseGameDataModel, GameDataQuerySet
 
 
-class QuestQuerySet(SoftDeleteQuerySet):
+class QuestQuerySet(GameDataQuerySet):
     def with_npc(self):
         return self.select_related("started_by")
 
@@ -21,6 +22,66 @@ class QuestQuerySet(SoftDeleteQuerySet):
             "started_by", "prerequisite_quest", "required_class", "required_job"
         ).prefetch_related("questreward_set__item")
 
+    def chain(self, quest):
+        """
+        Filter to the quest's full chain: the quest itself, every quest
+        before it via `prerequisite_quest` and every quest it (transitively)
+        unlocks. Resolved with a recursive CTE inside the query, so the whole
+        chain is fetched in one round trip.
+        """
+        table = self.model._meta.db_table
+        chain = RawSQL(
+            f"""
+            WITH RECURSIVE ancestors(id) AS (
+                SELECT %s
+                UNION
+                SELECT p.id FROM {table} q
+                JOIN ancestors a ON q.id = a.id
+                JOIN {table} p ON p.id = q.prerequisite_quest_id
+                WHERE p.deleted_at IS NULL
+            ), descendants(id) AS (
+                SELECT %s
+                UNION
+                SELECT q.id FROM {table} q
+                JOIN descendants d ON q.prerequisite_quest_id = d.id
+                WHERE q.deleted_at IS NULL
+            )
+            SELECT id FROM ancestors UNION SELECT id FROM descendants
+            """,
+            (quest.pk, quest.pk),
+        )
+        return self.filter(pk__in=chain)
+
+
+def order_by_chain(quests):
+    """
+    Order quests so that each comes after its prerequisite, keeping the
+    queryset's own order among quests that are available at the same point.
+    Prerequisites outside the given quests are ignored, and any quests left
+    in a prerequisite cycle are appended in their original order.
+    """
+    quests = list(quests)
+    position = {quest.pk: index for index, quest in enumerate(quests)}
+    unlocks = {}
+    roots = []
+    for quest in quests:
+        if quest.prerequisite_quest_id in position:
+            unlocks.setdefault(quest.prerequisite_quest_id, []).append(quest)
+        else:
+            roots.append(quest)
+
+    ordered = []
+    stack = roots[::-1]
+    while stack:
+        quest = stack.pop()
+        ordered.append(quest)
+        stack.extend(reversed(unlocks.pop(quest.pk, ())))
+
+    if len(ordered) < len(quests):
+        seen = {quest.pk for quest in ordered}
+        ordered.extend(quest for quest in quests if quest.pk not in seen)
+    return ordered
+
 
 class Quest(BaseGameDataModel):
     """
@@ -67,9 +128,10 @@ class Quest(BaseGameDataModel):
     class Meta:
         ordering = ["name"]
         indexes = [
-            models.Index(fields=["name"]),
-            models.Index(fields=["quest_line"]),
-            models.Index(fields=["required_level"]),
+            *SEARCH_INDEXES,
+            active_index("name", name="quest_name_active"),
+            active_index("quest_line", name="quest_quest_line_active"),
+            active_index("required_level", name="quest_required_level_active"),
         ]
 
     def __str__(self):
@@ -91,8 +153,11 @@ class QuestReward(BaseModel):
     reward_group = models.IntegerField(default=0)
 
     class Meta:
-        unique_together = [["quest", "item"]]
+        db_table = "game_quest_reward"
         ordering = ["reward_group", "item__name"]
+        constraints = [
+            active_unique("quest", "item", name="questreward_quest_item_active_unique"),
+        ]
 
     def __str__(self):
         group_type = (
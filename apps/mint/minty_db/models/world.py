@@ -1,10 +1,10 @@
 from django.db import models
 
-from common.models import SoftDeleteManager, SoftDeleteQuerySet
-from minty_db.models.base import BaseGameDataModel
+from common.models import SoftDeleteManager, active_index
+from minty_db.models.base import SEARCH_INDEXES, BaseGameDataModel, GameDataQuerySet
 
 
-class ContinentQuerySet(SoftDeleteQuerySet):
+class ContinentQuerySet(GameDataQuerySet):
     def with_regions(self):
         return self.prefetch_related("regions")
 
@@ -22,14 +22,15 @@ class Continent(BaseGameDataModel):
     class Meta:
         ordering = ["name"]
         indexes = [
-            models.Index(fields=["name"]),
+            *SEARCH_INDEXES,
+            active_index("name", name="continent_name_active"),
         ]
 
     def __str__(self):
         return self.name
 
 
-class RegionQuerySet(SoftDeleteQuerySet):
+class RegionQuerySet(GameDataQuerySet):
     def with_continent(self):
         return self.select_related("continent")
 
@@ -51,14 +52,15 @@ class Region(BaseGameDataModel):
     class Meta:
         ordering = ["name"]
         indexes = [
-            models.Index(fields=["name"]),
+            *SEARCH_INDEXES,
+            active_index("name", name="region_name_active"),
         ]
 
     def __str__(self):
         return self.name
 
 
-class MapQuerySet(SoftDeleteQuerySet):
+class MapQuerySet(GameDataQuerySet):
     def with_region(self):
         return self.select_related("region__continent")
 
@@ -91,7 +93,8 @@ class Map(BaseGameDataModel):
     class Meta:
         ordering = ["name"]
         indexes = [
-            models.Index(fields=["name"]),
+            *SEARCH_INDEXES,
+            active_index("name", name="map_name_active"),
         ]
 
     def __str__(self):
@@ -1,3 +1,147 @@
+import io
+import json
+import tempfile
+from pathlib import Path
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
 from django.test import TestCase
 
-# Create your tests here.
+from minty_db.importers import ENTITY_SPECS, EntityImporter
+from minty_db.models import NPC, CraftingRecipe, Item, Quest
+
+
+class ImportTestCase(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+
+    def write_dump(self, **records):
+        for model_name, rows in records.items():
+            lines = [json.dumps(row) for row in rows]
+            (self.directory / f"{model_name}.ndjson").write_text("\n".join(lines))
+
+    def import_dump(self, **options):
+        importer = EntityImporter(self.directory, **options)
+        return {
+            spec.model: importer.import_entities(spec)
+            for spec in ENTITY_SPECS
+            if (self.directory / spec.filename).exists()
+        }
+
+
+class EntityImportTests(ImportTestCase):
+    def test_upserts_by_source_id_and_soft_deletes_vanished_rows(self):
+        self.write_dump(item=[{"source_id": i, "name": f"Item {i}"} for i in (1, 2, 3)])
+        self.import_dump()
+        pks = dict(Item.objects.values_list("source_id", "pk"))
+
+        self.write_dump(
+            item=[
+                {"source_id": 1, "name": "Renamed"},
+                {"source_id": 3, "name": "Item 3"},
+            ]
+        )
+        stats = self.import_dump()[Item]
+        self.assertEqual((stats.updated, stats.unchanged, stats.deleted), (1, 1, 1))
+        self.assertEqual(
+            dict(Item.objects.values_list("source_id", "name")),
+            {1: "Renamed", 3: "Item 3"},
+        )
+        self.assertIsNotNone(Item.all_objects.get(source_id=2).deleted_at)
+
+        # A row that reappears is restored in place.
+        self.write_dump(item=[{"source_id": i, "name": f"Item {i}"} for i in (1, 2, 3)])
+        self.import_dump()
+        self.assertEqual(dict(Item.objects.values_list("source_id", "pk")), pks)
+
+    def test_resolves_foreign_keys_by_source_id(self):
+        self.write_dump(
+            item=[{"source_id": 1, "name": "Ore"}, {"source_id": 2, "name": "Plate"}],
+            npc=[{"source_id": 10, "name": "Smith"}],
+            craftingrecipe=[
+                {"source_id": 100, "result_item": 2, "crafter_npc": 10},
+                {"source_id": 101, "result_item": 2, "result_quantity": 2},
+            ],
+            quest=[
+                {"source_id": 20, "name": "First", "started_by": 10},
+                {
+                    "source_id": 21,
+                    "name": "Second",
+                    "started_by": 10,
+                    "prerequisite_quest": 20,
+                },
+            ],
+        )
+        self.import_dump()
+
+        smith = NPC.objects.get(source_id=10)
+        self.assertEqual(
+            list(
+                CraftingRecipe.objects.order_by("source_id").values_list(
+                    "source_id",
+                    "result_item__source_id",
+                    "crafter_npc",
+                    "result_quantity",
+                )
+            ),
+            [(100, 2, smith.pk, 1), (101, 2, None, 2)],
+        )
+        second = Quest.objects.get(source_id=21)
+        self.assertEqual(second.started_by, smith)
+        self.assertEqual(second.prerequisite_quest.source_id, 20)
+
+    def test_rejects_duplicate_source_ids(self):
+        self.write_dump(
+            item=[{"source_id": 1, "name": "Ore"}, {"source_id": 1, "name": "Again"}]
+        )
+        with self.assertRaisesMessage(CommandError, "duplicate source_id 1"):
+            call_command("import_gamedata", self.directory, stdout=io.StringIO())
+        self.assertFalse(Item.all_objects.exists())
+
+    def test_rejects_missing_required_foreign_keys(self):
+        self.write_dump(
+            npc=[{"source_id": 10, "name": "Smith"}],
+            quest=[{"source_id": 20, "name": "First"}],
+        )
+        with self.assertRaisesMessage(CommandError, "missing required `started_by`"):
+            call_command("import_gamedata", self.directory, stdout=io.StringIO())
+        self.assertFalse(NPC.all_objects.exists())
+
+
+class ContentHashTests(ImportTestCase):
+    def test_unchanged_records_are_not_rewritten(self):
+        self.write_dump(
+            item=[
+                {"source_id": 1, "name": "Ore", "slot": "etc"},
+                {"source_id": 2, "name": "Plate"},
+            ]
+        )
+        self.import_dump()
+        updated_at = dict(Item.objects.values_list("source_id", "updated_at"))
+
+        # Key order doesn't change a record's hash.
+        self.write_dump(
+            item=[
+                {"slot": "etc", "name": "Ore", "source_id": 1},
+                {"source_id": 2, "name": "Plate", "description": "Shiny."},
+            ]
+        )
+        stats = self.import_dump()[Item]
+        self.assertEqual((stats.unchanged, stats.updated), (1, 1))
+        self.assertEqual(Item.objects.get(source_id=1).updated_at, updated_at[1])
+        self.assertNotEqual(Item.objects.get(source_id=2).updated_at, updated_at[2])
+
+        stats = self.import_dump(force=True)[Item]
+        self.assertEqual((stats.unchanged, stats.updated), (0, 2))
+
+    def test_unchanged_records_restore_soft_deleted_rows(self):
+        self.write_dump(item=[{"source_id": 1, "name": "Ore"}])
+        self.import_dump()
+        Item.objects.filter(source_id=1).delete()
+
+        # The record is unchanged, but its row was soft-deleted since.
+        stats = self.import_dump()[Item]
+        self.assertEqual((stats.unchanged, stats.updated), (0, 1))
+        self.assertTrue(Item.objects.filter(source_id=1).exists())
@@ -0,0 +1,42 @@
+"""
+Game data versioning.
+
+MintyDB only changes through imports and admin edits, so anything derived
+from it (in-memory indexes, cached API responses) is keyed on a single
+counter that writers bump, rather than being invalidated piecemeal.
+"""
+
+import time
+
+from django.core.cache import caches
+
+# Kept apart from the response cache (see CACHES in settings) so that culling
+# cached responses never drops the version they are keyed on.
+VERSION_CACHE = "versions"
+DATA_VERSION_KEY = "minty_db:data_version"
+
+
+def get_data_version() -> int:
+    """
+    Return the current game data version.
+    """
+    cache = caches[VERSION_CACHE]
+    version = cache.get(DATA_VERSION_KEY)
+    if version is None:
+        # Seeding from the clock keeps versions increasing even if the key is
+        # evicted, so a stale version is never handed out again.
+        cache.add(DATA_VERSION_KEY, time.time_ns() // 1_000_000, timeout=None)
+        version = cache.get(DATA_VERSION_KEY)
+    return version
+
+
+def bump_data_version() -> int:
+    """
+    Mark all game data derived state as stale. Returns the new version.
+    """
+    cache = caches[VERSION_CACHE]
+    try:
+        return cache.incr(DATA_VERSION_KEY)
+    except ValueError:
+        get_data_version()
+        return cache.incr(DATA_VERSION_KEY)
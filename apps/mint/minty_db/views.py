@@ -16,6 +16,12 @@ class ItemListView(ListView):
     context_object_name = "items"
     paginate_by = 24
 
+    def get_queryset(self):
+        search = self.request.GET.get("search", "").strip()
+        if search:
+            return Item.objects.search(search)
+        return super().get_queryset()
+
 
 class ItemDetailView(DetailView):
     model = Item
@@ -5,23 +5,56 @@ from minty_hq.models import Guild, GuildFame, GuildTag
 
 @admin.register(Guild)
 class GuildAdmin(admin.ModelAdmin):
-    list_display = ("name", "owner", "created_at")
+    list_display = ("name", "owner", "fame_total", "created_at")
     list_filter = ("created_at",)
+    readonly_fields = ("fame_total", "fame_count", "defame_count")
     search_fields = ("name", "description")
     ordering = ("-created_at",)
 
 
+class GuildRatingAdmin(admin.ModelAdmin):
+    """
+    Ratings are read-only here: they are only written through Guild, which
+    keeps the guild's counters, standings, tag slots and fame rollups in
+    step. Deletions go through Guild as well, calling `remove_method` with
+    the rating's user and the rating fields named in `remove_arguments`.
+    """
+
+    remove_method = None
+    remove_arguments = ()
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def delete_model(self, request, obj):
+        self.remove_rating(obj)
+
+    def delete_queryset(self, request, queryset):
+        for obj in queryset.select_related("guild", "user"):
+            self.remove_rating(obj)
+
+    def remove_rating(self, obj):
+        arguments = [getattr(obj, name) for name in self.remove_arguments]
+        getattr(obj.guild, self.remove_method)(obj.user, *arguments)
+
+
 @admin.register(GuildFame)
-class GuildFameAdmin(admin.ModelAdmin):
+class GuildFameAdmin(GuildRatingAdmin):
     list_display = ("guild", "user", "value", "created_at")
     list_filter = ("value", "created_at")
     search_fields = ("guild__name", "user__username")
     ordering = ("-created_at",)
+    remove_method = "remove_fame"
 
 
 @admin.register(GuildTag)
-class GuildTagAdmin(admin.ModelAdmin):
-    list_display = ("guild", "user", "value", "created_at")
+class GuildTagAdmin(GuildRatingAdmin):
+    list_display = ("guild", "user", "value", "slot", "created_at")
     list_filter = ("value", "created_at")
     search_fields = ("guild__name", "user__username")
     ordering = ("-created_at",)
+    remove_method = "remove_tag"
+    remove_arguments = ("value",)
@@ -0,0 +1,81 @@
+"""
+Reconciliation of the counters kept on Guild.
+
+The fame counters are maintained incrementally as ratings are written, so
+guild lists can read and sort by them without aggregating. Anything that
+writes GuildFame rows around those methods (the admin, bulk updates, data
+fixes) leaves them behind; reconciliation recomputes them from the rows.
+"""
+
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+from minty_hq.models import Guild, GuildFame
+
+
+def _aggregate(**aggregate):
+    (name,) = aggregate
+    rows = (
+        GuildFame.objects.filter(guild=OuterRef("pk"))
+        .order_by()
+        .values("guild")
+        .annotate(**aggregate)
+        .values(name)
+    )
+    return Coalesce(Subquery(rows, output_field=IntegerField()), 0)
+
+
+def get_fame_counters():
+    """
+    The fame counters of a guild, as computed from its active GuildFame
+    rows, as expressions over Guild.
+    """
+    return {
+        "fame_total": _aggregate(total=Sum("value")),
+        "fame_count": _aggregate(
+            count=Count("pk", filter=Q(value=GuildFame.FameValue.FAME))
+        ),
+        "defame_count": _aggregate(
+            count=Count("pk", filter=Q(value=GuildFame.FameValue.DEFAME))
+        ),
+    }
+
+
+def reconcile_fame_counters(batch_size=1000):
+    """
+    Recompute the fame counters of every guild, soft-deleted ones included,
+    in batches of `batch_size` guilds. Returns the number of guilds whose
+    counters were off.
+
+    Each batch locks its guilds first: a rating written concurrently either
+    committed before, and is counted here, or updates the counters after
+    this batch commits.
+    """
+    counters = get_fame_counters()
+    fixed = 0
+    last_pk = 0
+    while True:
+        with transaction.atomic():
+            pks = list(
+                Guild.all_objects.filter(pk__gt=last_pk)
+                .order_by("pk")
+                .select_for_update()
+                .values_list("pk", flat=True)[:batch_size]
+            )
+            if not pks:
+                break
+            drifted = (
+                Guild.all_objects.filter(pk__in=pks)
+                .alias(
+                    **{f"expected_{name}": value for name, value in counters.items()}
+                )
+                .exclude(
+                    **{name: F(f"expected_{name}") for name in counters},
+                )
+            )
+            fixed += Guild.all_objects.filter(
+                pk__in=list(drifted.values_list("pk", flat=True))
+            ).update(**counters)
+        last_pk = pks[-1]
+    return fixed
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from minty_hq.counters import reconcile_fame_counters
+from minty_hq.models import GuildFameDay
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the fame counters kept on every guild from its fame "
+        "ratings, fixing any that drifted, and rebuild the daily fame rollups "
+        "from the fame history."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of guilds locked and fixed per transaction (default: 1000).",
+        )
+
+    def handle(self, *args, **options):
+        fixed = reconcile_fame_counters(batch_size=options["batch_size"])
+        self.stdout.write(f"Fame counters fixed on {fixed} guilds.")
+        GuildFameDay.objects.refresh()
+        days = GuildFameDay.objects.count()
+        self.stdout.write(self.style.SUCCESS(f"{days} daily fame rollups rebuilt."))
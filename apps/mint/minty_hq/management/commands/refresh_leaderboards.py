@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from minty_hq.models import GuildStanding
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the guild leaderboards from the fame counters, tags and the "
+        "last week of fame history. Must run daily, just after midnight in "
+        "TIME_ZONE: ratings only drop off the rising board when it is rebuilt, "
+        "so until then it keeps counting the day that left its window."
+    )
+
+    def handle(self, *args, **options):
+        GuildStanding.objects.refresh()
+        boards = GuildStanding.get_boards()
+        count = GuildStanding.objects.filter(board__in=boards).count()
+        self.stdout.write(
+            self.style.SUCCESS(f"{count} standings on {len(boards)} leaderboards.")
+        )
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:34
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("minty_hq", "0002_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name="guildfame",
+            unique_together=set(),
+        ),
+        migrations.AlterUniqueTogether(
+            name="guildtag",
+            unique_together=set(),
+        ),
+        migrations.AddIndex(
+            model_name="guild",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["created_at"],
+                name="guild_created_at_active",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="guildfame",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=("guild", "user"),
+                name="guildfame_guild_user_active_unique",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="guildtag",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=("guild", "user", "value"),
+                name="guildtag_guild_user_value_active_unique",
+            ),
+        ),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:39
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+
+def count_fame(apps, schema_editor):
+    Guild = apps.get_model("minty_hq", "Guild")
+    GuildFame = apps.get_model("minty_hq", "GuildFame")
+    rows = (
+        GuildFame.objects.filter(deleted_at__isnull=True)
+        .order_by()
+        .values("guild")
+        .annotate(
+            total=Sum("value"),
+            fame=Count("pk", filter=Q(value=1)),
+            defame=Count("pk", filter=Q(value=-1)),
+        )
+    )
+    for row in rows.iterator():
+        Guild.objects.filter(pk=row["guild"]).update(
+            fame_total=row["total"],
+            fame_count=row["fame"],
+            defame_count=row["defame"],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("minty_hq", "0003_active_row_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="guild",
+            name="defame_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="guild",
+            name="fame_count",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="guild",
+            name="fame_total",
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name="guild",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["fame_total"],
+                name="guild_fame_total_active",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="guild",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["fame_count"],
+                name="guild_fame_count_active",
+            ),
+        ),
+        migrations.RunPython(count_fame, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,80 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:42
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def build_standings(apps, schema_editor):
+    # The rising board is left to the first `refresh_leaderboards` run.
+    Guild = apps.get_model("minty_hq", "Guild")
+    GuildTag = apps.get_model("minty_hq", "GuildTag")
+    GuildStanding = apps.get_model("minty_hq", "GuildStanding")
+    standings = [
+        GuildStanding(board="fame", guild_id=guild_id, score=score)
+        for guild_id, score in Guild.objects.filter(
+            Q(fame_count__gt=0) | Q(defame_count__gt=0)
+        ).values_list("pk", "fame_total")
+    ]
+    tags = (
+        GuildTag.objects.filter(deleted_at__isnull=True)
+        .order_by()
+        .values("guild", "value")
+        .annotate(count=Count("pk"))
+    )
+    standings += [
+        GuildStanding(
+            board=f"tag-{row['value']}", guild_id=row["guild"], score=row["count"]
+        )
+        for row in tags
+    ]
+    GuildStanding.objects.bulk_create(standings, batch_size=5000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("minty_hq", "0004_guild_fame_counters"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="GuildStanding",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("board", models.CharField(max_length=50)),
+                ("score", models.IntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "guild",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="standings",
+                        to="minty_hq.guild",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["board", "-score", "id"],
+                "indexes": [
+                    models.Index(
+                        fields=["board", "-score"], name="guildstanding_board_score"
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("board", "guild"), name="guildstanding_board_guild"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(build_standings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("minty_hq", "0005_guild_standings"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="guildstanding",
+            name="guildstanding_board_score",
+        ),
+        migrations.AddIndex(
+            model_name="guildstanding",
+            index=models.Index(
+                fields=["board", "-score"],
+                include=("guild",),
+                name="guildstanding_board_score",
+            ),
+        ),
+    ]
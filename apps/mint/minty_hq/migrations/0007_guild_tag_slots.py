@@ -0,0 +1,91 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:46
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+from django.utils import timezone
+
+TAGS_PER_USER = 5
+
+
+def number_tags(apps, schema_editor):
+    # Tags past the limit (given while it was racy) are removed, oldest kept,
+    # and their removal is recorded in the tag history.
+    GuildTag = apps.get_model("minty_hq", "GuildTag")
+    HistoricalGuildTag = apps.get_model("minty_hq", "HistoricalGuildTag")
+    GuildStanding = apps.get_model("minty_hq", "GuildStanding")
+    tags = (
+        GuildTag.objects.filter(deleted_at__isnull=True)
+        .order_by("guild", "user", "created_at", "pk")
+        .values_list("pk", "guild", "user", "value")
+    )
+    owner, slot, over = None, 0, []
+    for pk, guild_id, user_id, value in tags.iterator():
+        slot = slot + 1 if (guild_id, user_id) == owner else 1
+        owner = (guild_id, user_id)
+        if slot > TAGS_PER_USER:
+            over.append(pk)
+            GuildStanding.objects.filter(
+                board=f"tag-{value}", guild_id=guild_id
+            ).update(score=F("score") - 1)
+        elif slot > 1:
+            GuildTag.objects.filter(pk=pk).update(slot=slot)
+
+    now = timezone.now()
+    removed = list(GuildTag.objects.filter(pk__in=over))
+    for tag in removed:
+        tag.deleted_at = tag.updated_at = now
+    GuildTag.objects.bulk_update(removed, ["deleted_at", "updated_at"])
+    HistoricalGuildTag.objects.bulk_create(
+        [
+            HistoricalGuildTag(
+                **{
+                    field.attname: getattr(tag, field.attname)
+                    for field in GuildTag._meta.concrete_fields
+                },
+                history_date=now,
+                history_type="~",
+                history_change_reason="Over the tag limit",
+            )
+            for tag in removed
+        ]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("minty_hq", "0006_guild_standing_covering_index"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="guildtag",
+            name="slot",
+            field=models.PositiveSmallIntegerField(default=1),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="historicalguildtag",
+            name="slot",
+            field=models.PositiveSmallIntegerField(default=1),
+            preserve_default=False,
+        ),
+        migrations.RunPython(number_tags, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="guildtag",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=("guild", "user", "slot"),
+                name="guildtag_guild_user_slot_active_unique",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="guildtag",
+            constraint=models.CheckConstraint(
+                condition=models.Q(("slot__gte", 1), ("slot__lte", 5)),
+                name="guildtag_slot_range",
+            ),
+        ),
+    ]
@@ -0,0 +1,99 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:48
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def roll_up_fame(apps, schema_editor):
+    # As GuildFameDay.objects.refresh().
+    HistoricalGuildFame = apps.get_model("minty_hq", "HistoricalGuildFame")
+    GuildFameDay = apps.get_model("minty_hq", "GuildFameDay")
+    records = HistoricalGuildFame.objects.order_by(
+        "id", "history_date", "history_id"
+    ).values_list(
+        "id", "guild_id", "value", "deleted_at", "history_type", "history_date"
+    )
+    days = {}
+    current = None, 0
+    for record in records.iterator(chunk_size=5000):
+        fame_id, guild_id, value, deleted_at, history_type, history_date = record
+        counted = 0 if deleted_at is not None or history_type == "-" else value
+        previous = current[1] if current[0] == fame_id else 0
+        current = fame_id, counted
+        if counted == previous:
+            continue
+        key = guild_id, timezone.localdate(history_date)
+        fame_delta, changes = days.get(key, (0, 0))
+        days[key] = fame_delta + counted - previous, changes + 1
+    GuildFameDay.objects.bulk_create(
+        [
+            GuildFameDay(
+                guild_id=guild_id, day=day, fame_delta=fame_delta, changes=changes
+            )
+            for (guild_id, day), (fame_delta, changes) in days.items()
+        ],
+        batch_size=5000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("minty_hq", "0007_guild_tag_slots"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="GuildFameDay",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField()),
+                ("fame_delta", models.IntegerField(default=0)),
+                ("changes", models.IntegerField(default=0)),
+            ],
+            options={
+                "ordering": ["guild", "-day"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="historicalguildfame",
+            index=models.Index(
+                fields=["guild", "-history_date", "-history_id"],
+                name="historicalguildfame_guild_date",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="historicalguildtag",
+            index=models.Index(
+                fields=["guild", "-history_date", "-history_id"],
+                name="historicalguildtag_guild_date",
+            ),
+        ),
+        migrations.AddField(
+            model_name="guildfameday",
+            name="guild",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="fame_days",
+                to="minty_hq.guild",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="guildfameday",
+            constraint=models.UniqueConstraint(
+                fields=("guild", "day"), name="guildfameday_guild_day"
+            ),
+        ),
+        migrations.RunPython(roll_up_fame, migrations.RunPython.noop),
+    ]
@@ -1,17 +1,27 @@
 from __future__ import annotations
 
+from datetime import timedelta
 from typing import TYPE_CHECKING
 
-from django.db import models, transaction
-from django.db.models import Count, Sum
-from simple_history.models import HistoricalRecords
+from django.db import IntegrityError, connections, models, transaction
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+from simple_history.utils import bulk_create_with_history, bulk_update_with_history
 
-from common.models import BaseModel
+from common.models import (
+    BaseModel,
+    IndexedHistoricalRecords,
+    active_index,
+    active_unique,
+)
 
 if TYPE_CHECKING:
     from django.db.models.fields.related_descriptors import RelatedManager
     from users.models import User
 
+# Tags a user can give one guild at a time.
+TAGS_PER_USER = 5
+
 
 class Guild(BaseModel):
     """
@@ -26,6 +36,11 @@ class Guild(BaseModel):
         on_delete=models.CASCADE,
         related_name="owned_guilds",
     )
+    # Running totals of the active GuildFame rows, kept by set_fame() and
+    # remove_fame(). `reconcile_guild_counters` recomputes them.
+    fame_total = models.IntegerField(default=0)
+    fame_count = models.IntegerField(default=0)
+    defame_count = models.IntegerField(default=0)
 
     if TYPE_CHECKING:
         fame: RelatedManager[GuildFame]
@@ -33,6 +48,11 @@ class Guild(BaseModel):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            active_index("created_at", name="guild_created_at_active"),
+            active_index("fame_total", name="guild_fame_total_active"),
+            active_index("fame_count", name="guild_fame_count_active"),
+        ]
 
     def __str__(self):
         return self.name
@@ -42,10 +62,22 @@ class Guild(BaseModel):
         """
         Add or update a user's fame rating for this guild.
         """
-        fame, _ = self.fame.update_or_create(
-            user=user,
-            defaults={"value": value},
-        )
+        fame = self.fame.select_for_update().filter(user=user).first()
+        if fame is None:
+            try:
+                with transaction.atomic():
+                    fame = self.fame.create(user=user, value=value)
+            except IntegrityError:
+                # A concurrent first rating from the user got in first (there
+                # was no row to lock); update that one instead.
+                fame = self.fame.select_for_update().get(user=user)
+            else:
+                self._count_fame(added=value)
+                return fame
+        if fame.value != value:
+            removed, fame.value = fame.value, value
+            fame.save(update_fields=["value", "updated_at"])
+            self._count_fame(added=value, removed=removed)
         return fame
 
     @transaction.atomic
@@ -53,25 +85,48 @@ class Guild(BaseModel):
         """
         Remove a user's fame rating for this guild.
         """
-        deleted_count, _ = self.fame.filter(user=user).delete()
-        return deleted_count
+        fame = self.fame.select_for_update().filter(user=user).first()
+        if fame is None:
+            return 0
+        fame.delete()
+        self._count_fame(removed=fame.value)
+        return 1
+
+    def _count_fame(self, added: int | None = None, removed: int | None = None):
+        """
+        Count a rating of value `added` in, and one of value `removed` out
+        of, the fame counters. Applied as a single UPDATE relative to the
+        stored counters, so that concurrent ratings don't overwrite each
+        other; a flip from fame to defame is one UPDATE too.
+        """
+        counters = {"fame_total": F("fame_total")}
+        for value, step in ((added, 1), (removed, -1)):
+            if value is None:
+                continue
+            name = "fame_count" if value == GuildFame.FameValue.FAME else "defame_count"
+            counters["fame_total"] += value * step
+            counters[name] = counters.get(name, F(name)) + step
+        Guild.all_objects.filter(pk=self.pk).update(**counters)
+        self.refresh_from_db(fields=list(counters))
+
+        delta = (added or 0) - (removed or 0)
+        GuildStanding.objects.add(
+            self, {GuildStanding.FAME: delta, GuildStanding.RISING: delta}
+        )
+        GuildFameDay.objects.add(self, delta)
 
     def get_total_fame(self):
         """
-        Calculate the total fame for this guild.
+        Get the total fame for this guild.
         """
-        result = self.fame.aggregate(total=Sum("value"))
-        return result["total"] or 0
+        return self.fame_total
 
     def get_fame_count(self):
         """
         Get counts of fame and defame ratings.
         """
-        fame_count = self.fame.filter(value=1).count()
-        defame_count = self.fame.filter(value=-1).count()
-        return {"fame": fame_count, "defame": defame_count}
+        return {"fame": self.fame_count, "defame": self.defame_count}
 
-    @transaction.atomic
     def add_tag(self, user: User, tag_value: GuildTag.TagValue):
         """
         Add a tag to this guild from a user. Users can assign
@@ -80,37 +135,106 @@ class Guild(BaseModel):
         Raises:
             ValueError: If user already has 5 tags for this guild
         """
-        existing_tag = self.tags.filter(user=user, value=tag_value).first()
-        if existing_tag:
-            return existing_tag, False
+        tags, added, _ = self._write_tags(user, add=[tag_value])
+        if not added:
+            return tags[tag_value], False
+        return tags[tag_value]
 
-        user_tag_count = self.tags.filter(user=user).count()
-        if user_tag_count >= 5:
-            raise ValueError(
-                f"User {user.username} has already assigned 5 tags to this guild."
-                "Remove a tag before adding a new one."
-            )
-
-        tag = self.tags.create(user=user, value=tag_value)
-        return tag
-
-    @transaction.atomic
     def remove_tag(self, user: User, tag_value: GuildTag.TagValue):
         """
         Remove a specific tag from a user for this guild.
         """
-        deleted_count, _ = self.tags.filter(user=user, value=tag_value).delete()
-        return deleted_count
+        _, _, removed = self._write_tags(user, remove=[tag_value])
+        return len(removed)
 
-    def get_tag_counts(self):
+    def set_tags(self, user: User, tag_values: list[GuildTag.TagValue]):
+        """
+        Replace the tags a user gives this guild with `tag_values`, keeping
+        the ones already given.
+
+        Raises:
+            ValueError: If given more than 5 tags
         """
-        Get counts of each tag type for this guild.
+        tags, _, _ = self._write_tags(user, add=tag_values, replace=True)
+        return list(tags.values())
+
+    def _write_tags(self, user: User, add=(), remove=(), replace=False):
         """
-        tag_counts = (
-            self.tags.values("value").annotate(count=Count("id")).order_by("-count")
-        )
+        Add and remove tags from a user for this guild, in the same few
+        queries however many there are; with `replace`, every tag not in
+        `add` is removed. Returns the user's tags by value, and the values
+        added and removed.
+
+        The user's tags are locked while they are changed, and each takes
+        one of the user's 5 numbered slots for the guild, unique among
+        active tags. Concurrent writes can't take the same slot, so the
+        limit holds in the database; a write that loses a slot (or a tag)
+        to another is retried on top of it.
+        """
+        add = list(dict.fromkeys(add))
+        for attempt in range(GuildTag.WRITE_ATTEMPTS):
+            try:
+                with transaction.atomic():
+                    return self._try_write_tags(user, add, remove, replace)
+            except IntegrityError:
+                if attempt == GuildTag.WRITE_ATTEMPTS - 1:
+                    raise
+
+    def _try_write_tags(self, user: User, add, remove, replace):
+        current = {
+            tag.value: tag for tag in self.tags.select_for_update().filter(user=user)
+        }
+        removed = [
+            value
+            for value in current
+            if value in remove or (replace and value not in add)
+        ]
+        tags = {value: tag for value, tag in current.items() if value not in removed}
+        added = [value for value in add if value not in tags]
+        if len(tags) + len(added) > TAGS_PER_USER:
+            raise ValueError(
+                f"User {user.username} would give this guild more than "
+                f"{TAGS_PER_USER} tags. Remove a tag before adding a new one."
+            )
 
-        return {item["value"]: item["count"] for item in tag_counts}
+        if removed:
+            # Soft-deleted through the instances, so that the removals are
+            # recorded in the tag history like the additions.
+            now = timezone.now()
+            removed_tags = [current[value] for value in removed]
+            for tag in removed_tags:
+                tag.deleted_at = tag.updated_at = now
+            bulk_update_with_history(
+                removed_tags, GuildTag, ["deleted_at", "updated_at"], default_date=now
+            )
+        if added:
+            taken = {tag.slot for tag in tags.values()}
+            slots = [slot for slot in range(1, TAGS_PER_USER + 1) if slot not in taken]
+            new_tags = [
+                GuildTag(guild=self, user=user, value=value, slot=slot)
+                for value, slot in zip(added, slots)
+            ]
+            bulk_create_with_history(new_tags, GuildTag)
+            tags.update(zip(added, new_tags))
+
+        steps = {GuildStanding.tag_board(value): 1 for value in added}
+        steps.update({GuildStanding.tag_board(value): -1 for value in removed})
+        GuildStanding.objects.add(self, steps)
+        return tags, added, removed
+
+    def get_tag_counts(self):
+        """
+        Get counts of each tag type for this guild, from its standings on
+        the tag leaderboards.
+        """
+        prefix = GuildStanding.TAG_BOARD_PREFIX
+        standings = self.standings.filter(
+            board__startswith=prefix, score__gt=0
+        ).order_by("-score")
+        return {
+            board.removeprefix(prefix): score
+            for board, score in standings.values_list("board", "score")
+        }
 
     def get_user_tags(self, user: User):
         """
@@ -128,7 +252,7 @@ class Guild(BaseModel):
         if user is not None:
             queryset = queryset.filter(user=user)
 
-        return queryset.order_by("-history_date")
+        return queryset.order_by("-history_date", "-history_id")
 
     def get_tag_history(self, user: User | None = None):
         """
@@ -140,7 +264,7 @@ class Guild(BaseModel):
         if user is not None:
             queryset = queryset.filter(user=user)
 
-        return queryset.order_by("-history_date")
+        return queryset.order_by("-history_date", "-history_id")
 
 
 class GuildFame(BaseModel):
@@ -166,11 +290,20 @@ class GuildFame(BaseModel):
         related_name="guild_fame_given",
     )
     value = models.IntegerField(choices=FameValue.choices)
-    history = HistoricalRecords()
+    history = IndexedHistoricalRecords(
+        indexes=[
+            models.Index(
+                fields=["guild", "-history_date", "-history_id"],
+                name="historicalguildfame_guild_date",
+            ),
+        ]
+    )
 
     class Meta:
         ordering = ["-created_at"]
-        unique_together = ["guild", "user"]
+        constraints = [
+            active_unique("guild", "user", name="guildfame_guild_user_active_unique"),
+        ]
 
     def __str__(self):
         return f"{self.user.username} -> {self.guild.name}: {self.get_value_display()}"  # type: ignore
@@ -185,6 +318,9 @@ class GuildTag(BaseModel):
     Users can assign multiple tags to a guild, but each specific tag only once.
     """
 
+    # Tries a tag write gets before a conflict with concurrent ones is raised.
+    WRITE_ATTEMPTS = 3
+
     class TagValue(models.TextChoices):
         BOSSERS = "bossers", "Bossers"
         CASUALS = "casuals", "Casuals"
@@ -213,11 +349,345 @@ class GuildTag(BaseModel):
         related_name="guild_tags_given",
     )
     value = models.CharField(max_length=50, choices=TagValue.choices)
-    history = HistoricalRecords()
+    # Which of the user's TAGS_PER_USER tags for the guild this is.
+    slot = models.PositiveSmallIntegerField()
+    history = IndexedHistoricalRecords(
+        indexes=[
+            models.Index(
+                fields=["guild", "-history_date", "-history_id"],
+                name="historicalguildtag_guild_date",
+            ),
+        ]
+    )
 
     class Meta:
         ordering = ["-created_at"]
-        unique_together = ["guild", "user", "value"]
+        constraints = [
+            active_unique(
+                "guild", "user", "value", name="guildtag_guild_user_value_active_unique"
+            ),
+            active_unique(
+                "guild", "user", "slot", name="guildtag_guild_user_slot_active_unique"
+            ),
+            models.CheckConstraint(
+                condition=Q(slot__gte=1, slot__lte=TAGS_PER_USER),
+                name="guildtag_slot_range",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.user.username} -> {self.guild.name}: {self.get_value_display()}"  # type: ignore
+
+
+class GuildStandingQuerySet(models.QuerySet):
+    def on_board(self, board: str):
+        """
+        Ranked standings on `board`: those of active guilds, and on tag
+        boards only guilds still holding the tag.
+        """
+        queryset = self.filter(board=board, guild__deleted_at__isnull=True)
+        if board.startswith(GuildStanding.TAG_BOARD_PREFIX):
+            queryset = queryset.filter(score__gt=0)
+        return queryset
+
+    def add(self, guild: Guild, steps: dict[str, int]):
+        """
+        Move `guild` up (or down) each board of `steps` by its step, as one
+        upsert relative to the stored scores.
+
+        Rows are written in board order, so that concurrent upserts over the
+        same boards lock them in the same order instead of deadlocking.
+        """
+        steps = {board: step for board, step in sorted(steps.items()) if step}
+        if not steps:
+            return
+        connection = connections[self.db]
+        table = connection.ops.quote_name(self.model._meta.db_table)
+        rows = ", ".join(["(%s, %s, %s, %s)"] * len(steps))
+        params = []
+        now = connection.ops.adapt_datetimefield_value(timezone.now())
+        for board, step in steps.items():
+            params += [board, guild.pk, step, now]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {table} (board, guild_id, score, updated_at) "
+                f"VALUES {rows} "
+                "ON CONFLICT (board, guild_id) DO UPDATE SET "
+                f"score = {table}.score + EXCLUDED.score, "
+                "updated_at = EXCLUDED.updated_at",
+                params,
+            )
+
+    def with_ranks(self, standings: list[GuildStanding]):
+        """
+        Set `rank` on consecutive standings of one board, best first (a
+        page of `on_board(board).order_by("-score", ...)`), with one query.
+        Ties share a rank.
+
+        The query counts the standings above the page off the (board, score)
+        index, so it reads O(rank) index entries rather than O(log n): cheap
+        near the top of a board, a scan of most of the index at its bottom.
+        """
+        if not standings:
+            return standings
+        board, top = standings[0].board, standings[0].score
+        counts = self.on_board(board).aggregate(
+            above=Count("pk", filter=Q(score__gt=top)),
+            through=Count("pk", filter=Q(score__gte=top)),
+        )
+        position, previous = counts["through"], top
+        for standing in standings:
+            if standing.score == top:
+                standing.rank = counts["above"] + 1
+                continue
+            position += 1
+            if standing.score != previous:
+                rank, previous = position, standing.score
+            standing.rank = rank
+        return standings
+
+    def for_guild(self, guild: Guild):
+        """
+        Every ranked standing of `guild`, with its rank set, in two
+        queries. Ranks are counted as in `with_ranks()`.
+        """
+        standings = [
+            standing
+            for standing in self.filter(guild=guild).order_by("board")
+            if standing.score > 0
+            or not standing.board.startswith(GuildStanding.TAG_BOARD_PREFIX)
+        ]
+        if not standings or guild.deleted_at is not None:
+            return []
+        higher = Q(pk__in=[])
+        for standing in standings:
+            higher |= Q(board=standing.board, score__gt=standing.score)
+        counts = dict(
+            self.filter(higher, guild__deleted_at__isnull=True)
+            .order_by()
+            .values("board")
+            .annotate(count=Count("pk"))
+            .values_list("board", "count")
+        )
+        for standing in standings:
+            standing.rank = counts.get(standing.board, 0) + 1
+        return standings
+
+    @transaction.atomic
+    def refresh(self):
+        """
+        Rebuild every board from the guilds' fame counters, their tags, and
+        the daily fame rollups of the rising window. Standings are kept current
+        as ratings and tags are written, but ratings only leave the rising
+        board when it is rebuilt, so this must run daily, just after
+        midnight (the `refresh_leaderboards` command).
+
+        On PostgreSQL the table is locked first, so that writes made while
+        the boards are rebuilt are applied on top of the rebuilt scores.
+        """
+        connection = connections[self.db]
+        if connection.vendor == "postgresql":
+            table = connection.ops.quote_name(self.model._meta.db_table)
+            with connection.cursor() as cursor:
+                cursor.execute(f"LOCK TABLE {table} IN SHARE ROW EXCLUSIVE MODE")
+
+        standings = []
+        fame = Guild.all_objects.filter(Q(fame_count__gt=0) | Q(defame_count__gt=0))
+        for guild_id, score in fame.values_list("pk", "fame_total"):
+            standings.append(
+                GuildStanding(board=GuildStanding.FAME, guild_id=guild_id, score=score)
+            )
+        tags = GuildTag.objects.order_by().values("guild", "value")
+        for row in tags.annotate(count=Count("pk")):
+            standings.append(
+                GuildStanding(
+                    board=GuildStanding.tag_board(row["value"]),
+                    guild_id=row["guild"],
+                    score=row["count"],
+                )
+            )
+        for guild_id, score in self.get_rising_scores().items():
+            standings.append(
+                GuildStanding(
+                    board=GuildStanding.RISING, guild_id=guild_id, score=score
+                )
+            )
+
+        self.all().delete()
+        self.bulk_create(standings, batch_size=5000)
+
+    def get_rising_scores(self):
+        """
+        Net fame each guild gained over the rising window, from the daily
+        fame rollups.
+        """
+        since = timezone.localdate() - GuildStanding.RISING_WINDOW
+        days = GuildFameDay.objects.filter(day__gt=since).order_by()
+        return dict(
+            days.values("guild")
+            .annotate(score=Sum("fame_delta"))
+            .values_list("guild", "score")
+        )
+
+
+class GuildStanding(models.Model):
+    """
+    A guild's score on one leaderboard: overall fame, fame gained over the
+    last 7 days, today included (rising), or the number of times it was
+    given a tag. Kept current as ratings and tags are written, so
+    leaderboards and ranks are read off the (board, score) index instead of
+    aggregating ratings.
+    """
+
+    FAME = "fame"
+    RISING = "rising"
+    TAG_BOARD_PREFIX = "tag-"
+    RISING_WINDOW = timedelta(days=7)
+
+    board = models.CharField(max_length=50)
+    guild = models.ForeignKey(
+        Guild,
+        on_delete=models.CASCADE,
+        related_name="standings",
+    )
+    score = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = GuildStandingQuerySet.as_manager()
+
+    if TYPE_CHECKING:
+        rank: int
+
+    class Meta:
+        ordering = ["board", "-score", "id"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["board", "guild"], name="guildstanding_board_guild"
+            ),
+        ]
+        indexes = [
+            # Covers filtering and ordering guilds by a board's score, e.g.
+            # by how often they were given a tag, on PostgreSQL.
+            models.Index(
+                fields=["board", "-score"],
+                include=["guild"],
+                name="guildstanding_board_score",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.guild} on {self.board}: {self.score}"
+
+    @classmethod
+    def tag_board(cls, value: str):
+        return f"{cls.TAG_BOARD_PREFIX}{value}"
+
+    @classmethod
+    def get_boards(cls):
+        """
+        Every board, as {name: title}.
+        """
+        boards = {cls.FAME: "Fame", cls.RISING: "Rising this week"}
+        for value, label in GuildTag.TagValue.choices:
+            boards[cls.tag_board(value)] = f"Tagged {label}"
+        return boards
+
+
+class GuildFameDayQuerySet(models.QuerySet):
+    def add(self, guild: Guild, delta: int):
+        """
+        Count a change of `delta` to the fame of `guild` into today's
+        rollup, as one upsert.
+        """
+        connection = connections[self.db]
+        table = connection.ops.quote_name(self.model._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {table} (guild_id, day, fame_delta, changes) "
+                "VALUES (%s, %s, %s, 1) "
+                "ON CONFLICT (guild_id, day) DO UPDATE SET "
+                f"fame_delta = {table}.fame_delta + EXCLUDED.fame_delta, "
+                f"changes = {table}.changes + 1",
+                [
+                    guild.pk,
+                    connection.ops.adapt_datefield_value(timezone.localdate()),
+                    delta,
+                ],
+            )
+
+    @transaction.atomic
+    def refresh(self):
+        """
+        Rebuild the rollups from the whole fame history. Rollups are kept
+        current as ratings are written; this is for repairs.
+
+        On PostgreSQL the table is locked first, so that writes made while
+        the rollups are rebuilt are applied on top of them.
+        """
+        connection = connections[self.db]
+        if connection.vendor == "postgresql":
+            table = connection.ops.quote_name(self.model._meta.db_table)
+            with connection.cursor() as cursor:
+                cursor.execute(f"LOCK TABLE {table} IN SHARE ROW EXCLUSIVE MODE")
+
+        HistoricalGuildFame = GuildFame.history.model
+        records = HistoricalGuildFame.objects.order_by(
+            "id", "history_date", "history_id"
+        ).values_list(
+            "id", "guild_id", "value", "deleted_at", "history_type", "history_date"
+        )
+        days = {}
+        current = None, 0
+        for record in records.iterator(chunk_size=5000):
+            fame_id, guild_id, value, deleted_at, history_type, history_date = record
+            # What the rating counted for after this change.
+            counted = 0 if deleted_at is not None or history_type == "-" else value
+            previous = current[1] if current[0] == fame_id else 0
+            current = fame_id, counted
+            if counted == previous:
+                continue
+            key = guild_id, timezone.localdate(history_date)
+            fame_delta, changes = days.get(key, (0, 0))
+            days[key] = fame_delta + counted - previous, changes + 1
+
+        self.all().delete()
+        self.bulk_create(
+            [
+                GuildFameDay(
+                    guild_id=guild_id, day=day, fame_delta=fame_delta, changes=changes
+                )
+                for (guild_id, day), (fame_delta, changes) in days.items()
+            ],
+            batch_size=5000,
+        )
+
+
+class GuildFameDay(models.Model):
+    """
+    The fame a guild gained (or lost) on one day, and how many rating
+    changes made it up. Kept current as ratings are written, so activity
+    charts and the rising leaderboard read a row per day instead of the
+    fame history.
+    """
+
+    guild = models.ForeignKey(
+        Guild,
+        on_delete=models.CASCADE,
+        related_name="fame_days",
+    )
+    day = models.DateField()
+    fame_delta = models.IntegerField(default=0)
+    changes = models.IntegerField(default=0)
+
+    objects = GuildFameDayQuerySet.as_manager()
+
+    class Meta:
+        ordering = ["guild", "-day"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["guild", "day"], name="guildfameday_guild_day"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.guild} on {self.day}: {self.fame_delta:+}"
@@ -1,3 +1,237 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.db import IntegrityError, transaction
+from django.db.models import QuerySet
 from django.test import TestCase
+from django.utils import timezone
+
+from minty_hq.counters import reconcile_fame_counters
+from minty_hq.models import (
+    TAGS_PER_USER,
+    Guild,
+    GuildFame,
+    GuildFameDay,
+    GuildStanding,
+    GuildTag,
+)
+from users.models import User
+
+FAME = GuildFame.FameValue.FAME
+DEFAME = GuildFame.FameValue.DEFAME
+
+
+class GuildTestCase(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create(username="owner")
+        self.guild = self.create_guild("Guild")
+
+    def create_guild(self, name):
+        return Guild.objects.create(name=name, owner=self.owner)
+
+    def create_users(self, count, prefix="user"):
+        return [User.objects.create(username=f"{prefix}{i}") for i in range(count)]
+
+
+class GuildFameCounterTests(GuildTestCase):
+    def assertCounters(self, fame_total, fame_count, defame_count):
+        self.guild.refresh_from_db()
+        self.assertEqual(
+            (self.guild.fame_total, self.guild.fame_count, self.guild.defame_count),
+            (fame_total, fame_count, defame_count),
+        )
+
+    def test_counters_follow_flips_and_removals(self):
+        first, second, third = self.create_users(3)
+        self.guild.set_fame(first, FAME)
+        self.guild.set_fame(second, FAME)
+        self.guild.set_fame(third, DEFAME)
+        self.assertCounters(1, 2, 1)
+
+        self.guild.set_fame(second, DEFAME)
+        self.assertCounters(-1, 1, 2)
+        # Setting the same value again changes nothing.
+        self.guild.set_fame(second, DEFAME)
+        self.assertCounters(-1, 1, 2)
+
+        self.assertEqual(self.guild.remove_fame(first), 1)
+        self.assertCounters(-2, 0, 2)
+        self.assertEqual(self.guild.remove_fame(first), 0)
+        self.assertCounters(-2, 0, 2)
+        self.assertEqual(self.guild.get_fame_count(), {"fame": 0, "defame": 2})
+
+    def test_reconcile_fixes_drifted_counters(self):
+        first, second = self.create_users(2)
+        self.guild.set_fame(first, FAME)
+        self.guild.set_fame(second, DEFAME)
+        self.guild.remove_fame(second)
+        Guild.objects.filter(pk=self.guild.pk).update(
+            fame_total=10, fame_count=0, defame_count=3
+        )
+
+        self.assertEqual(reconcile_fame_counters(), 1)
+        self.assertCounters(1, 1, 0)
+
+    def test_racing_first_rating_updates_the_winner(self):
+        (user,) = self.create_users(1)
+        self.guild.set_fame(user, FAME)
+        # As if the rating above had been committed by a concurrent request
+        # after this one found no rating to lock.
+        with mock.patch.object(QuerySet, "first", return_value=None):
+            fame = self.guild.set_fame(user, DEFAME)
+
+        self.assertEqual(fame.value, DEFAME)
+        self.assertEqual(self.guild.fame.filter(user=user).count(), 1)
+        self.assertCounters(-1, 0, 1)
+
+
+class GuildStandingTests(GuildTestCase):
+    def get_scores(self, guild):
+        return dict(guild.standings.values_list("board", "score"))
+
+    def test_standings_follow_flips_and_removals(self):
+        first, second = self.create_users(2)
+        self.guild.set_fame(first, FAME)
+        self.guild.set_fame(second, FAME)
+        self.guild.set_fame(second, DEFAME)
+        self.guild.remove_fame(first)
+
+        self.guild.refresh_from_db()
+        self.assertEqual(self.guild.fame_total, -1)
+        self.assertEqual(
+            self.get_scores(self.guild),
+            {GuildStanding.FAME: -1, GuildStanding.RISING: -1},
+        )
+
+    def test_refresh_reproduces_live_standings(self):
+        users = self.create_users(3)
+        other = self.create_guild("Other")
+        for user in users:
+            self.guild.set_fame(user, FAME)
+            other.set_fame(user, DEFAME)
+        self.guild.set_fame(users[0], DEFAME)
+        other.remove_fame(users[1])
+        self.guild.set_tags(users[0], ["drama", "helpful"])
+        self.guild.set_tags(users[1], ["drama"])
+        self.guild.remove_tag(users[0], "helpful")
+
+        live = {guild.pk: self.get_scores(guild) for guild in (self.guild, other)}
+        GuildStanding.objects.refresh()
+        rebuilt = {guild.pk: self.get_scores(guild) for guild in (self.guild, other)}
+        # A tag given and taken back leaves a zero score live, and no
+        # standing at all after a rebuild.
+        del live[self.guild.pk][GuildStanding.tag_board("helpful")]
+        self.assertEqual(rebuilt, live)
+
+    def test_ranks_share_ties_across_pages(self):
+        scores = {"A": 5, "B": 3, "C": 3, "D": 3, "E": 1}
+        for name, score in scores.items():
+            GuildStanding.objects.add(
+                self.create_guild(name), {GuildStanding.FAME: score}
+            )
+
+        url = "/api/v1/guilds/leaderboards/fame/?page_size=2"
+        ranks = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            page = response.json()
+            ranks += [
+                (standing["guild"]["name"], standing["rank"])
+                for standing in page["results"]
+            ]
+            url = page["next"]
+
+        self.assertEqual(
+            sorted(ranks), [("A", 1), ("B", 2), ("C", 2), ("D", 2), ("E", 5)]
+        )
+        guild = Guild.objects.get(name="D")
+        (standing,) = GuildStanding.objects.for_guild(guild)
+        self.assertEqual((standing.board, standing.rank), (GuildStanding.FAME, 2))
+
+
+class GuildTagLimitTests(GuildTestCase):
+    def setUp(self):
+        super().setUp()
+        (self.user,) = self.create_users(1)
+
+    def get_tags(self):
+        return dict(self.guild.get_user_tags(self.user).values_list("value", "slot"))
+
+    def test_set_tags_enforces_the_limit(self):
+        values = GuildTag.TagValue.values
+        self.guild.set_tags(self.user, values[:TAGS_PER_USER])
+        with self.assertRaises(ValueError):
+            self.guild.set_tags(self.user, values[: TAGS_PER_USER + 1])
+        with self.assertRaises(ValueError):
+            self.guild.add_tag(self.user, values[TAGS_PER_USER])
+
+        tags = self.get_tags()
+        self.assertEqual(set(tags), set(values[:TAGS_PER_USER]))
+        self.assertEqual(sorted(tags.values()), list(range(1, TAGS_PER_USER + 1)))
+
+    def test_set_tags_keeps_given_tags_and_reuses_slots(self):
+        self.guild.set_tags(self.user, ["drama", "helpful", "uncs"])
+        slots = self.get_tags()
+        self.guild.set_tags(self.user, ["uncs", "weebs", "social", "moguls", "drama"])
+
+        tags = self.get_tags()
+        self.assertEqual(tags["drama"], slots["drama"])
+        self.assertEqual(tags["uncs"], slots["uncs"])
+        self.assertEqual(sorted(tags.values()), list(range(1, TAGS_PER_USER + 1)))
+        self.assertEqual(
+            self.guild.get_tag_counts(),
+            {"drama": 1, "moguls": 1, "social": 1, "uncs": 1, "weebs": 1},
+        )
+
+    def test_database_rejects_taken_and_out_of_range_slots(self):
+        self.guild.add_tag(self.user, "drama")
+        for value, slot in (("helpful", 1), ("uncs", TAGS_PER_USER + 1)):
+            with self.subTest(slot=slot), self.assertRaises(IntegrityError):
+                with transaction.atomic():
+                    GuildTag.objects.create(
+                        guild=self.guild, user=self.user, value=value, slot=slot
+                    )
+
+    def test_removals_are_recorded_in_the_history(self):
+        self.guild.set_tags(self.user, ["drama", "helpful"])
+        self.guild.set_tags(self.user, ["helpful"])
+
+        history = self.guild.get_tag_history().filter(value="drama")
+        self.assertEqual(history.count(), 2)
+        self.assertIsNotNone(history.first().deleted_at)
+
+
+class GuildFameDayTests(GuildTestCase):
+    def get_rollups(self):
+        return list(
+            GuildFameDay.objects.order_by("guild", "day").values_list(
+                "guild", "day", "fame_delta", "changes"
+            )
+        )
+
+    def test_refresh_reproduces_live_rollups(self):
+        first, second, third = self.create_users(3)
+        other = self.create_guild("Other")
+        start = timezone.now() - timedelta(days=3)
+        for days, write in enumerate(
+            [
+                lambda: self.guild.set_fame(first, FAME),
+                lambda: self.guild.set_fame(second, DEFAME),
+                lambda: other.set_fame(first, DEFAME),
+                lambda: self.guild.set_fame(first, DEFAME),
+                lambda: self.guild.set_fame(second, DEFAME),
+                lambda: self.guild.remove_fame(second),
+                lambda: self.guild.set_fame(third, FAME),
+                lambda: other.remove_fame(first),
+            ]
+        ):
+            # Two writes a day, over four days.
+            with mock.patch("django.utils.timezone.now") as now:
+                now.return_value = start + timedelta(days=days // 2)
+                write()
 
-# Create your tests here.
+        live = self.get_rollups()
+        self.assertEqual(len({day for _, day, _, _ in live}), 4)
+        GuildFameDay.objects.refresh()
+        self.assertEqual(self.get_rollups(), live)
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:34
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("minty_mogul", "0002_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="marketplaceitem",
+            name="minty_mogul_name_7998a5_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="marketplaceitem",
+            name="minty_mogul_price_d40ed9_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="marketplaceitem",
+            name="minty_mogul_created_ca6303_idx",
+        ),
+        migrations.AddIndex(
+            model_name="marketplaceitem",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["name"],
+                name="marketplaceitem_name_active",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="marketplaceitem",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["price"],
+                name="marketplaceitem_price_active",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="marketplaceitem",
+            index=models.Index(
+                condition=models.Q(("deleted_at__isnull", True)),
+                fields=["created_at"],
+                name="marketplaceitem_created_active",
+            ),
+        ),
+    ]
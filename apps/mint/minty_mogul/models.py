@@ -1,6 +1,6 @@
 from django.db import models
 
-from common.models import BaseModel
+from common.models import BaseModel, active_index
 
 
 class MarketplaceItem(BaseModel):
@@ -14,9 +14,9 @@ class MarketplaceItem(BaseModel):
     class Meta:
         ordering = ["-created_at"]
         indexes = [
-            models.Index(fields=["name"]),
-            models.Index(fields=["price"]),
-            models.Index(fields=["created_at"]),
+            active_index("name", name="marketplaceitem_name_active"),
+            active_index("price", name="marketplaceitem_price_active"),
+            active_index("created_at", name="marketplaceitem_created_active"),
         ]
 
     def __str__(self):